@@ -0,0 +1,100 @@
+"""
+AccessControlEngine checks per second with 10k policies: the original
+role x policy fnmatch loop vs. the compiled matcher (uncached, cached, check_many).
+
+    python benchmarks/bench_acl.py
+"""
+import fnmatch
+import random
+import time
+
+from noetic_lang.core import IdentityContext, ACL
+from noetic_conscience.acl import AccessControlEngine
+
+POLICIES = 10_000
+ROLES = 50
+DURATION = 2.0
+
+def build_policies(rng: random.Random):
+    policies = []
+    for i in range(POLICIES):
+        kind = i % 10
+        if kind < 6:
+            pattern = f"doc:{i}" # Literal
+        elif kind < 9:
+            pattern = f"project:{i % 500}:*" # Prefix
+        else:
+            pattern = f"report:{i % 97}:*:v[0-9]" # Glob
+        policies.append(ACL(role=f"role_{rng.randrange(ROLES)}", permissions=["read"] if i % 3 else ["read", "write"], resource_pattern=pattern))
+    return policies
+
+def build_requests(rng: random.Random, n: int = 1000):
+    requests = []
+    for _ in range(n):
+        kind = rng.randrange(3)
+        if kind == 0:
+            resource = f"doc:{rng.randrange(POLICIES * 2)}"
+        elif kind == 1:
+            resource = f"project:{rng.randrange(600)}:file{rng.randrange(10)}"
+        else:
+            resource = f"report:{rng.randrange(120)}:q{rng.randrange(4)}:v{rng.randrange(12)}"
+        requests.append((rng.choice(["read", "write"]), resource))
+    return requests
+
+def legacy_check(policies, identity, permission, resource_id) -> bool:
+    # What AccessControlEngine.check did before policies were compiled
+    for role in identity.roles:
+        for policy in policies:
+            if policy.role == role:
+                if fnmatch.fnmatch(resource_id, policy.resource_pattern):
+                    if permission in policy.permissions or "admin" in policy.permissions:
+                        return True
+    return False
+
+def rate(check, requests) -> float:
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < DURATION:
+        permission, resource = requests[count % len(requests)]
+        check(permission, resource)
+        count += 1
+    return count / (time.perf_counter() - start)
+
+def main():
+    rng = random.Random(7)
+    policies = build_policies(rng)
+    requests = build_requests(rng)
+    user = IdentityContext(user_id="bench", roles=[f"role_{i}" for i in range(3)])
+
+    engine = AccessControlEngine(cache_size=0)
+    for policy in policies:
+        engine.add_policy(policy)
+    cached = AccessControlEngine()
+    for policy in policies:
+        cached.add_policy(policy)
+
+    # Same decisions before timing anything
+    sample = requests[:200]
+    expected = [legacy_check(policies, user, p, r) for p, r in sample]
+    assert [engine.check(user, p, r) for p, r in sample] == expected
+    assert cached.check_many(user, sample) == expected
+
+    legacy = rate(lambda p, r: legacy_check(policies, user, p, r), requests)
+    compiled = rate(lambda p, r: engine.check(user, p, r), requests)
+    warm = rate(lambda p, r: cached.check(user, p, r), requests)
+
+    start = time.perf_counter()
+    batches = 0
+    while time.perf_counter() - start < DURATION:
+        engine.check_many(user, requests)
+        batches += 1
+    many = batches * len(requests) / (time.perf_counter() - start)
+
+    print(f"{POLICIES} policies, {ROLES} roles, identity with {len(user.roles)} roles")
+    print(f"  fnmatch loop:        {legacy:>10.0f} checks/s")
+    print(f"  compiled:            {compiled:>10.0f} checks/s ({compiled / legacy:.0f}x)")
+    print(f"  compiled + cache:    {warm:>10.0f} checks/s ({warm / legacy:.0f}x)")
+    print(f"  check_many(1000):    {many:>10.0f} checks/s ({many / legacy:.0f}x)")
+
+if __name__ == "__main__":
+    main()
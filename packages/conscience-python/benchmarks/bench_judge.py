@@ -0,0 +1,88 @@
+"""
+Judgements per second with 50 principles: compiled closures vs. the previous
+JSON round-trip through the json_logic interpreter, and judge_batch (NumPy columns).
+
+    python benchmarks/bench_judge.py
+"""
+import json
+import time
+
+import json_logic
+from noetic_conscience import Evaluator, JudgementContext, Principle
+
+PRINCIPLES = 50
+FACTS = 200
+DURATION = 2.0
+
+def build_principles():
+    principles = []
+    for i in range(PRINCIPLES):
+        principles.append(Principle(
+            id=f"p_{i}",
+            affects=f"val.bench_{i % 5}",
+            logic={"if": [
+                {"and": [
+                    {"==": [{"var": "action.id"}, f"skill.action_{i}"]},
+                    {">": [{"var": f"world_state.metric_{i}"}, 10]}
+                ]},
+                5.0,
+                {"in": ["risky", {"var": "tags"}]}, 0.5,
+                0.0
+            ]}
+        ))
+    return principles
+
+def build_context(n: int) -> JudgementContext:
+    return JudgementContext(
+        agent_id="bench",
+        action_id=f"skill.action_{n % PRINCIPLES}",
+        action_args={"target": "db"},
+        tags=["io", "risky"] if n % 3 == 0 else ["io"],
+        world_state={f"metric_{i}": (i + n) % 20 for i in range(FACTS)}
+    )
+
+def legacy_judge(context: JudgementContext, principles) -> float:
+    # What Evaluator.judge did before rules were compiled
+    data = context.model_dump()
+    data["action"] = {"id": context.action_id, **context.action_args}
+    data_json = json.dumps(data, default=str)
+    total = 0.0
+    for principle in principles:
+        rule_json = json.dumps(principle.logic)
+        result = json_logic.jsonLogic(json.loads(rule_json), json.loads(data_json))
+        total += float(result or 0.0)
+    return total
+
+def rate(judge) -> float:
+    contexts = [build_context(n) for n in range(64)]
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < DURATION:
+        judge(contexts[count % len(contexts)])
+        count += 1
+    return count / (time.perf_counter() - start)
+
+def main():
+    principles = build_principles()
+    evaluator = Evaluator()
+    
+    # Both paths must agree before timing them
+    for n in range(64):
+        ctx = build_context(n)
+        assert evaluator.judge(ctx, principles).cost == legacy_judge(ctx, principles)
+
+    compiled = rate(lambda ctx: evaluator.judge(ctx, principles))
+    legacy = rate(lambda ctx: legacy_judge(ctx, principles))
+    print(f"{PRINCIPLES} principles, {FACTS} facts")
+    print(f"  json round-trip: {legacy:>10.0f} judgements/s")
+    print(f"  compiled:        {compiled:>10.0f} judgements/s ({compiled / legacy:.1f}x)")
+
+    for size in (16, 256):
+        contexts = [build_context(n) for n in range(size)]
+        batched = [r.cost for r in evaluator.judge_batch(contexts, principles)]
+        assert batched == [evaluator.judge(c, principles).cost for c in contexts]
+        batches = rate(lambda ctx: evaluator.judge_batch(contexts, principles))
+        print(f"  judge_batch({size:>3}): {batches * size:>10.0f} judgements/s")
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,229 @@
-from typing import List
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Pattern, Set, Tuple
 from noetic_lang.core import IdentityContext, ACL
 import fnmatch
+import os
+import re
 
-class AccessControlEngine:
+# Characters that make a resource pattern a glob (see fnmatch)
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+class _PrefixTrie:
+    """
+    Character trie of `prefix*` patterns: walking a resource id collects the
+    permissions of every prefix it starts with.
+    """
     def __init__(self):
-        self.policies: List[ACL] = []
+        self.root: Dict = {}
+
+    def add(self, prefix: str, permissions: FrozenSet[str]):
+        node = self.root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        # None never collides with a character key
+        node[None] = node.get(None, frozenset()) | permissions
+
+    def collect(self, resource_id: str, granted: Set[str]):
+        node = self.root
+        if None in node:
+            granted.update(node[None])
+        for char in resource_id:
+            node = node.get(char)
+            if node is None:
+                return
+            if None in node:
+                granted.update(node[None])
+
+class _RoleMatcher:
+    """
+    The policies of one role, split by pattern kind: literal resource ids in a hash
+    map, `prefix*` patterns in a trie, and any other glob compiled to a regex once.
+    """
+    def __init__(self):
+        self.literals: Dict[str, FrozenSet[str]] = {}
+        self.prefixes = _PrefixTrie()
+        self.globs: List[Tuple[Pattern, FrozenSet[str]]] = []
+
+    def add(self, pattern: str, permissions: FrozenSet[str]):
+        pattern = os.path.normcase(pattern)
+        first_glob = _GLOB_CHARS.search(pattern)
+        if first_glob is None:
+            self.literals[pattern] = self.literals.get(pattern, frozenset()) | permissions
+        elif first_glob.start() == len(pattern) - 1 and pattern.endswith("*"):
+            self.prefixes.add(pattern[:-1], permissions)
+        else:
+            self.globs.append((re.compile(fnmatch.translate(pattern)), permissions))
+
+    def granted(self, resource_id: str) -> Set[str]:
+        granted = set(self.literals.get(resource_id, ()))
+        self.prefixes.collect(resource_id, granted)
+        for regex, permissions in self.globs:
+            if not permissions <= granted and regex.match(resource_id):
+                granted.update(permissions)
+        return granted
+
+class _PolicyList(list):
+    """
+    The policy list, with a version bumped by every change made to it, so edits
+    made directly (replacing, removing or reordering policies) are recompiled.
+    """
+    version = 0
+
+    def append(self, item):
+        super().append(item)
+        self.version += 1
+
+    def extend(self, items):
+        super().extend(items)
+        self.version += 1
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self.version += 1
+
+    def pop(self, *args):
+        result = super().pop(*args)
+        self.version += 1
+        return result
+
+    def remove(self, item):
+        super().remove(item)
+        self.version += 1
+
+    def clear(self):
+        super().clear()
+        self.version += 1
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self.version += 1
+
+    def reverse(self):
+        super().reverse()
+        self.version += 1
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self.version += 1
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self.version += 1
+
+    def __iadd__(self, items):
+        result = super().__iadd__(items)
+        self.version += 1
+        return result
+
+    def __imul__(self, n):
+        result = super().__imul__(n)
+        self.version += 1
+        return result
+
+class AccessControlEngine:
+    """
+    Role-based access control over glob resource patterns (fnmatch semantics).
+
+    Policies are compiled as they are added into one matcher per role, so a check
+    only looks at the identity's roles and costs O(len(resource id)) plus the
+    role's non-prefix globs. Decisions are cached until the policies change.
+    """
+    def __init__(self, cache_size: int = 4096):
+        self._policies = _PolicyList()
+        self.cache_size = cache_size
+        self._matchers: Dict[str, _RoleMatcher] = {}
+        self._compiled = 0
+        # Version of the policy list the matchers were compiled from
+        self._compiled_version = 0
+        # (roles, permission, resource id) -> decision
+        self._decisions: "OrderedDict[Tuple[Tuple[str, ...], str, str], bool]" = OrderedDict()
+
+    @property
+    def policies(self) -> List[ACL]:
+        return self._policies
+
+    @policies.setter
+    def policies(self, policies: List[ACL]):
+        self._policies = _PolicyList(policies)
+        self._policies.version = self._compiled_version + 1
 
     def add_policy(self, policy: ACL):
-        self.policies.append(policy)
+        stale = self._stale()
+        self._policies.append(policy)
+        self._compile(rebuild=stale)
 
     def check(self, identity: IdentityContext, permission: str, resource_id: str) -> bool:
         """
         Checks if the identity has the permission on the resource.
         """
-        # 1. Iterate over user's roles
-        for role in identity.roles:
-            # 2. Find matching policies
-            for policy in self.policies:
-                if policy.role == role:
-                    # 3. Check Resource Pattern
-                    if fnmatch.fnmatch(resource_id, policy.resource_pattern):
-                        # 4. Check Permission
-                        if permission in policy.permissions or "admin" in policy.permissions:
-                            return True
+        if self._stale():
+            # Policies changed in `policies` directly
+            self._compile(rebuild=True)
+
+        key = (tuple(identity.roles), permission, resource_id)
+        decision = self._decisions.get(key)
+        if decision is not None:
+            self._decisions.move_to_end(key)
+            return decision
+
+        decision = self._decide(identity.roles, permission, os.path.normcase(resource_id))
+        self._remember(key, decision)
+        return decision
+
+    def check_many(self, identity: IdentityContext, requests: List[Tuple[str, str]]) -> List[bool]:
+        """
+        Checks (permission, resource_id) pairs for one identity, in order.
+        Each distinct resource is matched once, whatever the number of permissions asked.
+        """
+        if self._stale():
+            self._compile(rebuild=True)
+
+        roles = tuple(identity.roles)
+        granted_by_resource: Dict[str, Set[str]] = {}
+        decisions = []
+        for permission, resource_id in requests:
+            key = (roles, permission, resource_id)
+            decision = self._decisions.get(key)
+            if decision is None:
+                granted = granted_by_resource.get(resource_id)
+                if granted is None:
+                    granted = set()
+                    normalized = os.path.normcase(resource_id)
+                    for role in roles:
+                        matcher = self._matchers.get(role)
+                        if matcher is not None:
+                            granted |= matcher.granted(normalized)
+                    granted_by_resource[resource_id] = granted
+                decision = permission in granted or "admin" in granted
+                self._remember(key, decision)
+            decisions.append(decision)
+        return decisions
+
+    def _decide(self, roles: List[str], permission: str, resource_id: str) -> bool:
+        for role in roles:
+            matcher = self._matchers.get(role)
+            if matcher is None:
+                continue
+            granted = matcher.granted(resource_id)
+            if permission in granted or "admin" in granted:
+                return True
         return False
+
+    def _remember(self, key: Tuple[Tuple[str, ...], str, str], decision: bool):
+        self._decisions[key] = decision
+        if len(self._decisions) > self.cache_size:
+            self._decisions.popitem(last=False)
+
+    def _compile(self, rebuild: bool = False):
+        if rebuild:
+            self._matchers = {}
+            self._compiled = 0
+        for policy in self.policies[self._compiled:]:
+            matcher = self._matchers.setdefault(policy.role, _RoleMatcher())
+            matcher.add(policy.resource_pattern, frozenset(policy.permissions))
+        self._compiled = len(self.policies)
+        self._compiled_version = self._policies.version
+        self._decisions.clear()
+
+    def _stale(self) -> bool:
+        return self._compiled_version != self._policies.version
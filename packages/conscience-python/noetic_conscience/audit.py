@@ -1,10 +1,17 @@
+import itertools
 import logging
+import time
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
 
+# Judgement sources. Planner judgements score candidate branches during search and
+# can be sampled; decision judgements are about actions that are actually taken.
+SOURCE_DECISION = "decision"
+SOURCE_PLANNER = "planner"
+
 class JudgementRecord(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     action_id: str
@@ -12,30 +19,46 @@ class JudgementRecord(BaseModel):
     breakdown: List[Dict[str, Any]]
     veto: bool = False
     violation_reason: Optional[str] = None
+    source: str = SOURCE_DECISION
+    seq: int = 0 # Position in the audit stream (monotonic, gaps mean overwritten records)
+
+# Slot layout: (seq, unix timestamp, action id, total cost, breakdown, veto, reason, source)
+Slot = Tuple[int, float, str, float, List[Dict[str, Any]], bool, Optional[str], str]
 
 class AuditLogger:
     """
     Records the 'Why' behind Conscience decisions.
     Provides structured history and telemetry-ready events.
+
+    History is a ring buffer of `history_limit` preallocated slots holding plain tuples;
+    records are only turned into `JudgementRecord`s when read. Writers claim a sequence
+    number from an `itertools.count` (atomic under the GIL) and store into its slot,
+    so logging takes no lock and costs O(1). Planner judgements are kept at
+    `planner_sample_rate` (violations are always kept).
     """
-    def __init__(self, history_limit: int = 100):
-        self.history: List[JudgementRecord] = []
-        self.history_limit = history_limit
-    
-    def log_judgement(self, 
-                      action_id: str, 
-                      total_cost: float, 
-                      contributing_principles: List[Dict[str, Any]]):
+    def __init__(self, history_limit: int = 100, planner_sample_rate: float = 1.0):
+        self.history_limit = max(1, history_limit)
+        self.planner_sample_rate = planner_sample_rate
+        self._slots: List[Optional[Slot]] = [None] * self.history_limit
+        self._counter = itertools.count()
+        self._written = 0
+        self._cleared = 0 # next_seq when the history was last cleared
+        self._sample_credit = 0.0
+        self.sampled_out = 0
+
+    def log_judgement(self,
+                      action_id: str,
+                      total_cost: float,
+                      contributing_principles: List[Dict[str, Any]],
+                      source: str = SOURCE_DECISION):
         """
         Logs the outcome of a judgement and stores it in history.
         """
-        record = JudgementRecord(
-            action_id=action_id,
-            total_cost=total_cost,
-            breakdown=contributing_principles
-        )
-        self._add_to_history(record)
-        
+        if source == SOURCE_PLANNER and not self._sample():
+            self.sampled_out += 1
+            return
+        self._add_to_history(action_id, total_cost, contributing_principles, False, None, source)
+
         # Telemetry-ready structured log
         if contributing_principles:
             logger.info(f"Judgement for '{action_id}': Cost={total_cost}")
@@ -44,24 +67,112 @@ class AuditLogger:
         else:
             logger.debug(f"Judgement for '{action_id}': Cost={total_cost} (Clean)")
 
-    def log_violation(self, principle_id: str, reason: str, action_id: str = "unknown"):
+    def log_violation(self, principle_id: str, reason: str, action_id: str = "unknown", source: str = SOURCE_DECISION):
         """
         Logs a hard veto and stores it in history.
         """
-        record = JudgementRecord(
-            action_id=action_id,
-            total_cost=float('inf'),
-            breakdown=[{"id": principle_id, "cost": float('inf')}],
-            veto=True,
-            violation_reason=reason
-        )
-        self._add_to_history(record)
+        breakdown = [{"id": principle_id, "cost": float('inf')}]
+        self._add_to_history(action_id, float('inf'), breakdown, True, reason, source)
         logger.warning(f"VETO TRIGGERED by '{principle_id}' on action '{action_id}': {reason}")
 
     def get_history(self) -> List[JudgementRecord]:
-        return self.history
+        return [_to_record(slot) for slot in self._snapshot()]
+
+    @property
+    def history(self) -> Tuple[JudgementRecord, ...]:
+        """
+        Read-only snapshot of the ring, oldest first (a tuple, so code that used to
+        append to or clear the list fails loudly). Use `clear()` to empty it.
+        """
+        return tuple(self.get_history())
+
+    def clear(self):
+        """
+        Empties the history. Sequence numbers keep counting, so an exporter that had
+        not read the cleared records counts them as lost.
+        """
+        self._cleared = self._written
+        self._slots = [None] * self.history_limit
+
+    def query(self,
+              action_id: Optional[str] = None,
+              principle_id: Optional[str] = None,
+              veto: Optional[bool] = None,
+              source: Optional[str] = None,
+              limit: Optional[int] = None) -> List[JudgementRecord]:
+        """
+        Records in history (oldest first) matching every given filter. `principle_id`
+        matches records the principle contributed a cost to (or vetoed).
+        `limit` keeps the most recent matches.
+        """
+        matches = []
+        for slot in self._snapshot():
+            if action_id is not None and slot[2] != action_id:
+                continue
+            if veto is not None and slot[5] != veto:
+                continue
+            if source is not None and slot[7] != source:
+                continue
+            if principle_id is not None and not any(entry.get("id") == principle_id for entry in slot[4]):
+                continue
+            matches.append(slot)
+        if limit is not None:
+            matches = matches[-limit:] if limit > 0 else []
+        return [_to_record(slot) for slot in matches]
+
+    def read_since(self, seq: int) -> Tuple[List[JudgementRecord], int]:
+        """
+        Records with a sequence number >= `seq`, oldest first, and how many of the
+        requested records were already overwritten (for exporters that fell behind).
+        """
+        slots = [slot for slot in self._snapshot() if slot[0] >= seq]
+        end = self._written
+        lost = (slots[0][0] if slots else end) - seq
+        return [_to_record(slot) for slot in slots], max(0, lost)
+
+    @property
+    def next_seq(self) -> int:
+        """
+        Sequence number the next record will get (one past the newest record).
+        """
+        return self._written
+
+    def __len__(self) -> int:
+        return min(self._written - self._cleared, self.history_limit)
+
+    def _sample(self) -> bool:
+        # Deterministic sampling: keep one record each time the credit reaches 1
+        rate = self.planner_sample_rate
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        self._sample_credit += rate
+        if self._sample_credit >= 1.0:
+            self._sample_credit -= 1.0
+            return True
+        return False
+
+    def _add_to_history(self, action_id: str, total_cost: float, breakdown: List[Dict[str, Any]],
+                        veto: bool, reason: Optional[str], source: str):
+        seq = next(self._counter)
+        self._slots[seq % self.history_limit] = (seq, time.time(), action_id, total_cost, breakdown, veto, reason, source)
+        if seq >= self._written:
+            self._written = seq + 1
+
+    def _snapshot(self) -> List[Slot]:
+        # Copy first: concurrent writers may overwrite slots while we sort
+        return sorted((slot for slot in list(self._slots) if slot is not None), key=lambda slot: slot[0])
 
-    def _add_to_history(self, record: JudgementRecord):
-        self.history.append(record)
-        if len(self.history) > self.history_limit:
-            self.history.pop(0)
+def _to_record(slot: Slot) -> JudgementRecord:
+    seq, timestamp, action_id, total_cost, breakdown, veto, reason, source = slot
+    return JudgementRecord(
+        timestamp=datetime.utcfromtimestamp(timestamp),
+        action_id=action_id,
+        total_cost=total_cost,
+        breakdown=breakdown,
+        veto=veto,
+        violation_reason=reason,
+        source=source,
+        seq=seq
+    )
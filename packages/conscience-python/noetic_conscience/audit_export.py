@@ -0,0 +1,191 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from .audit import AuditLogger, JudgementRecord
+
+logger = logging.getLogger(__name__)
+
+class AuditSink(ABC):
+    """
+    Destination of exported audit records. `write` is called off the event loop.
+    """
+    @abstractmethod
+    def write(self, records: List[JudgementRecord]):
+        pass
+
+    def close(self):
+        pass
+
+class NDJSONSink(AuditSink):
+    """
+    Appends one JSON object per record to a newline-delimited JSON file.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, records: List[JudgementRecord]):
+        lines = [json.dumps(_row(record), default=str) + "\n" for record in records]
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+
+class SQLiteSink(AuditSink):
+    """
+    Stores records in SQLite, with the principles of each breakdown in their own
+    table so records can be queried by action or by principle.
+
+    Rows are keyed on their own autoincrement id: `seq` restarts with every
+    AuditLogger, so loggers (or processes) sharing a database file do not
+    overwrite each other's records.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        # Written from the exporter's worker thread
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS judgements (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                seq INTEGER NOT NULL,
+                timestamp TEXT NOT NULL,
+                action_id TEXT NOT NULL,
+                total_cost REAL,
+                veto INTEGER NOT NULL,
+                violation_reason TEXT,
+                source TEXT NOT NULL,
+                breakdown TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS judgements_action ON judgements (action_id);
+            CREATE TABLE IF NOT EXISTS judgement_principles (
+                judgement_id INTEGER NOT NULL REFERENCES judgements (id),
+                principle_id TEXT NOT NULL,
+                cost REAL
+            );
+            CREATE INDEX IF NOT EXISTS judgement_principles_id ON judgement_principles (principle_id);
+        """)
+
+    def write(self, records: List[JudgementRecord]):
+        principles = []
+        with self._conn:
+            for r in records:
+                cursor = self._conn.execute(
+                    "INSERT INTO judgements (seq, timestamp, action_id, total_cost, veto, violation_reason, source, breakdown) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (r.seq, r.timestamp.isoformat(), r.action_id, _real(r.total_cost), int(r.veto),
+                     r.violation_reason, r.source, json.dumps(r.breakdown, default=str))
+                )
+                principles.extend((cursor.lastrowid, str(entry.get("id")), _real(entry.get("cost"))) for entry in r.breakdown)
+            self._conn.executemany("INSERT INTO judgement_principles VALUES (?, ?, ?)", principles)
+
+    def query(self, action_id: Optional[str] = None, principle_id: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Most recent exported records (newest first) for an action and/or a principle.
+        """
+        sql = "SELECT seq, timestamp, action_id, total_cost, veto, violation_reason, source, breakdown FROM judgements"
+        clauses, params = [], []
+        if action_id is not None:
+            clauses.append("action_id = ?")
+            params.append(action_id)
+        if principle_id is not None:
+            clauses.append("id IN (SELECT judgement_id FROM judgement_principles WHERE principle_id = ?)")
+            params.append(principle_id)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+
+        rows = self._conn.execute(sql, params).fetchall()
+        return [{
+            "seq": seq,
+            "timestamp": timestamp,
+            "action_id": action,
+            "total_cost": float("inf") if cost is None else cost,
+            "veto": bool(veto),
+            "violation_reason": reason,
+            "source": source,
+            "breakdown": json.loads(breakdown)
+        } for seq, timestamp, action, cost, veto, reason, source, breakdown in rows]
+
+    def close(self):
+        self._conn.close()
+
+class AuditExporter:
+    """
+    Streams an AuditLogger's records to a sink in batches from a background task.
+
+    Every `interval` seconds (or on `flush`) the records logged since the last export
+    are written by a worker thread, so judgements never wait on I/O. Records
+    overwritten in the ring buffer before they were exported are counted in `lost`.
+    """
+    def __init__(self, audit: AuditLogger, sink: AuditSink, interval: float = 1.0, batch_size: int = 500):
+        self.audit = audit
+        self.sink = sink
+        self.interval = interval
+        self.batch_size = batch_size
+        self.exported = 0
+        self.lost = 0
+        self._next_seq = audit.next_seq
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        await asyncio.to_thread(self.sink.close)
+
+    async def flush(self) -> int:
+        """
+        Exports every pending record. Returns how many were written.
+        """
+        async with self._lock:
+            records, lost = self.audit.read_since(self._next_seq)
+            if lost:
+                logger.warning(f"Audit exporter fell behind: {lost} records were overwritten before export")
+                self.lost += lost
+            if not records:
+                return 0
+            written = 0
+            for start in range(0, len(records), self.batch_size):
+                batch = records[start:start + self.batch_size]
+                await asyncio.to_thread(self.sink.write, batch)
+                # Advance per batch so a failing sink does not make us write a batch twice
+                self._next_seq = batch[-1].seq + 1
+                written += len(batch)
+                self.exported += len(batch)
+            return written
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Audit export failed: {e}")
+
+def _row(record: JudgementRecord) -> Dict[str, Any]:
+    row = record.model_dump()
+    row["timestamp"] = record.timestamp.isoformat()
+    row["total_cost"] = _real(record.total_cost)
+    row["breakdown"] = [{**entry, "cost": _real(entry.get("cost"))} for entry in record.breakdown]
+    return row
+
+def _real(value: Any) -> Optional[float]:
+    # JSON and SQLite have no infinity: a veto's infinite cost is exported as null
+    if value is None or value == float("inf"):
+        return None
+    return float(value)
@@ -1,11 +1,23 @@
 from __future__ import annotations
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
 from pydantic import BaseModel, Field
 import uuid
 import datetime
+import hashlib
 import json
+import time
 from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.hazmat.primitives.asymmetric import rsa, padding, ed25519
+
+# Keys contracts can be signed with. Ed25519 verifies much faster than RSA-PSS.
+PrivateKey = Any # rsa.RSAPrivateKey | ed25519.Ed25519PrivateKey
+PublicKey = Any # rsa.RSAPublicKey | ed25519.Ed25519PublicKey
+
+_PSS = padding.PSS(
+    mgf=padding.MGF1(hashes.SHA256()),
+    salt_length=padding.PSS.MAX_LENGTH
+)
 
 class AICHeader(BaseModel):
     request_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -40,32 +52,108 @@ class AgenticIntentContract(BaseModel):
         data = self.model_dump(exclude={"signature"})
         return json.dumps(data, sort_keys=True, default=str)
 
-    def sign(self, private_key: rsa.RSAPrivateKey):
+    def sign(self, private_key: PrivateKey):
+        """
+        Signs the contract with an RSA (PSS, SHA-256) or Ed25519 private key.
+        """
         serialized_data = self.serialize().encode('utf-8')
-        signature = private_key.sign(
-            serialized_data,
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
-        )
+        if isinstance(private_key, ed25519.Ed25519PrivateKey):
+            signature = private_key.sign(serialized_data)
+        else:
+            signature = private_key.sign(serialized_data, _PSS, hashes.SHA256())
         self.signature = signature.hex()
 
-    def verify(self, public_key: rsa.RSAPublicKey) -> bool:
-        if not self.signature:
-            return False
+    def verify(self, public_key: PublicKey, cache: Optional[VerificationCache] = None) -> bool:
+        """
+        Checks the signature against the public key (RSA or Ed25519).
+        With a cache, a contract already verified with this key is not verified again.
+        """
+        return verify_many([self], public_key, cache)[0]
+
+def verify_many(contracts: List[AgenticIntentContract], public_key: PublicKey, cache: Optional[VerificationCache] = None) -> List[bool]:
+    """
+    Verifies many contracts (e.g. fanned-out intents), in order. A signature shared by
+    identical contracts is only checked once per call.
+    """
+    results: List[bool] = []
+    seen: Dict[Tuple[str, str], bool] = {}
+    for contract in contracts:
+        if not contract.signature:
+            results.append(False)
+            continue
         try:
-            serialized_data = self.serialize().encode('utf-8')
-            public_key.verify(
-                bytes.fromhex(self.signature),
-                serialized_data,
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
-            )
-            return True
+            serialized_data = contract.serialize().encode('utf-8')
         except Exception:
+            results.append(False)
+            continue
+        key = VerificationCache.make_key(contract.signature, serialized_data)
+        if key not in seen:
+            if cache is not None and cache.get(key, public_key):
+                seen[key] = True
+            else:
+                seen[key] = _verify_signature(public_key, contract.signature, serialized_data)
+                if seen[key] and cache is not None:
+                    cache.put(key, public_key, contract.header.expires_at)
+        results.append(seen[key])
+    return results
+
+def _verify_signature(public_key: PublicKey, signature: str, serialized_data: bytes) -> bool:
+    try:
+        if isinstance(public_key, ed25519.Ed25519PublicKey):
+            public_key.verify(bytes.fromhex(signature), serialized_data)
+        else:
+            public_key.verify(bytes.fromhex(signature), serialized_data, _PSS, hashes.SHA256())
+        return True
+    except Exception:
+        return False
+
+class VerificationCache:
+    """
+    LRU cache of successfully verified contracts.
+
+    Entries are keyed by the signature and a SHA-256 digest of the serialized contract
+    (so any change to the contract misses), remember the public key that verified them,
+    and expire at the contract's `header.expires_at` or after `ttl` seconds.
+    """
+    def __init__(self, max_size: int = 1024, ttl: float = 3600.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        # (signature, digest) -> (public key, expires at as a unix timestamp)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[PublicKey, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(signature: str, serialized_data: bytes) -> Tuple[str, str]:
+        return (signature, hashlib.sha256(serialized_data).hexdigest())
+
+    def get(self, key: Tuple[str, str], public_key: PublicKey) -> bool:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] is not public_key:
+            self.misses += 1
+            return False
+        if entry[1] <= time.time():
+            del self._entries[key]
+            self.misses += 1
             return False
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True
+
+    def put(self, key: Tuple[str, str], public_key: PublicKey, expires_at: Optional[datetime.datetime] = None):
+        deadline = time.time() + self.ttl
+        if expires_at is not None:
+            # Naive datetimes are local time, like the header's default issued_at
+            deadline = min(deadline, expires_at.timestamp())
+        if deadline <= time.time():
+            return
+        self._entries[key] = (public_key, deadline)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,9 +1,11 @@
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from pydantic import BaseModel, Field
-import json
-from .logic import LogicEngine
+from .logic import LogicEngine, CompiledRule
+from .vector import ColumnBatch, VectorRule, compile_vector, run_vector, np
 from .veto import VetoSwitch, PolicyViolationError
-from .audit import AuditLogger
+from .audit import AuditLogger, SOURCE_DECISION
+from .index import PrincipleIndex
 
 class JudgementContext(BaseModel):
     agent_id: str
@@ -16,6 +18,7 @@ class JudgementResult(BaseModel):
     allowed: bool
     cost: float
     breakdown: List[Dict[str, Any]] # List of contributing principles
+    skipped: int = 0 # Principles not evaluated because they cannot apply to the action
 
 class Principle(BaseModel):
     id: str
@@ -24,49 +27,44 @@ class Principle(BaseModel):
     logic: Dict[str, Any] # JsonLogic rule
 
 class Evaluator:
-    def __init__(self, safety_mode: str = "fail_closed"):
+    def __init__(self, safety_mode: str = "fail_closed", vector_threshold: int = 8, audit: Optional[AuditLogger] = None):
+        """
+        :param vector_threshold: Smallest batch judge_batch evaluates column-wise with NumPy.
+        :param audit: AuditLogger to record judgements in (e.g. one sampling planner judgements).
+        """
         self.logic_engine = LogicEngine(safety_mode=safety_mode)
-        self.audit = AuditLogger()
+        self.audit = audit or AuditLogger()
+        self.vector_threshold = vector_threshold
+        # principle id -> (logic it was compiled from, compiled rule)
+        self._compiled: Dict[str, Tuple[Dict[str, Any], CompiledRule]] = {}
+        self._vectorized: Dict[str, Tuple[Dict[str, Any], VectorRule]] = {}
+        # ((principle id, id(logic)), ...) -> PrincipleIndex
+        self._indexes: "OrderedDict[Tuple, PrincipleIndex]" = OrderedDict()
+        self.max_indexes = 64
+        self.stats = {"evaluated": 0, "skipped": 0}
         # VetoSwitch is static
 
-    def judge(self, context: JudgementContext, principles: List[Principle], store: Optional[Any] = None) -> JudgementResult:
+    def judge(self, context: JudgementContext, principles: List[Principle], store: Optional[Any] = None, source: str = SOURCE_DECISION) -> JudgementResult:
         """
         Evaluates the action against the provided principles.
+        `source` is recorded in the audit log (SOURCE_PLANNER judgements may be sampled).
         """
         total_cost = 0.0
         contributing = []
         
-        # 1. Tag Expansion (Inheritance)
-        tags = context.tags
-        if store and hasattr(store, "get_all_parent_tags"):
-            tags = store.get_all_parent_tags(tags)
-            context.tags = tags # Update context with expanded tags
-            
-        # 2. Prepare data for JsonLogic
-        data = context.model_dump()
-        data["action"] = {
-            "id": context.action_id,
-            **context.action_args
-        }
-        
-        data_json = json.dumps(data, default=str)
-
-        for principle in principles:
-            # Check if principle applies (filtering)?
-            # README says: "2. Filter: It discards Principles that don't apply to the current Action tags."
-            # But the Principle schema in README didn't show 'applies_to_tags'. 
-            # I'll assume for now we evaluate all provided principles, or the logic handles it.
-            # Or maybe the Principle object should have a 'tags' field?
-            # I'll stick to evaluating logic. If logic returns 0, it means it doesn't apply/no cost.
-            
-            rule_json = json.dumps(principle.logic)
-            
-            cost = self.logic_engine.evaluate(rule_json, data_json)
+        data = self._prepare(context, store)
+        applicable, skipped = self.load_principles(principles).select(data)
+        self.stats["evaluated"] += len(applicable)
+        self.stats["skipped"] += skipped
+
+        for principle in applicable:
+            # Principles guarded on other action ids / tags were filtered out by the index
+            cost = self.logic_engine.run(self._compile(principle), data)
             
             try:
                 VetoSwitch.check(cost, principle.id, data)
             except PolicyViolationError as e:
-                self.audit.log_violation(principle.id, e.reason, action_id=context.action_id)
+                self.audit.log_violation(principle.id, e.reason, action_id=context.action_id, source=source)
                 raise e
             
             if cost > 0:
@@ -77,10 +75,140 @@ class Evaluator:
                     "affects": principle.affects
                 })
 
-        self.audit.log_judgement(context.action_id, total_cost, contributing)
+        self.audit.log_judgement(context.action_id, total_cost, contributing, source=source)
 
         return JudgementResult(
             allowed=True,
             cost=total_cost,
-            breakdown=contributing
+            breakdown=contributing,
+            skipped=skipped
         )
+
+    def load_principles(self, principles: List[Principle]) -> PrincipleIndex:
+        """
+        Returns the relevance index of a principle set, building it on first use.
+        Call it when principles are loaded to keep the analysis off the hot path.
+        """
+        key = tuple((p.id, id(p.logic)) for p in principles)
+        index = self._indexes.get(key)
+        if index is None:
+            # The index keeps the principles (and their logic) alive, so ids in the key stay unique
+            index = PrincipleIndex(list(principles))
+            self._indexes[key] = index
+            if len(self._indexes) > self.max_indexes:
+                self._indexes.popitem(last=False)
+        else:
+            self._indexes.move_to_end(key)
+        return index
+
+    def judge_batch(self, contexts: List[JudgementContext], principles: List[Principle], store: Optional[Any] = None, source: str = SOURCE_DECISION) -> List[JudgementResult]:
+        """
+        Evaluates many candidate actions against the principles in one pass.
+
+        Returns one result per context, in order, with the same cost and breakdown as
+        `judge`. A vetoed action does not raise: it yields `allowed=False`, an infinite
+        cost and the vetoing principle as breakdown (and is audited as a violation).
+        Batches of at least `vector_threshold` actions are evaluated column-wise (NumPy).
+        """
+        rows = [self._prepare(context, store) for context in contexts]
+        n = len(rows)
+        totals = [0.0] * n
+        breakdowns: List[List[Dict[str, Any]]] = [[] for _ in range(n)]
+        violations: List[Optional[Tuple[Principle, str]]] = [None] * n
+        batch = ColumnBatch(rows) if np is not None and n >= self.vector_threshold else None
+
+        # Which principles can apply to each row
+        index = self.load_principles(principles)
+        relevant: List[List[int]] = [[] for _ in principles]
+        skipped = [0] * n
+        for i, row in enumerate(rows):
+            positions = index.positions(row)
+            skipped[i] = len(principles) - len(positions)
+            for position in positions:
+                relevant[position].append(i)
+        self.stats["evaluated"] += n * len(principles) - sum(skipped)
+        self.stats["skipped"] += sum(skipped)
+
+        for principle, rows_of_principle in zip(principles, relevant):
+            if not rows_of_principle:
+                continue
+            compiled = self._compile(principle)
+            if batch is not None and len(rows_of_principle) >= self.vector_threshold:
+                # Column-wise over the whole batch; rows it cannot apply to are ignored below
+                costs = run_vector(self._vectorize(principle), compiled, batch, self.logic_engine.safety_mode)
+                column = np.asarray(costs, dtype=float)
+                interesting = set(np.flatnonzero((column > 0) | np.isinf(column)).tolist())
+                rows_to_visit = [i for i in rows_of_principle if i in interesting]
+            else:
+                costs = {i: self.logic_engine.run(compiled, rows[i]) for i in rows_of_principle if violations[i] is None}
+                rows_to_visit = list(costs.keys())
+
+            for i in rows_to_visit:
+                cost = costs[i]
+                if violations[i] is not None:
+                    continue # Already vetoed by an earlier principle
+                try:
+                    VetoSwitch.check(cost, principle.id, rows[i])
+                except PolicyViolationError as e:
+                    violations[i] = (principle, e.reason)
+                    continue
+                if cost > 0:
+                    totals[i] += cost
+                    breakdowns[i].append({
+                        "id": principle.id,
+                        "cost": cost,
+                        "affects": principle.affects
+                    })
+
+        results = []
+        for i, context in enumerate(contexts):
+            if violations[i] is not None:
+                principle, reason = violations[i]
+                self.audit.log_violation(principle.id, reason, action_id=context.action_id, source=source)
+                results.append(JudgementResult(
+                    allowed=False,
+                    cost=float("inf"),
+                    breakdown=[{"id": principle.id, "cost": float("inf"), "affects": principle.affects}],
+                    skipped=skipped[i]
+                ))
+            else:
+                self.audit.log_judgement(context.action_id, totals[i], breakdowns[i], source=source)
+                results.append(JudgementResult(allowed=True, cost=totals[i], breakdown=breakdowns[i], skipped=skipped[i]))
+        return results
+
+    def _prepare(self, context: JudgementContext, store: Optional[Any]) -> Dict[str, Any]:
+        # 1. Tag Expansion (Inheritance)
+        tags = context.tags
+        if store and hasattr(store, "get_all_parent_tags"):
+            tags = store.get_all_parent_tags(tags)
+            context.tags = tags # Update context with expanded tags
+            
+        # 2. Prepare data for JsonLogic (evaluated directly, no JSON round-trip)
+        return {
+            "agent_id": context.agent_id,
+            "action_id": context.action_id,
+            "action_args": context.action_args,
+            "tags": tags,
+            "world_state": context.world_state,
+            "action": {
+                "id": context.action_id,
+                **context.action_args
+            }
+        }
+
+    def _vectorize(self, principle: Principle) -> VectorRule:
+        entry = self._vectorized.get(principle.id)
+        if entry is None or entry[0] is not principle.logic:
+            entry = (principle.logic, compile_vector(principle.logic))
+            self._vectorized[principle.id] = entry
+        return entry[1]
+
+    def _compile(self, principle: Principle) -> CompiledRule:
+        """
+        Returns the compiled rule of a principle, recompiling when its logic is replaced.
+        """
+        entry = self._compiled.get(principle.id)
+        if entry is None or entry[0] is not principle.logic:
+            entry = (principle.logic, self.logic_engine.compile(principle.logic))
+            self._compiled[principle.id] = entry
+        return entry[1]
@@ -0,0 +1,227 @@
+import logging
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+import json_logic
+from .logic import CompiledRule, compile_rule
+
+logger = logging.getLogger(__name__)
+
+# Var paths that hold the action id (`action.id` may be overridden by an `id` action arg)
+_ACTION_ID_PATHS = {"action.id", "action_id"}
+
+class Guard:
+    """
+    A condition a principle needs before it can cost anything, e.g.
+    `{"==": [{"var": "action.id"}, "skill.delete"]}` or `{"in": ["tag.pii", {"var": "tags"}]}`.
+
+    Each clause is a disjunction of atoms; all clauses must hold. Atoms are evaluated
+    with json_logic semantics, so a failing guard proves the principle costs 0.
+    """
+    def __init__(self, clauses: List[List[Tuple[str, FrozenSet[str], CompiledRule]]]):
+        # clause = [(kind, literals, atom)] with kind "action" or "tag"
+        self.clauses = clauses
+
+    def holds(self, data: Dict[str, Any]) -> bool:
+        for clause in self.clauses:
+            if not any(atom(data) for _, _, atom in clause):
+                return False
+        return True
+
+class PrincipleDependencies:
+    """
+    Result of the static analysis of one principle's rule.
+    """
+    def __init__(self, var_paths: FrozenSet[str], guard: Optional[Guard]):
+        self.var_paths = var_paths
+        self.guard = guard
+
+    @property
+    def action_ids(self) -> FrozenSet[str]:
+        return self._literals("action")
+
+    @property
+    def tags(self) -> FrozenSet[str]:
+        return self._literals("tag")
+
+    def _literals(self, kind: str) -> FrozenSet[str]:
+        if not self.guard:
+            return frozenset()
+        return frozenset(l for clause in self.guard.clauses for k, lits, _ in clause if k == kind for l in lits)
+
+def analyze(logic: Any) -> PrincipleDependencies:
+    """
+    Finds the var paths a rule reads and, when the rule can only cost something for
+    specific action ids or tags, the guard that expresses it.
+
+    Recognised shapes (anything else is always evaluated):
+    - {"if": [COND, then]} / {"if": [COND, then, ZERO]} where ZERO is 0, false or null
+    - {"and": [COND, ...]}
+    COND is an atom, {"and": [atom, ..., other]} (leading atoms only, as `and`
+    short-circuits) or {"or": [atom, ...]} (atoms only).
+    """
+    var_paths = frozenset(str(v) for v in json_logic.uses_data(logic))
+    return PrincipleDependencies(var_paths, _guard_of(logic))
+
+def _guard_of(logic: Any) -> Optional[Guard]:
+    if not json_logic.is_logic(logic):
+        return None
+    operator, values = _split(logic)
+
+    if operator == "if" and len(values) in (2, 3):
+        if len(values) == 3 and not _is_zero(values[2]):
+            return None
+        clauses = _clauses(values[0])
+    elif operator == "and" and values:
+        # A falsy `and` returns its first falsy operand: a failed atom (False) costs 0
+        clauses = _leading_atoms(values)
+    else:
+        return None
+    return Guard(clauses) if clauses else None
+
+def _clauses(condition: Any) -> List[List[Tuple[str, FrozenSet[str], CompiledRule]]]:
+    atom = _atom(condition)
+    if atom:
+        return [[atom]]
+    if not json_logic.is_logic(condition):
+        return []
+    operator, values = _split(condition)
+    if operator == "and":
+        return _leading_atoms(values)
+    if operator == "or" and values:
+        atoms = [_atom(v) for v in values]
+        if all(atoms):
+            return [atoms]
+    return []
+
+def _leading_atoms(values: List[Any]) -> List[List[Tuple[str, FrozenSet[str], CompiledRule]]]:
+    clauses = []
+    for value in values:
+        # Stop at the first operand that is not an atom: it may raise before a later atom fails
+        atom = _atom(value)
+        if not atom:
+            break
+        clauses.append([atom])
+    return clauses
+
+def _atom(condition: Any) -> Optional[Tuple[str, FrozenSet[str], CompiledRule]]:
+    if not json_logic.is_logic(condition):
+        return None
+    operator, values = _split(condition)
+    if len(values) != 2:
+        return None
+    a, b = values
+
+    if operator in ("==", "==="):
+        for var, literal in ((a, b), (b, a)):
+            if _var_path(var) in _ACTION_ID_PATHS and isinstance(literal, str):
+                return ("action", frozenset([literal]), compile_rule(condition))
+
+    if operator == "in":
+        if _var_path(a) in _ACTION_ID_PATHS and isinstance(b, list) and b and all(isinstance(x, str) for x in b):
+            return ("action", frozenset(b), compile_rule(condition))
+        if isinstance(a, str) and _var_path(b) == "tags":
+            return ("tag", frozenset([a]), compile_rule(condition))
+    return None
+
+def _var_path(value: Any) -> Optional[str]:
+    if json_logic.is_logic(value) and "var" in value:
+        name = value["var"]
+        if isinstance(name, list):
+            if len(name) != 1:
+                return None # A default would change the value of a missing path
+            name = name[0]
+        return name if isinstance(name, str) else None
+    return None
+
+def _split(logic: Dict[str, Any]) -> Tuple[str, List[Any]]:
+    operator = next(iter(logic.keys()))
+    values = logic[operator]
+    if not isinstance(values, (list, tuple)):
+        values = [values]
+    return operator, list(values)
+
+def _is_zero(value: Any) -> bool:
+    return value is None or value is False or (type(value) in (int, float) and value == 0)
+
+class PrincipleIndex:
+    """
+    Selects the principles that can apply to an action.
+
+    Guarded principles are indexed by the literals of their first guard clause
+    (action ids and tags), so only the candidates for the current action have their
+    guard checked; unguarded principles are always selected. Order is preserved.
+    """
+    def __init__(self, principles: List[Any]):
+        self.principles = principles
+        self.dependencies: List[PrincipleDependencies] = []
+        self._always: List[int] = []
+        self._by_action: Dict[str, List[int]] = {}
+        self._by_tag: Dict[str, List[int]] = {}
+        # First clause mixes kinds (e.g. action or tag) -> candidates for every action
+        self._mixed: List[int] = []
+
+        for position, principle in enumerate(principles):
+            deps = analyze(principle.logic)
+            self.dependencies.append(deps)
+            if deps.guard is None:
+                self._always.append(position)
+                continue
+
+            first = deps.guard.clauses[0]
+            kinds = {kind for kind, _, _ in first}
+            if kinds == {"action"}:
+                for _, literals, _ in first:
+                    for literal in literals:
+                        self._by_action.setdefault(literal, []).append(position)
+            elif kinds == {"tag"}:
+                for _, literals, _ in first:
+                    for literal in literals:
+                        self._by_tag.setdefault(literal, []).append(position)
+            else:
+                self._mixed.append(position)
+
+    @property
+    def guarded(self) -> int:
+        return len(self.principles) - len(self._always)
+
+    def select(self, data: Dict[str, Any]) -> Tuple[List[Any], int]:
+        """
+        Returns (principles to evaluate, number skipped) for prepared judgement data.
+        """
+        positions = self.positions(data)
+        if len(positions) == len(self.principles):
+            return self.principles, 0
+        return [self.principles[p] for p in positions], len(self.principles) - len(positions)
+
+    def positions(self, data: Dict[str, Any]) -> List[int]:
+        """
+        Positions (in the principle list) of the principles to evaluate, in order.
+        """
+        if not self._by_action and not self._by_tag and not self._mixed:
+            return list(range(len(self.principles)))
+
+        candidates = set(self._mixed)
+        for action_id in _action_ids(data):
+            candidates.update(self._by_action.get(action_id, ()))
+        tags = data.get("tags")
+        if isinstance(tags, (list, tuple, set)):
+            for tag in tags:
+                if isinstance(tag, str):
+                    candidates.update(self._by_tag.get(tag, ()))
+        else:
+            # Not a list (e.g. a string): membership is not a lookup, check every tag guard
+            for positions in self._by_tag.values():
+                candidates.update(positions)
+
+        selected = set(self._always)
+        selected.update(p for p in candidates if self.dependencies[p].guard.holds(data))
+        return sorted(selected)
+
+def _action_ids(data: Dict[str, Any]) -> List[str]:
+    ids = []
+    action = data.get("action")
+    if isinstance(action, dict) and "id" in action:
+        ids.append(str(action["id"]))
+    if "action_id" in data:
+        ids.append(str(data["action_id"]))
+    return ids
@@ -1,4 +1,5 @@
-from typing import Any, Dict, Optional, List
+from typing import Any, Callable, Dict, List
+import json
 import json_logic
 from functools import lru_cache
 import logging
@@ -6,6 +7,17 @@ from noetic_lang.core.agent import Principle
 
 logger = logging.getLogger(__name__)
 
+# A compiled JsonLogic rule: data dict -> raw result
+CompiledRule = Callable[[Dict[str, Any]], Any]
+
+# Operators that are not compiled as plain "evaluate arguments, call function" closures.
+# var and the logical operators get dedicated closures; the rest use the json_logic interpreter.
+_LOGICAL_OPERATORS = {"if", "?:", "and", "or"}
+_SCOPED_OPERATORS = {"filter", "map", "reduce", "all", "none", "some"}
+_DATA_OPERATORS = {"var", "missing", "missing_some"}
+_INTERPRETED_OPERATORS = {"count"} # Emits a warning per call in json_logic; keep its behaviour
+_UNCOMPILED_OPERATORS = _LOGICAL_OPERATORS | _SCOPED_OPERATORS | _DATA_OPERATORS | _INTERPRETED_OPERATORS
+
 class Principles:
     def __init__(self, items: List[Principle]):
         self.items = items
@@ -13,6 +25,10 @@ class Principles:
 class LogicEngine:
     """
     Wrapper around json-logic-qubit to provide safe, cached evaluation of Principles.
+
+    Rules are compiled once into nested Python closures (`compile`) and then evaluated
+    directly against dict data (`run`), without a JSON round-trip per judgement.
+    Semantics follow json_logic; operators without a compiled form use the interpreter.
     """
 
     def __init__(self, safety_mode: str = "fail_closed"):
@@ -21,31 +37,19 @@ class LogicEngine:
         """
         self.safety_mode = safety_mode
 
-    @lru_cache(maxsize=1024)
-    def evaluate(self, rule_json_str: str, data_json_str: str) -> float:
+    @staticmethod
+    def compile(rule: Any) -> CompiledRule:
+        return compile_rule(rule)
+
+    def run(self, compiled: CompiledRule, data: Dict[str, Any]) -> float:
         """
-        Evaluates a JsonLogic rule against data.
-        
-        Args:
-            rule_json_str: JSON string of the rule (for hashing/caching).
-            data_json_str: JSON string of the data (for hashing/caching).
-            
+        Evaluates a compiled rule against data.
+
         Returns:
             float: The calculated cost.
         """
         try:
-            rule =_json_loads_safe(rule_json_str)
-            data = _json_loads_safe(data_json_str)
-            
-            result = json_logic.jsonLogic(rule, data)
-            
-            # Ensure result is a float
-            if result is None:
-                return 0.0
-            if isinstance(result, bool):
-                 return 1.0 if result else 0.0
-            return float(result)
-
+            return _to_cost(compiled(data))
         except Exception as e:
             logger.error(f"Logic evaluation failed: {e}")
             if self.safety_mode == "fail_closed":
@@ -53,6 +57,130 @@ class LogicEngine:
             else:
                 return 0.0
 
-def _json_loads_safe(s: str) -> Any:
-    import json
-    return json.loads(s)
+    def evaluate(self, rule_json_str: str, data_json_str: str) -> float:
+        """
+        Evaluates a JsonLogic rule against data.
+        Kept for callers holding JSON strings; prefer `compile` + `run`.
+
+        Args:
+            rule_json_str: JSON string of the rule.
+            data_json_str: JSON string of the data.
+
+        Returns:
+            float: The calculated cost.
+        """
+        try:
+            compiled = _compile_json(rule_json_str)
+            data = json.loads(data_json_str)
+        except Exception as e:
+            logger.error(f"Logic evaluation failed: {e}")
+            return float("inf") if self.safety_mode == "fail_closed" else 0.0
+        return self.run(compiled, data)
+
+@lru_cache(maxsize=1024)
+def _compile_json(rule_json_str: str) -> CompiledRule:
+    return compile_rule(json.loads(rule_json_str))
+
+def _to_cost(result: Any) -> float:
+    # Ensure result is a float
+    if result is None:
+        return 0.0
+    if isinstance(result, bool):
+        return 1.0 if result else 0.0
+    return float(result)
+
+def compile_rule(rule: Any) -> CompiledRule:
+    """
+    Compiles a JsonLogic rule into a closure `f(data) -> result`.
+    """
+    # Array of rules
+    if isinstance(rule, (list, tuple)):
+        items = [compile_rule(r) for r in rule]
+        return lambda data: [f(data) for f in items]
+
+    # Primitive
+    if not json_logic.is_logic(rule):
+        return lambda data: rule
+
+    operator = next(iter(rule.keys()))
+    values = rule[operator]
+    if not isinstance(values, (list, tuple)):
+        values = [values]
+
+    if operator == "var":
+        return _compile_var(values)
+
+    if operator in _LOGICAL_OPERATORS:
+        return _compile_logical(operator, [compile_rule(v) for v in values])
+
+    if operator in json_logic.operations and operator not in _UNCOMPILED_OPERATORS:
+        fn = json_logic.operations[operator]
+        args = [compile_rule(v) for v in values]
+        if len(args) == 1:
+            a, = args
+            return lambda data: fn(a(data))
+        if len(args) == 2:
+            a, b = args
+            return lambda data: fn(a(data), b(data))
+        return lambda data: fn(*[f(data) for f in args])
+
+    # Scoped/data operators, custom operations and unknown operators (raise on evaluation)
+    return lambda data: json_logic.jsonLogic(rule, data)
+
+def _compile_var(values: List[Any]) -> CompiledRule:
+    if not values or json_logic.is_logic(values[0]) or (len(values) > 1 and json_logic.is_logic(values[1])):
+        rule = {"var": values}
+        return lambda data: json_logic.jsonLogic(rule, data)
+
+    name = values[0]
+    default = values[1] if len(values) > 1 else None
+    if name is None or name == "":
+        return lambda data: data or {}
+
+    path = tuple(str(name).split("."))
+
+    def var(data):
+        current = data or {}
+        try:
+            for key in path:
+                try:
+                    current = current[key]
+                except TypeError:
+                    current = current[int(key)]
+        except (KeyError, TypeError, ValueError):
+            return default
+        return current
+
+    return var
+
+def _compile_logical(operator: str, args: List[CompiledRule]) -> CompiledRule:
+    if operator in ("if", "?:"):
+        pairs = [(args[i], args[i + 1]) for i in range(0, len(args) - 1, 2)]
+        otherwise = args[-1] if len(args) % 2 else None
+
+        def if_(data):
+            for condition, then in pairs:
+                if condition(data):
+                    return then(data)
+            return otherwise(data) if otherwise else None
+
+        return if_
+
+    if operator == "and":
+        def and_(data):
+            current = False
+            for f in args:
+                current = f(data)
+                if not current:
+                    return current
+            return current
+        return and_
+
+    def or_(data):
+        current = False
+        for f in args:
+            current = f(data)
+            if current:
+                return current
+        return current
+    return or_
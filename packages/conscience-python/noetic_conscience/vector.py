@@ -0,0 +1,339 @@
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+import json_logic
+from .logic import CompiledRule, compile_rule, _compile_var, _to_cost
+
+logger = logging.getLogger(__name__)
+
+# NumPy is optional: without it Evaluator.judge_batch evaluates row by row
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class VectorFallback(Exception):
+    """
+    Raised when a batch cannot be evaluated column-wise; the caller evaluates row by row.
+    """
+
+class ColumnBatch:
+    """
+    The data of many judgements, with the variables rules reference extracted into
+    columns once per batch (shared by every principle).
+    """
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self.rows = rows
+        self.n = len(rows)
+        self._columns: Dict[str, Any] = {}
+
+    def column(self, name: str, reader: CompiledRule) -> Any:
+        column = self._columns.get(name)
+        if column is None:
+            column = _as_column([reader(row) for row in self.rows])
+            self._columns[name] = column
+        return column
+
+# A vectorized rule: batch -> column (ndarray) or a scalar broadcast to every row
+VectorRule = Callable[[ColumnBatch], Any]
+
+def compile_vector(rule: Any) -> VectorRule:
+    """
+    Compiles a JsonLogic rule for column-wise evaluation.
+
+    Comparisons, and/or/if/!, arithmetic and `in` run on NumPy arrays when the operand
+    types allow json_logic's semantics to be reproduced exactly; any other node (or
+    operands of mixed types) is evaluated row by row with the scalar compiled rule.
+    """
+    if np is None:
+        raise RuntimeError("numpy is required for vectorized evaluation")
+    return _compile(rule)
+
+def run_vector(vector_rule: VectorRule, scalar_rule: CompiledRule, batch: ColumnBatch, safety_mode: str) -> List[float]:
+    """
+    Evaluates a rule over the whole batch and returns one cost per row, with the same
+    results (and the same fail-closed / fail-open handling) as LogicEngine.run per row.
+    """
+    try:
+        with np.errstate(all="ignore"):
+            result = vector_rule(batch)
+        if isinstance(result, np.ndarray):
+            if result.dtype.kind == "f":
+                return result.tolist()
+            if result.dtype.kind == "b":
+                return result.astype(float).tolist()
+            values = result.tolist()
+        else:
+            values = [result] * batch.n
+    except Exception:
+        # VectorFallback, or an operand json_logic would also reject: redo it per row
+        values = None
+
+    costs = []
+    failed = float("inf") if safety_mode == "fail_closed" else 0.0
+    for i in range(batch.n):
+        try:
+            value = values[i] if values is not None else scalar_rule(batch.rows[i])
+            costs.append(_to_cost(value))
+        except Exception as e:
+            logger.error(f"Logic evaluation failed: {e}")
+            costs.append(failed)
+    return costs
+
+# --- Compilation ---
+
+def _compile(rule: Any) -> VectorRule:
+    if isinstance(rule, (list, tuple)) or not json_logic.is_logic(rule):
+        if isinstance(rule, (list, tuple)):
+            return _rowwise(compile_rule(rule))
+        return lambda batch: rule
+
+    operator = next(iter(rule.keys()))
+    values = rule[operator]
+    if not isinstance(values, (list, tuple)):
+        values = [values]
+    scalar = compile_rule(rule)
+
+    if operator == "var":
+        if not values or not isinstance(values[0], (str, int)) or len(values) > 1:
+            return _rowwise(scalar)
+        name = str(values[0])
+        reader = _compile_var(values)
+        return lambda batch: batch.column(name, reader)
+
+    builder = _BUILDERS.get(operator)
+    if builder is None or operator in getattr(json_logic, "_custom_operations", {}):
+        return _rowwise(scalar)
+
+    args = [_compile(v) for v in values]
+    return builder(args, scalar)
+
+def _rowwise(scalar: CompiledRule) -> VectorRule:
+    def rowwise(batch):
+        try:
+            return _as_column([scalar(row) for row in batch.rows])
+        except Exception:
+            # Let the caller evaluate (and fail) row by row, exactly like the scalar path
+            raise VectorFallback()
+    return rowwise
+
+def _typed(args, scalar, kinds, fn) -> VectorRule:
+    """
+    Applies `fn` to the evaluated arguments when every argument's kind is in `kinds`,
+    otherwise evaluates the node row by row.
+    """
+    fallback = _rowwise(scalar)
+    def node(batch):
+        evaluated = [a(batch) for a in args]
+        if all(_kind(v) in kinds for v in evaluated):
+            return _fit(fn(*evaluated), batch.n)
+        return fallback(batch)
+    return node
+
+def _build_equal(negate: bool):
+    def build(args, scalar):
+        if len(args) != 2:
+            return _rowwise(scalar)
+        fallback = _rowwise(scalar)
+        def node(batch):
+            a, b = args[0](batch), args[1](batch)
+            ka, kb = _kind(a), _kind(b)
+            if ka == kb and ka in ("num", "bool", "str"):
+                result = _fit(np.equal(a, b), batch.n)
+                return ~result if negate else result
+            return fallback(batch)
+        return node
+    return build
+
+def _build_compare(op):
+    def build(args, scalar):
+        if len(args) != 2:
+            return _rowwise(scalar)
+        return _typed(args, scalar, {"num"}, op)
+    return build
+
+def _build_arithmetic(operator):
+    def build(args, scalar):
+        if operator == "+" and args:
+            return _typed(args, scalar, {"num"}, lambda *v: sum(v[1:], v[0]))
+        if operator == "*" and args:
+            def product(*v):
+                total = v[0]
+                for x in v[1:]:
+                    total = total * x
+                return total
+            return _typed(args, scalar, {"num"}, product)
+        if operator == "-" and len(args) == 1:
+            return _typed(args, scalar, {"num"}, lambda a: -a)
+        if operator == "-" and len(args) == 2:
+            return _typed(args, scalar, {"num"}, lambda a, b: a - b)
+        if operator in ("/", "%") and len(args) == 2:
+            op = np.divide if operator == "/" else np.mod
+            fallback = _rowwise(scalar)
+            def divide(batch):
+                a, b = args[0](batch), args[1](batch)
+                # Division by zero raises in json_logic; let the row path reproduce it
+                if _kind(a) == _kind(b) == "num" and not np.any(np.asarray(b) == 0):
+                    return _fit(op(a, b), batch.n)
+                return fallback(batch)
+            return divide
+        if operator in ("min", "max") and args:
+            reduce = np.minimum if operator == "min" else np.maximum
+            def extremum(*v):
+                result = v[0]
+                for x in v[1:]:
+                    result = reduce(result, x)
+                return result
+            return _typed(args, scalar, {"num"}, extremum)
+        return _rowwise(scalar)
+    return build
+
+def _build_not(negate: bool):
+    def build(args, scalar):
+        if len(args) != 1:
+            return _rowwise(scalar)
+        def node(batch):
+            truth = _truthy(args[0](batch), batch.n)
+            return ~truth if negate else truth
+        return node
+    return build
+
+def _build_and_or(is_and: bool):
+    def build(args, scalar):
+        if not args:
+            return _rowwise(scalar)
+        def node(batch):
+            evaluated = [a(batch) for a in args]
+            # and: first falsy value, else the last; or: first truthy value, else the last
+            result = evaluated[-1]
+            for value in reversed(evaluated[:-1]):
+                truth = _truthy(value, batch.n)
+                result = _where(truth, result, value, batch.n) if is_and else _where(truth, value, result, batch.n)
+            return result
+        return node
+    return build
+
+def _build_if(args, scalar):
+    def node(batch):
+        evaluated = [a(batch) for a in args]
+        result = evaluated[-1] if len(evaluated) % 2 else None
+        for i in range(len(evaluated) - 2 - (len(evaluated) % 2), -1, -2):
+            truth = _truthy(evaluated[i], batch.n)
+            result = _where(truth, evaluated[i + 1], result, batch.n)
+        return result
+    return node
+
+def _build_ternary(args, scalar):
+    if len(args) != 3:
+        return _rowwise(scalar)
+    return _build_if(args, scalar)
+
+def _build_in(args, scalar):
+    if len(args) != 2:
+        return _rowwise(scalar)
+    def node(batch):
+        a, b = args[0](batch), args[1](batch)
+        if isinstance(a, str) and isinstance(b, np.ndarray) and b.dtype.kind == "U":
+            # Substring test on a string column
+            return np.char.find(b, a) >= 0
+        return _elementwise(batch.n, a, b, lambda x, y: x in y if hasattr(y, "__contains__") else False)
+    return node
+
+_BUILDERS = {}
+if np is not None:
+    _BUILDERS.update({
+        "==": _build_equal(False),
+        "!=": _build_equal(True),
+        "<": _build_compare(np.less),
+        "<=": _build_compare(np.less_equal),
+        ">": _build_compare(np.greater),
+        ">=": _build_compare(np.greater_equal),
+        "+": _build_arithmetic("+"),
+        "-": _build_arithmetic("-"),
+        "*": _build_arithmetic("*"),
+        "/": _build_arithmetic("/"),
+        "%": _build_arithmetic("%"),
+        "min": _build_arithmetic("min"),
+        "max": _build_arithmetic("max"),
+        "!": _build_not(True),
+        "!!": _build_not(False),
+        "and": _build_and_or(True),
+        "or": _build_and_or(False),
+        "if": _build_if,
+        "?:": _build_ternary,
+        "in": _build_in,
+    })
+
+# --- Columns ---
+
+def _as_column(values: List[Any]) -> Any:
+    if values and all(type(v) in (int, float) for v in values):
+        return np.array(values, dtype=float)
+    if values and all(type(v) is bool for v in values):
+        return np.array(values, dtype=bool)
+    if values and all(type(v) is str for v in values):
+        return np.array(values, dtype=str)
+    column = np.empty(len(values), dtype=object)
+    for i, v in enumerate(values):
+        column[i] = v
+    return column
+
+def _kind(value: Any) -> str:
+    """
+    num / bool / str, or obj for anything whose json_logic semantics need the row path.
+    """
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == "f":
+            return "num"
+        if value.dtype.kind == "b":
+            return "bool"
+        if value.dtype.kind == "U":
+            return "str"
+        return "obj"
+    if type(value) in (int, float):
+        return "num"
+    if type(value) is bool:
+        return "bool"
+    if isinstance(value, str):
+        return "str"
+    return "obj"
+
+def _fit(value: Any, n: int) -> Any:
+    """
+    Turns a NumPy result (array or scalar) into a num / bool column of length n.
+    """
+    value = np.asarray(value)
+    if value.dtype.kind == "b":
+        return np.broadcast_to(value, (n,)).copy()
+    return np.broadcast_to(value.astype(float), (n,)).copy()
+
+def _truthy(value: Any, n: int) -> Any:
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == "b":
+            return value
+        if value.dtype.kind == "f":
+            return value != 0
+        if value.dtype.kind == "U":
+            return np.char.str_len(value) > 0
+        return np.fromiter((bool(v) for v in value), dtype=bool, count=n)
+    return np.full(n, bool(value))
+
+def _at(value: Any, i: int) -> Any:
+    if isinstance(value, np.ndarray):
+        return value[i].item() if value.dtype.kind in "fbU" else value[i]
+    return value
+
+def _elementwise(n: int, a: Any, b: Any, fn: Callable[[Any, Any], bool]) -> Any:
+    left = a.tolist() if isinstance(a, np.ndarray) else [a] * n
+    right = b.tolist() if isinstance(b, np.ndarray) else [b] * n
+    return np.array([fn(x, y) for x, y in zip(left, right)], dtype=bool)
+
+def _where(mask: Any, a: Any, b: Any, n: int) -> Any:
+    ka, kb = _kind(a), _kind(b)
+    if ka == kb and ka in ("num", "bool", "str"):
+        return np.where(mask, a, b)
+    # Mixed kinds: keep the original Python values (json_logic returns them unchanged)
+    result = np.empty(n, dtype=object)
+    for i in range(n):
+        result[i] = _at(a, i) if mask[i] else _at(b, i)
+    return result
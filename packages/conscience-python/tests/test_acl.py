@@ -24,3 +24,59 @@ def test_acl_resource_pattern():
     
     assert ace.check(user, "write", "project:A:doc1") == True
     assert ace.check(user, "write", "project:B:doc1") == False
+
+def naive_check(policies, identity, permission, resource_id):
+    # The original loop over every role x policy
+    import fnmatch
+    for role in identity.roles:
+        for policy in policies:
+            if policy.role == role and fnmatch.fnmatch(resource_id, policy.resource_pattern):
+                if permission in policy.permissions or "admin" in policy.permissions:
+                    return True
+    return False
+
+def test_compiled_matcher_matches_fnmatch():
+    patterns = ["*", "doc:1", "doc:*", "doc:1*", "project:?:doc", "project:[AB]:*", "*:secret", "", "doc:1[!0-9]"]
+    resources = ["doc:1", "doc:12", "doc:1x", "doc:", "project:A:doc", "project:C:x", "project:B:y", "x:secret", "", "other"]
+    ace = AccessControlEngine()
+    for i, pattern in enumerate(patterns):
+        ace.add_policy(ACL(role=f"r{i % 3}", permissions=["read"] if i % 2 else ["write", "read"], resource_pattern=pattern))
+    ace.add_policy(ACL(role="r3", permissions=["admin"], resource_pattern="project:*"))
+
+    batched = AccessControlEngine()
+    for policy in ace.policies:
+        batched.add_policy(policy)
+
+    for roles in (["r0"], ["r1"], ["r2"], ["r1", "r3"], ["nobody"]):
+        user = IdentityContext(user_id="u", roles=roles)
+        requests = [(permission, resource) for permission in ("read", "write", "execute") for resource in resources]
+        expected = [naive_check(ace.policies, user, permission, resource) for permission, resource in requests]
+        assert [ace.check(user, permission, resource) for permission, resource in requests] == expected
+        assert batched.check_many(user, requests) == expected
+
+def test_check_many_and_cache_invalidation():
+    ace = AccessControlEngine()
+    ace.add_policy(ACL(role="editor", permissions=["write"], resource_pattern="project:A:*"))
+    user = IdentityContext(user_id="u2", roles=["editor"])
+
+    assert ace.check_many(user, [("write", "project:A:doc1"), ("write", "project:B:doc1")]) == [True, False]
+    
+    # A new policy must not be hidden by a cached denial
+    ace.add_policy(ACL(role="editor", permissions=["write"], resource_pattern="project:B:doc1"))
+    assert ace.check(user, "write", "project:B:doc1") == True
+
+def test_policies_replaced_in_place_are_recompiled():
+    ace = AccessControlEngine()
+    ace.add_policy(ACL(role="editor", permissions=["write"], resource_pattern="project:A:*"))
+    user = IdentityContext(user_id="u2", roles=["editor"])
+    assert ace.check(user, "write", "project:A:doc1") == True
+
+    # Same number of policies, different grant
+    ace.policies[0] = ACL(role="editor", permissions=["write"], resource_pattern="project:B:*")
+    assert ace.check(user, "write", "project:A:doc1") == False
+    assert ace.check_many(user, [("write", "project:B:doc1")]) == [True]
+
+    ace.policies = [ACL(role="editor", permissions=["read"], resource_pattern="*")]
+    assert ace.check(user, "write", "project:B:doc1") == False
+    ace.add_policy(ACL(role="editor", permissions=["write"], resource_pattern="doc:*"))
+    assert ace.check(user, "read", "x") == True and ace.check(user, "write", "doc:1") == True
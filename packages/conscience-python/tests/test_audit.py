@@ -0,0 +1,97 @@
+import asyncio
+import json
+import pytest
+from noetic_conscience import Evaluator, JudgementContext, Principle
+from noetic_conscience.audit import AuditLogger, SOURCE_PLANNER
+from noetic_conscience.audit_export import AuditExporter, NDJSONSink, SQLiteSink
+
+def test_history_is_a_bounded_ring():
+    audit = AuditLogger(history_limit=3)
+    for i in range(5):
+        audit.log_judgement(f"skill.{i}", float(i), [])
+    
+    history = audit.get_history()
+    assert [r.action_id for r in history] == ["skill.2", "skill.3", "skill.4"]
+    assert [r.seq for r in history] == [2, 3, 4]
+    assert len(audit) == 3
+
+    # A snapshot: mutating it fails instead of silently doing nothing
+    with pytest.raises(AttributeError):
+        audit.history.append(history[0])
+    audit.clear()
+    assert audit.history == () and len(audit) == 0
+    audit.log_judgement("skill.5", 5.0, [])
+    assert [r.seq for r in audit.history] == [5]
+
+def test_planner_judgements_are_sampled():
+    audit = AuditLogger(history_limit=100, planner_sample_rate=0.25)
+    for i in range(20):
+        audit.log_judgement("skill.search", 1.0, [], source=SOURCE_PLANNER)
+    audit.log_violation("p_veto", "blocked", action_id="skill.search", source=SOURCE_PLANNER)
+    audit.log_judgement("skill.act", 0.0, [])
+
+    assert len(audit.query(source=SOURCE_PLANNER, veto=False)) == 5
+    assert audit.sampled_out == 15
+    # Violations and decisions are always kept
+    assert len(audit.query(veto=True)) == 1
+    assert len(audit.query(action_id="skill.act")) == 1
+
+def test_query_by_action_and_principle():
+    evaluator = Evaluator()
+    principles = [
+        Principle(id="p_cost", affects="val.frugality", logic={"if": [{">": [{"var": "action_args.cost"}, 10]}, 2.0, 0]}),
+        Principle(id="p_tag", affects="val.safety", logic={"if": [{"in": ["risky", {"var": "tags"}]}, 1.0, 0]}),
+    ]
+    for action, cost, tags in [("skill.buy", 50, []), ("skill.buy", 1, ["risky"]), ("skill.read", 0, [])]:
+        evaluator.judge(JudgementContext(agent_id="a", action_id=action, action_args={"cost": cost}, tags=tags), principles)
+
+    assert [r.total_cost for r in evaluator.audit.query(action_id="skill.buy")] == [2.0, 1.0]
+    assert [r.action_id for r in evaluator.audit.query(principle_id="p_tag")] == ["skill.buy"]
+    assert len(evaluator.audit.query(limit=1)) == 1
+
+def test_exporter_streams_to_ndjson_and_sqlite(tmp_path):
+    audit = AuditLogger(history_limit=4)
+
+    async def run():
+        ndjson = AuditExporter(audit, NDJSONSink(str(tmp_path / "audit.ndjson")), batch_size=2)
+        sqlite = SQLiteSink(str(tmp_path / "audit.db"))
+        exporter = AuditExporter(audit, sqlite)
+        audit.log_judgement("skill.a", 1.0, [{"id": "p_1", "cost": 1.0}])
+        audit.log_violation("p_veto", "blocked", action_id="skill.b")
+        assert await ndjson.flush() == 2
+        assert await exporter.flush() == 2
+        
+        # The ring wraps before the next export: two records are lost
+        for i in range(6):
+            audit.log_judgement(f"skill.c{i}", 0.0, [])
+        assert await exporter.flush() == 4
+        assert exporter.lost == 2
+        rows = sqlite.query(principle_id="p_veto")
+        await ndjson.stop()
+        await exporter.stop()
+        return rows
+
+    rows = asyncio.run(run())
+    assert rows[0]["action_id"] == "skill.b" and rows[0]["veto"] and rows[0]["total_cost"] == float("inf")
+    lines = [json.loads(line) for line in (tmp_path / "audit.ndjson").read_text().splitlines()]
+    assert [l["action_id"] for l in lines][:2] == ["skill.a", "skill.b"]
+    assert lines[1]["total_cost"] is None
+
+def test_sqlite_sink_keeps_the_records_of_every_logger(tmp_path):
+    path = str(tmp_path / "audit.db")
+
+    async def export(action_id, principle_id):
+        # A new logger (e.g. after a restart): its seq starts at 0 again
+        audit = AuditLogger()
+        exporter = AuditExporter(audit, SQLiteSink(path))
+        audit.log_judgement(action_id, 1.0, [{"id": principle_id, "cost": 1.0}])
+        await exporter.stop()
+
+    asyncio.run(export("act.first", "p.first"))
+    asyncio.run(export("act.second", "p.second"))
+
+    sink = SQLiteSink(path)
+    assert [r["action_id"] for r in sink.query()] == ["act.second", "act.first"]
+    assert [r["action_id"] for r in sink.query(principle_id="p.first")] == ["act.first"]
+    assert [r["seq"] for r in sink.query()] == [0, 0]
+    sink.close()
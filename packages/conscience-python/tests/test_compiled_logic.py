@@ -0,0 +1,54 @@
+import gc
+import weakref
+import pytest
+import json_logic
+from noetic_conscience import Evaluator, JudgementContext, Principle, PolicyViolationError
+from noetic_conscience.logic import LogicEngine, compile_rule
+
+DATA = {
+    "action": {"id": "send_email", "cost": 120},
+    "action_args": {"cost": 120, "to": ["a@x.io", "b@x.io"]},
+    "tags": ["comms", "external"],
+    "world_state": {"user:mood": "angry", "budget": "100", "items": [1, 2, 3]}
+}
+
+RULES = [
+    {"if": [{">": [{"var": "action_args.cost"}, 100]}, 50.0, 0.0]},
+    {"if": [{"==": [{"var": "action.id"}, "send_email"]}, 1, {"var": "missing.path"}]},
+    {"if": [False, 1, {"in": ["external", {"var": "tags"}]}, 7, 0]},
+    {"and": [{"var": "tags"}, {"!": {"var": "world_state.nope"}}, 3]},
+    {"or": [0, "", {"var": "world_state.nope"}, {"var": ["world_state.nope", 4]}]},
+    {"+": [{"var": "action.cost"}, {"*": [2, {"var": "world_state.budget"}]}, 1]},
+    {"<": [1, {"var": "world_state.items.1"}, 3]},
+    {"max": [{"var": "world_state.items.0"}, {"var": "world_state.items.2"}]},
+    {"cat": ["x", {"var": "world_state.user:mood"}]},
+    {"reduce": [{"var": "world_state.items"}, {"+": [{"var": "current"}, {"var": "accumulator"}]}, 0]},
+    {"some": [{"var": "tags"}, {"==": [{"var": ""}, "comms"]}]},
+    {"missing": ["action.id", "action.nope"]},
+    {"?:": [{"!!": [{"var": "world_state.budget"}]}, 2, 3]},
+]
+
+@pytest.mark.parametrize("rule", RULES)
+def test_compiled_rules_match_interpreter(rule):
+    assert compile_rule(rule)(DATA) == json_logic.jsonLogic(rule, DATA)
+
+def test_errors_fail_closed():
+    engine = LogicEngine()
+    assert engine.run(engine.compile({"no_such_op": [1]}), DATA) == float("inf")
+    assert LogicEngine(safety_mode="fail_open").run(compile_rule({"/": [1, 0]}), DATA) == 0.0
+
+def test_evaluator_recompiles_replaced_logic_and_is_collectable():
+    evaluator = Evaluator()
+    principle = Principle(id="p", affects="val.test", logic={"if": [True, 2.0, 0.0]})
+    ctx = JudgementContext(agent_id="a", action_id="act")
+    assert evaluator.judge(ctx, [principle]).cost == 2.0
+    
+    principle.logic = {"if": [True, 1e999, 0.0]}
+    with pytest.raises(PolicyViolationError):
+        evaluator.judge(ctx, [principle])
+    
+    # No cache keeps the evaluator alive
+    ref = weakref.ref(evaluator)
+    del evaluator
+    gc.collect()
+    assert ref() is None
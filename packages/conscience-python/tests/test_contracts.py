@@ -0,0 +1,69 @@
+import datetime
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa, ed25519
+from noetic_conscience.contracts import (
+    AgenticIntentContract, AICHeader, AICCapabilityScopes, AICSafetyGuardrails, AICUserPreferences,
+    VerificationCache, verify_many
+)
+
+def make_contract(tools=("search",), expires_at=None) -> AgenticIntentContract:
+    return AgenticIntentContract(
+        header=AICHeader(user_id="u1", origin_device="cli", expires_at=expires_at),
+        scopes=AICCapabilityScopes(allowed_tools=list(tools)),
+        safety=AICSafetyGuardrails(),
+        preferences=AICUserPreferences()
+    )
+
+def generate_key(kind: str):
+    if kind == "rsa":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return ed25519.Ed25519PrivateKey.generate()
+
+@pytest.fixture(params=["rsa", "ed25519"])
+def private_key(request):
+    return generate_key(request.param)
+
+def test_sign_and_verify(private_key):
+    contract = make_contract()
+    contract.sign(private_key)
+    assert contract.verify(private_key.public_key())
+    
+    contract.scopes.allowed_tools.append("delete")
+    assert not contract.verify(private_key.public_key())
+
+def test_cache_skips_repeat_verification_but_not_tampering(private_key):
+    cache = VerificationCache()
+    public_key = private_key.public_key()
+    contract = make_contract()
+    contract.sign(private_key)
+    
+    assert contract.verify(public_key, cache=cache)
+    assert contract.verify(public_key, cache=cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    
+    contract.scopes.allowed_tools.append("delete")
+    assert not contract.verify(public_key, cache=cache)
+    # Another key never reuses an entry verified by this one
+    contract.scopes.allowed_tools.remove("delete")
+    other = generate_key("ed25519" if isinstance(private_key, ed25519.Ed25519PrivateKey) else "rsa")
+    assert not contract.verify(other.public_key(), cache=cache)
+
+def test_cache_honors_expires_at(private_key):
+    cache = VerificationCache()
+    expired = make_contract(expires_at=datetime.datetime.now() - datetime.timedelta(seconds=1))
+    expired.sign(private_key)
+    
+    assert expired.verify(private_key.public_key(), cache=cache)
+    assert len(cache) == 0
+
+def test_verify_many_checks_each_signature_once(private_key):
+    cache = VerificationCache()
+    public_key = private_key.public_key()
+    good, other = make_contract(), make_contract(tools=("mail",))
+    good.sign(private_key)
+    other.sign(private_key)
+    forged = make_contract(tools=("mail",))
+    forged.signature = good.signature
+    
+    assert verify_many([good, good, other, forged, make_contract()], public_key, cache=cache) == [True, True, True, False, False]
+    assert len(cache) == 2
@@ -0,0 +1,63 @@
+import random
+import pytest
+from noetic_conscience import Evaluator, JudgementContext, Principle, PolicyViolationError
+
+PRINCIPLES = [
+    Principle(id="p_cost", affects="val.frugality", logic={"if": [{">": [{"var": "action_args.cost"}, 100]}, 50.0, 0.0]}),
+    Principle(id="p_mood", affects="val.empathy", logic={"if": [{"==": [{"var": "world_state.mood"}, "angry"]}, 2.5, 0.0]}),
+    Principle(id="p_tags", affects="val.safety", logic={"if": [{"in": ["risky", {"var": "tags"}]}, 1.5, 0.0]}),
+    Principle(id="p_ratio", affects="val.math", logic={"/": [{"var": "action_args.cost"}, {"var": "world_state.budget"}]}),
+    Principle(id="p_mix", affects="val.mix", logic={"and": [{"var": "world_state.flag"}, {"+": [{"var": "action_args.cost"}, 1]}]}),
+    Principle(id="p_or", affects="val.mix", logic={"or": [{"!": {"var": "world_state.flag"}}, {"-": [{"var": "world_state.budget"}, 3]}]}),
+    Principle(id="p_veto", affects="val.safety", logic={"if": [{"==": [{"var": "action.id"}, "skill.delete"]}, 1e999, 0.0]}),
+    Principle(id="p_cat", affects="val.text", logic={"if": [{"==": [{"cat": ["x", {"var": "world_state.mood"}]}, "xcalm"]}, 0.25, 0]}),
+]
+
+def random_context(rng: random.Random) -> JudgementContext:
+    cost = rng.choice([5, 150, 99.5, "120", None, 0])
+    return JudgementContext(
+        agent_id="agent",
+        action_id=rng.choice(["skill.read", "skill.write", "skill.delete"]),
+        action_args={} if cost is None else {"cost": cost},
+        tags=rng.choice([["io"], ["io", "risky"], []]),
+        world_state={
+            "mood": rng.choice(["angry", "calm", 3, None]),
+            "budget": rng.choice([10, 0, "7", 2.5]),
+            "flag": rng.choice([True, False, 1, "yes", None])
+        }
+    )
+
+def single(evaluator, ctx):
+    try:
+        return evaluator.judge(ctx, PRINCIPLES)
+    except PolicyViolationError as e:
+        return e
+
+@pytest.mark.parametrize("threshold", [1, 10_000]) # Column-wise and row-wise paths
+def test_judge_batch_matches_judge(threshold):
+    rng = random.Random(42)
+    contexts = [random_context(rng) for _ in range(200)]
+    evaluator = Evaluator(vector_threshold=threshold)
+    
+    results = evaluator.judge_batch(contexts, PRINCIPLES)
+    
+    assert len(results) == len(contexts)
+    for ctx, batched in zip(contexts, results):
+        expected = single(Evaluator(), ctx)
+        if isinstance(expected, PolicyViolationError):
+            assert batched.allowed is False
+            assert batched.cost == float("inf")
+            assert batched.breakdown[0]["id"] == expected.principle_id
+        else:
+            assert batched.allowed is True
+            assert batched.cost == expected.cost
+            assert batched.breakdown == expected.breakdown
+
+def test_judge_batch_audits_like_judge():
+    evaluator = Evaluator()
+    contexts = [JudgementContext(agent_id="a", action_id=a) for a in ["skill.read", "skill.delete"] * 5]
+    evaluator.judge_batch(contexts, [p for p in PRINCIPLES if p.id in ("p_tags", "p_veto")])
+    
+    history = evaluator.audit.get_history()
+    assert [r.veto for r in history] == [False, True] * 5
+    assert history[1].breakdown[0]["id"] == "p_veto"
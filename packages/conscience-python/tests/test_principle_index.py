@@ -0,0 +1,51 @@
+import pytest
+from noetic_conscience import Evaluator, JudgementContext, Principle, PolicyViolationError
+from noetic_conscience.index import PrincipleIndex, analyze
+
+PRINCIPLES = [
+    Principle(id="p_delete", affects="val.safety", logic={"if": [{"==": [{"var": "action.id"}, "skill.delete"]}, 1e999, 0]}),
+    Principle(id="p_pii", affects="val.privacy", logic={"if": [{"in": ["tag.pii", {"var": "tags"}]}, 3.0, 0.0]}),
+    Principle(id="p_write", affects="val.care", logic={"and": [{"in": [{"var": "action_id"}, ["skill.write", "skill.put"]]}, {"var": "action_args.size"}]}),
+    Principle(id="p_cost", affects="val.frugality", logic={"if": [{">": [{"var": "action_args.cost"}, 100]}, 50.0, 0.0]}),
+    # Costs something when the guard fails: must never be skipped
+    Principle(id="p_else", affects="val.care", logic={"if": [{"==": [{"var": "action.id"}, "skill.read"]}, 0, 1.0]}),
+]
+
+def ctx(action_id, tags=None, **args):
+    return JudgementContext(agent_id="agent", action_id=action_id, action_args=args, tags=tags or [])
+
+def test_analyze_records_var_paths_and_guard_literals():
+    deps = analyze(PRINCIPLES[2].logic)
+    assert deps.var_paths == {"action_id", "action_args.size"}
+    assert deps.action_ids == {"skill.write", "skill.put"}
+
+    assert analyze(PRINCIPLES[1].logic).tags == {"tag.pii"}
+    assert analyze(PRINCIPLES[3].logic).guard is None
+    assert analyze(PRINCIPLES[4].logic).guard is None
+    assert PrincipleIndex(PRINCIPLES).guarded == 3
+
+def test_judge_skips_principles_guarded_on_other_actions():
+    evaluator = Evaluator()
+    result = evaluator.judge(ctx("skill.read", cost=150), PRINCIPLES)
+    assert result.cost == 50.0
+    assert result.skipped == 3
+
+    result = evaluator.judge(ctx("skill.write", ["tag.pii"], size=2), PRINCIPLES)
+    assert result.cost == 3.0 + 2 + 1.0
+    assert result.skipped == 1
+    assert evaluator.stats == {"evaluated": 2 + 4, "skipped": 3 + 1}
+
+    with pytest.raises(PolicyViolationError):
+        evaluator.judge(ctx("skill.delete"), PRINCIPLES)
+
+def test_skipping_does_not_change_results():
+    contexts = [ctx(a, t, cost=c, size=s) for a in ["skill.read", "skill.write", "skill.put", "skill.delete"]
+                for t in [[], ["tag.pii"]] for c in [5, 150] for s in [0, 4]]
+    evaluator = Evaluator()
+    indexed = Evaluator(vector_threshold=1).judge_batch(contexts, PRINCIPLES)
+    for context, result in zip(contexts, indexed):
+        # Reference: every principle evaluated, no index
+        data = evaluator._prepare(context, None)
+        expected = sum(evaluator.logic_engine.run(evaluator._compile(p), data) for p in PRINCIPLES)
+        assert result.cost == expected
+        assert result.allowed == (expected != float("inf"))
@@ -0,0 +1,74 @@
+"""
+FlowExecutor run time of linear flows of 125 to 1000 states, each running a
+skill. A run should cost the same per state whatever the flow length, with or
+without a checkpoint journal (in a temporary SQLite file). Building the executor
+of a flow already in the FlowCompileCache (as a second engine would) costs a hash.
+
+    python -m benchmarks.bench_flow   (from packages/engine-python)
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+from noetic_engine.runtime.executors.flow import FlowExecutor
+from noetic_engine.runtime.executors.checkpoints import FlowCheckpointStore
+from noetic_engine.runtime.executors.flow_cache import FlowCompileCache
+from noetic_engine.skills import SkillRegistry, Skill, SkillResult, SkillContext
+from noetic_knowledge import WorldState
+
+RUNS = 3
+
+class EchoSkill(Skill):
+    id = "skill.bench.echo"
+    description = "Returns its arguments"
+    schema = {}
+
+    async def execute(self, context, **kwargs):
+        return SkillResult(success=True, data=kwargs)
+
+def linear_flow(n: int) -> dict:
+    states = {}
+    for i in range(n):
+        state = {"skill": EchoSkill.id, "params": {f"step_{i}": i}}
+        if i + 1 < n:
+            state["next"] = f"S{i + 1}"
+        else:
+            state["end"] = True
+        states[f"S{i}"] = state
+    return {"id": f"flow.bench_{n}", "start_at": "S0", "states": states}
+
+async def bench(n: int, checkpoints: FlowCheckpointStore = None) -> tuple:
+    registry = SkillRegistry()
+    registry.register(EchoSkill())
+    cache = FlowCompileCache()
+    start = time.perf_counter()
+    executor = FlowExecutor(linear_flow(n), skill_registry=registry, checkpoints=checkpoints, compile_cache=cache)
+    build_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    FlowExecutor(linear_flow(n), skill_registry=SkillRegistry(), checkpoints=checkpoints, compile_cache=cache)
+    cached_ms = (time.perf_counter() - start) * 1000
+
+    context = SkillContext(agent_id="bench")
+    world = WorldState(tick=0, entities={}, facts=[])
+    result = await executor.step({}, world, skill_context=context)
+    assert len(result["trace"]) == n and len(result["results"]) == n, len(result.get("trace", []))
+
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        await executor.step({}, world, skill_context=context)
+    run_ms = (time.perf_counter() - start) / RUNS * 1000
+    return build_ms, cached_ms, run_ms
+
+async def main():
+    print(f"{'states':>8} {'build ms':>10} {'cached ms':>10} {'run ms':>10} {'us/state':>10} {'journaled us/state':>20}")
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoints = FlowCheckpointStore(os.path.join(tmp, "flows.db"))
+        for n in (125, 250, 500, 1000):
+            build_ms, cached_ms, run_ms = await bench(n)
+            _, _, journaled_ms = await bench(n, checkpoints)
+            print(f"{n:>8} {build_ms:>10.1f} {cached_ms:>10.1f} {run_ms:>10.1f} {run_ms * 1000 / n:>10.1f} {journaled_ms * 1000 / n:>20.1f}")
+        checkpoints.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""
+MCP tool-call throughput against a local stub JSON-RPC server: a new httpx client
+per call (previous behaviour) vs. the engine's pooled keep-alive HttpTransport,
+sequentially and with concurrent calls.
+
+    python -m benchmarks.bench_http   (from packages/engine-python)
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+from noetic_stdlib.transport import HttpTransport
+from noetic_engine.skills.adapter_mcp import McpSkillAdapter
+from noetic_engine.skills.interfaces import SkillContext
+
+CALLS = 500
+CONCURRENCY = 16
+
+class StubRpcHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive
+    disable_nagle_algorithm = True
+    wbufsize = -1 # One write per response (flushed by the handler)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        body = json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": {"content": [{"type": "text", "text": "ok"}]}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+async def run(adapter: McpSkillAdapter, context: SkillContext, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(i):
+        async with semaphore:
+            result = await adapter.execute(context, n=i)
+            assert result.success, result.error
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call(i) for i in range(CALLS)))
+    return CALLS / (time.perf_counter() - start)
+
+async def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubRpcHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    adapter = McpSkillAdapter(url, "stub", "Stub tool", {})
+
+    try:
+        print(f"{CALLS} tools/call requests to a local stub server")
+        for concurrency in (1, CONCURRENCY):
+            unpooled = await run(adapter, SkillContext(agent_id="bench"), concurrency)
+            transport = HttpTransport()
+            pooled = await run(adapter, SkillContext(agent_id="bench", engine=SimpleNamespace(http=transport)), concurrency)
+            await transport.aclose()
+            print(f"  concurrency {concurrency:>2}: client per call {unpooled:>7.0f} calls/s, "
+                  f"pooled {pooled:>7.0f} calls/s ({pooled / unpooled:.1f}x)")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,53 @@
+"""
+LocalAgent `run_command` latency: a shell per command (`sh -c`), direct exec, and
+Python commands handed to pre-warmed interpreters. Commands are spaced by PAUSE
+(excluded from the timings), the idle time in which used workers are replaced.
+
+    python -m benchmarks.bench_process   (from packages/engine-python)
+"""
+import asyncio
+import shlex
+import sys
+import time
+
+from noetic_conscience.contracts import AgenticIntentContract, AICHeader, AICCapabilityScopes, AICSafetyGuardrails, AICUserPreferences
+from noetic_stdlib.agents import LocalAgent, AgentDefinition
+from noetic_stdlib.process import ProcessPool
+
+RUNS = 30
+PAUSE = 0.2
+PYTHON = [sys.executable, "-c", "print('ok')"]
+
+CONTRACT = AgenticIntentContract(
+    header=AICHeader(user_id="bench", origin_device="cli"),
+    scopes=AICCapabilityScopes(allowed_tools=["run_command"]),
+    safety=AICSafetyGuardrails(),
+    preferences=AICUserPreferences()
+)
+
+async def run(agent: LocalAgent, params: dict) -> float:
+    total = 0.0
+    for _ in range(RUNS):
+        await asyncio.sleep(PAUSE)
+        start = time.perf_counter()
+        result = await agent.execute("run_command", params, CONTRACT)
+        total += time.perf_counter() - start
+        assert result["status"] == "success", result
+    return total / RUNS * 1000
+
+async def main():
+    definition = AgentDefinition(id="local", name="Local", description="", allowed_tools=["run_command"])
+    cold = LocalAgent(definition, pool=ProcessPool())
+    warm_pool = ProcessPool(warm_workers=2)
+    await warm_pool.start()
+    warm = LocalAgent(definition, pool=warm_pool)
+
+    print(f"{RUNS} commands, {PAUSE}s apart, mean latency")
+    print(f"  echo via sh -c          {await run(cold, {'command': 'echo ok; true'}):7.2f} ms")
+    print(f"  echo exec'd             {await run(cold, {'command': 'echo ok'}):7.2f} ms")
+    print(f"  python -c, cold         {await run(cold, {'command': shlex.join(PYTHON)}):7.2f} ms")
+    print(f"  python -c, warm worker  {await run(warm, {'argv': PYTHON}):7.2f} ms")
+    await warm_pool.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,159 @@
+import json
+import logging
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FACTS_SECTION = "knowledge"
+FACTS_KEY = "initial_state"
+
+class CodexReader:
+    """
+    Incremental reader of a .noetic Codex (one JSON object).
+
+    The file is read in chunks and decoded one value at a time, so the facts of
+    `knowledge.initial_state`, which may run to millions, are never all held in
+    memory: `sections()` decodes every other section and only counts the facts,
+    `facts()` streams them. Each call reads the file again; the definitions are
+    small next to a knowledge pack, so a second pass costs little.
+    """
+    def __init__(self, path: str, chunk_size: int = 1 << 16):
+        self.path = path
+        self.chunk_size = chunk_size
+
+    def sections(self) -> Tuple[Dict[str, Any], int]:
+        """
+        The Codex without `knowledge.initial_state`, and the number of facts it holds.
+        """
+        data: Dict[str, Any] = {}
+        facts = 0
+        for kind, key, value in self._events():
+            if kind == "section":
+                data[key] = value
+            elif kind == "knowledge":
+                data.setdefault(FACTS_SECTION, {})[key] = value
+            else:
+                facts += 1
+        return data, facts
+
+    def facts(self) -> Iterator[Any]:
+        """
+        The entries of `knowledge.initial_state`, in file order.
+        """
+        for kind, _, value in self._events():
+            if kind == "fact":
+                yield value
+
+    def _events(self) -> Iterator[Tuple[str, Optional[str], Any]]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            stream = _Stream(f, self.chunk_size)
+            for key in stream.members():
+                if key != FACTS_SECTION or stream.peek() != "{":
+                    yield "section", key, stream.value()
+                    continue
+                for inner in stream.members():
+                    if inner != FACTS_KEY:
+                        yield "knowledge", inner, stream.value()
+                    elif stream.peek() == "[":
+                        for _ in stream.elements():
+                            yield "fact", None, stream.value()
+                    else:
+                        facts = stream.value()
+                        for fact in facts if isinstance(facts, list) else []:
+                            yield "fact", None, fact
+            stream.end()
+
+class _Stream:
+    """
+    A window over a text file, decoding JSON values with the C scanner of `json`.
+    """
+    def __init__(self, f, chunk_size: int):
+        self._file = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: int) -> bool:
+        if self._eof:
+            return False
+        chunk = self._file.read(size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            buf, pos = self._buf, self._pos
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill(self._chunk_size):
+                return ""
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self._buf, self._pos)
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Incomplete in the window: read at least as much again, so a large
+                # value is decoded in O(log size) attempts
+                if not self._fill(max(self._chunk_size, len(self._buf) - self._pos)):
+                    raise
+                continue
+            # A number at the window's edge may go on in the next chunk
+            if end == len(self._buf) and not self._eof and self._fill(self._chunk_size):
+                continue
+            self._pos = end
+            return value
+
+    def members(self) -> Iterator[str]:
+        """
+        The keys of an object, each to be followed by reading its value.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("}")
+            return
+
+    def elements(self) -> Iterator[None]:
+        """
+        One step per element of an array, each to be followed by reading it.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield None
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("]")
+            return
+
+    def end(self):
+        if self.peek():
+            raise json.JSONDecodeError("Extra data", self._buf, self._pos)
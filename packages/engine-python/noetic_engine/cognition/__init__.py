@@ -2,5 +2,6 @@ from .evaluator import Evaluator
 from .flow_manager import FlowManager
 from .manager import AgentManager
 from .planner import Planner
+from .plan_cache import PlanCache
 
-__all__ = ["Evaluator", "FlowManager", "AgentManager", "Planner"]
+__all__ = ["Evaluator", "FlowManager", "AgentManager", "Planner", "PlanCache"]
@@ -1,18 +1,58 @@
-from typing import Dict, Optional, Any
+import logging
+from typing import Dict, List, Optional, Any
 from noetic_engine.runtime.executors.flow import FlowExecutor
+from noetic_engine.runtime.executors.checkpoints import FlowCheckpointStore
+from noetic_engine.runtime.executors.flow_cache import FlowCompileCache, shared_flow_cache
+
+logger = logging.getLogger(__name__)
 
 class FlowManager:
-    def __init__(self, skill_registry: Optional[Any] = None):
+    def __init__(self, skill_registry: Optional[Any] = None, result_cache: Optional[Any] = None, checkpoints: Optional[FlowCheckpointStore] = None, compile_cache: Optional[FlowCompileCache] = None, stream_sinks: Optional[List[Any]] = None):
         self._flows: Dict[str, FlowExecutor] = {}
+        # Definitions registered lazily, compiled on first use
+        self._pending: Dict[str, Dict[str, Any]] = {}
         self.skills = skill_registry
+        self.result_cache = result_cache
+        # Durable run journal shared by every flow (None: runs are not resumable)
+        self.checkpoints = checkpoints
+        # Compiled flows, shared with the other engines of the process by default
+        self.compile_cache = compile_cache if compile_cache is not None else shared_flow_cache()
+        # Receive the chunks of streaming skills run by flows (the engine shares them with plans)
+        self.stream_sinks: List[Any] = stream_sinks if stream_sinks is not None else []
 
-    def register(self, flow_def: Dict[str, Any]):
+    def register(self, flow_def: Dict[str, Any], lazy: bool = False):
+        """
+        Compiles a flow, or with `lazy` only records its definition: it is then
+        validated and compiled by the first `get_executor` (and, if invalid, logged
+        and dropped there).
+        """
         flow_id = flow_def.get("id")
         if not flow_id:
             return
         
-        executor = FlowExecutor(flow_def, skill_registry=self.skills)
+        if lazy:
+            self._flows.pop(flow_id, None)
+            self._pending[flow_id] = flow_def
+            return
+        executor = FlowExecutor(flow_def, skill_registry=self.skills, result_cache=self.result_cache, checkpoints=self.checkpoints, compile_cache=self.compile_cache, stream_sinks=self.stream_sinks)
+        self._pending.pop(flow_id, None)
         self._flows[flow_id] = executor
 
     def get_executor(self, flow_id: str) -> Optional[FlowExecutor]:
+        flow_def = self._pending.get(flow_id)
+        if flow_def is not None:
+            try:
+                self.register(flow_def)
+            except Exception as e:
+                self._pending.pop(flow_id, None)
+                logger.error(f"Failed to compile flow {flow_id}: {e}")
+                return None
         return self._flows.get(flow_id)
+
+    def interrupted_runs(self) -> List[Dict[str, Any]]:
+        """
+        Runs left unfinished by a crash or a shutdown, to be resumed by run id.
+        """
+        if self.checkpoints is None:
+            return []
+        return [run for run in self.checkpoints.runs(status="running") if run["flow_id"] in self._flows or run["flow_id"] in self._pending]
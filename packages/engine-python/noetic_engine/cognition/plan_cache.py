@@ -0,0 +1,104 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+from noetic_lang.core import Plan
+
+class PlanCache:
+    """
+    LRU + TTL cache of plans produced by the Planner.
+
+    Keys are (agent id, goal target state, fingerprint of the relevant state, heuristic
+    weight, allowed skills), where the relevant state only contains the keys skills (or
+    the goal) read or write. Agents with other skill permissions never share a plan.
+    Every entry remembers the registry version and the principles it was planned under;
+    a mismatch makes it stale.
+    """
+    def __init__(self, max_size: int = 256, ttl: float = 300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        # key -> (expires_at, registry version, principles digest, plan)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, str, Plan]]" = OrderedDict()
+        self._registry_version: Any = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(agent_id: str, target_state: Dict[str, Any], relevant_state: frozenset, weight: float = 1.0, allowed_skills: Iterable[str] = ()) -> Hashable:
+        return (agent_id, _freeze(target_state), relevant_state, weight, frozenset(allowed_skills))
+
+    @staticmethod
+    def principles_digest(principles: List[Any]) -> str:
+        payload = [p.model_dump() if hasattr(p, "model_dump") else p for p in principles or []]
+        return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def get(self, key: Hashable, registry_version: Any, principles_digest: str) -> Optional[Plan]:
+        self._check_registry(registry_version)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, version, digest, plan = entry
+        if expires_at < time.monotonic() or version != registry_version or digest != principles_digest:
+            del self._entries[key]
+            self.evictions += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return plan.model_copy(deep=True)
+
+    def put(self, key: Hashable, plan: Plan, registry_version: Any, principles_digest: str):
+        self._check_registry(registry_version)
+        self._entries[key] = (time.monotonic() + self.ttl, registry_version, principles_digest, plan.model_copy(deep=True))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def invalidate(self, agent_id: Optional[str] = None):
+        """
+        Drops every entry, or only the entries of one agent (e.g. after its principles changed).
+        """
+        if agent_id is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k[0] == agent_id]:
+            del self._entries[key]
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _check_registry(self, registry_version: Any):
+        # A registry change invalidates every plan at once
+        if registry_version != self._registry_version:
+            self._entries.clear()
+            self._registry_version = registry_version
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return frozenset((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
@@ -1,21 +1,91 @@
+import asyncio
 import heapq
+import itertools
+import time
 from typing import List, Dict, Any, Set, Tuple, Optional
 from noetic_lang.core import Plan, PlanStep, Goal, Action
 from noetic_lang.core import AgentDefinition as AgentContext
 from noetic_lang.core.stanza import StanzaDefinition
 from noetic_knowledge.working.stack import MemoryStack
 from noetic_conscience import Evaluator, JudgementContext, JudgementResult, PolicyViolationError
+from noetic_conscience.audit import SOURCE_PLANNER
 from noetic_knowledge import WorldState
 from noetic_engine.skills.registry import SkillRegistry
 from noetic_engine.skills.interfaces import Skill
+from .plan_cache import PlanCache
+
+class SkillIndex:
+    """
+    Precomputed view of the skills an agent may use while planning.
+    Skills are indexed by their (key, value) preconditions, so the applicable skills
+    of a state are found by looking up the state's items instead of testing every skill.
+    """
+    def __init__(self, skills: List[Skill]):
+        self.skills = skills
+        self.postconditions = [dict(s.postconditions) for s in skills]
+        self.unconditional: List[int] = []
+        self.requirements: List[int] = []
+        # Preconditions on None mean "key absent" and cannot be looked up; checked directly
+        self.residual: List[Tuple[Tuple[str, Any], ...]] = []
+        self.by_requirement: Dict[Tuple[str, Any], List[int]] = {}
+
+        keys = set()
+        for i, skill in enumerate(skills):
+            pre = skill.preconditions
+            keys.update(pre.keys())
+            keys.update(self.postconditions[i].keys())
+            indexed = [(k, v) for k, v in pre.items() if v is not None]
+            self.residual.append(tuple((k, v) for k, v in pre.items() if v is None))
+            self.requirements.append(len(indexed))
+            if not indexed:
+                self.unconditional.append(i)
+            for item in indexed:
+                self.by_requirement.setdefault(item, []).append(i)
+
+        # The only state keys planning can read or write
+        self.keys = frozenset(keys)
+
+    def applicable(self, state_items: frozenset, state: Dict[str, Any]) -> List[int]:
+        hits: Dict[int, int] = {}
+        for item in state_items:
+            for i in self.by_requirement.get(item, ()):
+                hits[i] = hits.get(i, 0) + 1
+
+        candidates = list(self.unconditional)
+        candidates.extend(i for i, n in hits.items() if n == self.requirements[i])
+        candidates.sort() # Deterministic: same order as agent.allowed_skills
+        return [
+            i for i in candidates
+            if all(state.get(k) is None for k, _ in self.residual[i])
+        ]
 
 class Planner:
     """
     Goal-Oriented Action Planner (GOAP) implementation.
     """
-    def __init__(self, skill_registry: Optional[SkillRegistry] = None, evaluator: Optional[Evaluator] = None):
+    def __init__(self,
+                 skill_registry: Optional[SkillRegistry] = None,
+                 evaluator: Optional[Evaluator] = None,
+                 cache: Optional[PlanCache] = None,
+                 max_expansions: Optional[int] = None,
+                 deadline_ms: Optional[float] = None,
+                 weight: float = 1.0,
+                 yield_every: int = 128):
+        """
+        :param max_expansions: Default node budget of generate_plan (None = unbounded).
+        :param deadline_ms: Default time budget of generate_plan (None = unbounded).
+        :param weight: Heuristic weight; > 1.0 trades optimality for speed (weighted A*).
+        :param yield_every: Expansions between yields to the event loop.
+        """
         self.registry = skill_registry or SkillRegistry()
         self.evaluator = evaluator or Evaluator()
+        self.cache = cache if cache is not None else PlanCache()
+        self.max_expansions = max_expansions
+        self.deadline_ms = deadline_ms
+        self.weight = weight
+        self.yield_every = yield_every
+        # allowed_skills -> (registry version, SkillIndex)
+        self._indexes: Dict[Tuple[str, ...], Tuple[int, SkillIndex]] = {}
 
     async def create_plan(self, stanza: StanzaDefinition, stack: MemoryStack) -> Plan:
         steps = []
@@ -28,84 +98,227 @@ class Planner:
             ))
         return Plan(steps=steps, total_cost=float(len(steps)))
 
-    async def generate_plan(self, agent: AgentContext, goal: Goal, state: WorldState) -> Plan:
+    async def generate_plan(self,
+                            agent: AgentContext,
+                            goal: Goal,
+                            state: WorldState,
+                            max_expansions: Optional[int] = None,
+                            deadline_ms: Optional[float] = None,
+                            weight: Optional[float] = None) -> Plan:
         """
         Generates a sequence of Actions (Plan) to reach the Goal from the current WorldState,
         respecting the Agent's Principles and Skills.
+
+        Anytime mode: when `max_expansions` or `deadline_ms` runs out (or the goal is
+        unreachable) the best partial plan is returned, i.e. the path to the explored state
+        closest to the goal, with `complete=False` and its `heuristic_distance`;
+        `budget_exhausted` tells a budget cut-off from an unreachable goal.
+        Arguments left as None fall back to the planner's defaults.
         """
+        started = time.perf_counter()
+        max_expansions = self.max_expansions if max_expansions is None else max_expansions
+        deadline_ms = self.deadline_ms if deadline_ms is None else deadline_ms
+        weight = self.weight if weight is None else weight
+
         # 1. Init
-        start_state = self._extract_state(state, agent.id)
+        full_state = self._extract_state(state, agent.id)
         target_state = goal.target_state
-        
-        # Priority Queue: (f_score, g_score, state_frozen, path)
-        # state_frozen is frozenset of items for hashing
-        
+        index = self._skill_index(agent)
+
+        # Plan only over the keys skills (or the goal) reference. Other facts can never
+        # change during the search, so they are dropped from every search node.
+        relevant = index.keys | frozenset(target_state.keys())
+        start_state = {k: v for k, v in full_state.items() if k in relevant}
         start_frozen = frozenset(start_state.items())
+
+        # Identical situations (same agent, skills, goal and relevant facts) reuse the previous plan
+        version = getattr(self.registry, "version", None)
+        cache_key = None
+        if self.cache is not None and version is not None:
+            cache_key = PlanCache.make_key(agent.id, target_state, start_frozen, weight, agent.allowed_skills)
+            digest = PlanCache.principles_digest(agent.principles)
+            cached = self.cache.get(cache_key, version, digest)
+            if cached is not None:
+                if self._passes_vetoes(agent, cached, full_state, start_state):
+                    cached.expansions = 0
+                    cached.planning_ms = (time.perf_counter() - started) * 1000
+                    return cached
+                self.cache.discard(cache_key)
+
+        deadline = started + deadline_ms / 1000 if deadline_ms is not None else None
+        path_skills, cost, complete, budget_exhausted, distance, expansions = await self._search(
+            agent, index, full_state, start_frozen, target_state, max_expansions, deadline, weight
+        )
+
+        plan = self._construct_plan(path_skills, cost)
+        plan.complete = complete
+        plan.budget_exhausted = budget_exhausted
+        plan.heuristic_distance = distance
+        plan.expansions = expansions
+        plan.planning_ms = (time.perf_counter() - started) * 1000
+
+        # Partial plans depend on the budget, only complete ones are reusable
+        if complete and cache_key is not None:
+            self.cache.put(cache_key, plan, version, digest)
+        return plan
+
+    async def _search(self,
+                      agent: AgentContext,
+                      index: SkillIndex,
+                      full_state: Dict[str, Any],
+                      start_frozen: frozenset,
+                      target_state: Dict[str, Any],
+                      max_expansions: Optional[int],
+                      deadline: Optional[float],
+                      weight: float) -> Tuple[List[Skill], float, bool, bool, float, int]:
+        """
+        (Weighted) A* over the projected state space.
+        Returns (skills, cost, complete, budget exhausted, heuristic distance, expansions).
+        """
+        # Priority Queue: (f_score, g_score, seq, state_frozen, path)
+        # state_frozen is frozenset of items for hashing
+        # seq breaks ties so heapq never compares states or skills
+        sequence = itertools.count()
+        start_h = self._heuristic(dict(start_frozen), target_state)
         
         queue = []
-        heapq.heappush(queue, (0, 0, start_frozen, []))
+        heapq.heappush(queue, (weight * start_h, 0, next(sequence), start_frozen, []))
         
         visited = set()
+        # (skill index, child state) -> moral cost, or None when vetoed
+        judgements: Dict[Tuple[int, frozenset], Optional[float]] = {}
+        # Best partial plan so far: closest to the goal, then cheapest
+        best = (start_h, 0.0, [])
+        expansions = 0
+        budget_exhausted = False
         
         # 2. Search
         while queue:
-            f, g, current_frozen, path = heapq.heappop(queue)
-            current_dict = dict(current_frozen)
+            f, g, _, current_frozen, path = heapq.heappop(queue)
             
             if current_frozen in visited:
                 continue
             visited.add(current_frozen)
+            current_dict = dict(current_frozen)
             
             # Check Goal
             if self._satisfies(current_dict, target_state):
-                return self._construct_plan(path, g)
-            
-            # Explore Neighbors (Skills)
-            # Filter skills allowed for this agent
-            available_skills = [
-                self.registry.get_skill(sid) 
-                for sid in agent.allowed_skills 
-                if self.registry.get_skill(sid)
-            ]
+                return path, g, True, False, 0.0, expansions
+
+            h = self._heuristic(current_dict, target_state)
+            if (h, g) < best[:2]:
+                best = (h, g, path)
+
+            # Budget
+            if (max_expansions is not None and expansions >= max_expansions) or \
+                    (deadline is not None and time.perf_counter() >= deadline):
+                budget_exhausted = True
+                break
+            expansions += 1
+            if expansions % self.yield_every == 0:
+                # Let reflexes and other agents run; also a cancellation point
+                await asyncio.sleep(0)
             
-            for skill in available_skills:
-                # Type check to ensuring we are working with a Skill object
-                if skill and self._satisfies(current_dict, skill.preconditions):
-                    # Apply effects
-                    new_dict = current_dict.copy()
-                    new_dict.update(skill.postconditions)
-                    new_frozen = frozenset(new_dict.items())
-                    
-                    # Calculate Cost
-                    base_cost = 1.0
-                    moral_cost = 0.0
-                    
-                    # Create candidate action for principle evaluation
-                    # We assume empty params for planning phase or default
-                    
-                    if self.evaluator:
-                        try:
-                            ctx = JudgementContext(
-                                agent_id=agent.id,
-                                action_id=skill.id,
-                                action_args={},
-                                tags=[], # TODO: Get tags from skill definition
-                                world_state=new_dict
-                            )
-                            judgement = self.evaluator.judge(ctx, agent.principles)
-                            moral_cost = judgement.cost
-                        except PolicyViolationError:
-                            # Hard veto -> Path blocked
-                            continue
-                    
-                    new_g = g + base_cost + moral_cost
-                    h = self._heuristic(new_dict, target_state)
-                    
-                    new_path = path + [skill]
-                    heapq.heappush(queue, (new_g + h, new_g, new_frozen, new_path))
-                    
-        # Return empty plan if no path found (or maybe a 'Wait' plan?)
-        return Plan(steps=[], total_cost=0.0)
+            # Explore Neighbors (Skills whose preconditions hold)
+            children = []
+            for i in index.applicable(current_frozen, current_dict):
+                # Apply effects
+                new_dict = current_dict.copy()
+                new_dict.update(index.postconditions[i])
+                new_frozen = frozenset(new_dict.items())
+                if new_frozen not in visited:
+                    children.append((i, new_dict, new_frozen))
+
+            # Judge every new neighbor in one batch
+            unjudged = [(i, new_dict, new_frozen) for i, new_dict, new_frozen in children if (i, new_frozen) not in judgements]
+            if unjudged:
+                costs = self._judge_many(agent, [(index.skills[i], new_dict) for i, new_dict, _ in unjudged], full_state)
+                for (i, _, new_frozen), moral_cost in zip(unjudged, costs):
+                    judgements[(i, new_frozen)] = moral_cost
+
+            for i, new_dict, new_frozen in children:
+                # Calculate Cost
+                base_cost = 1.0
+                moral_cost = judgements[(i, new_frozen)]
+                if moral_cost is None:
+                    # Hard veto -> Path blocked
+                    continue
+                
+                new_g = g + base_cost + moral_cost
+                new_h = self._heuristic(new_dict, target_state)
+                
+                new_path = path + [index.skills[i]]
+                heapq.heappush(queue, (new_g + weight * new_h, new_g, next(sequence), new_frozen, new_path))
+
+        # Budget exhausted or goal unreachable: best partial plan
+        distance, cost, path = best
+        return path, cost, False, budget_exhausted, distance, expansions
+
+    def _passes_vetoes(self, agent: AgentContext, plan: Plan, full_state: Dict[str, Any], start_state: Dict[str, Any]) -> bool:
+        """
+        Replays a cached plan against the current world state. Hard vetoes may depend on
+        facts outside the cache key, so every step is judged again before reuse.
+        """
+        planned = dict(start_state)
+        for step in plan.steps:
+            skill = self.registry.get_skill(step.skill_id)
+            if skill is None:
+                return False
+            planned.update(skill.postconditions)
+            if self._judge(agent, skill, full_state, planned) is None:
+                return False
+        return True
+
+    def _skill_index(self, agent: AgentContext) -> SkillIndex:
+        """
+        Returns the agent's SkillIndex, rebuilt only when the registry changes.
+        """
+        key = tuple(agent.allowed_skills)
+        version = getattr(self.registry, "version", None)
+        cached = self._indexes.get(key)
+        if cached and version is not None and cached[0] == version:
+            return cached[1]
+
+        skills = []
+        for sid in agent.allowed_skills:
+            skill = self.registry.get_skill(sid)
+            if skill:
+                skills.append(skill)
+        index = SkillIndex(skills)
+        if version is not None:
+            self._indexes[key] = (version, index)
+        return index
+
+    def _judge(self, agent: AgentContext, skill: Skill, full_state: Dict[str, Any], planned: Dict[str, Any]) -> Optional[float]:
+        """
+        Moral cost of reaching `planned` via `skill`, or None if a principle vetoes it.
+        Principles see the full world state with the planned changes applied.
+        """
+        return self._judge_many(agent, [(skill, planned)], full_state)[0]
+
+    def _judge_many(self, agent: AgentContext, candidates: List[Tuple[Skill, Dict[str, Any]]], full_state: Dict[str, Any]) -> List[Optional[float]]:
+        """
+        Batched `_judge` for (skill, planned state) candidates, via Evaluator.judge_batch.
+        """
+        if not self.evaluator:
+            return [0.0] * len(candidates)
+
+        # Create candidate actions for principle evaluation
+        # We assume empty params for planning phase or default
+        contexts = [
+            JudgementContext(
+                agent_id=agent.id,
+                action_id=skill.id,
+                action_args={},
+                tags=[], # TODO: Get tags from skill definition
+                world_state={**full_state, **planned}
+            )
+            for skill, planned in candidates
+        ]
+        # Search-internal judgements: the audit log may sample them
+        results = self.evaluator.judge_batch(contexts, agent.principles, source=SOURCE_PLANNER)
+        # Hard veto -> None
+        return [r.cost if r.allowed else None for r in results]
 
     def _extract_state(self, world_state: WorldState, agent_id: str = None) -> Dict[str, Any]:
         # Map facts to a simple KV store
@@ -140,11 +353,34 @@ class Planner:
 
     def _construct_plan(self, skills: List[Skill], cost: float) -> Plan:
         steps = []
-        for skill in skills:
+        for index, skill in enumerate(skills):
             steps.append(PlanStep(
                 skill_id=skill.id,
                 params={}, # We assume fixed params or derived from context in real GOAP
                 cost=1.0,
-                rationale=f"Achieves {skill.postconditions}"
+                rationale=f"Achieves {skill.postconditions}",
+                depends_on=self._dependencies(skills, index)
             ))
-        return Plan(steps=steps, total_cost=cost)
\ No newline at end of file
+        return Plan(steps=steps, total_cost=cost)
+
+    def _dependencies(self, skills: List[Skill], index: int) -> List[int]:
+        """
+        Derives the dependency edges of a step from pre- and postconditions.
+        Step j depends on an earlier step i when they touch the same state key and
+        at least one of them writes it:
+        - read-after-write:  post(i) & pre(j)
+        - write-after-write: post(i) & post(j)
+        - write-after-read:  pre(i) & post(j)
+        """
+        skill = skills[index]
+        reads = set(skill.preconditions.keys())
+        writes = set(skill.postconditions.keys())
+
+        deps = []
+        for i in range(index):
+            earlier = skills[i]
+            earlier_reads = set(earlier.preconditions.keys())
+            earlier_writes = set(earlier.postconditions.keys())
+            if (earlier_writes & reads) or (earlier_writes & writes) or (earlier_reads & writes):
+                deps.append(i)
+        return deps
\ No newline at end of file
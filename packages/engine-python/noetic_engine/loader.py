@@ -1,6 +1,10 @@
-import json
+import asyncio
 import logging
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
 from noetic_engine.runtime.engine import NoeticEngine
+from noetic_engine.codex_reader import CodexReader
 from noetic_lang.core import AgentDefinition as AgentContext
 from noetic_conscience import Principle
 from noetic_stage import Component
@@ -15,50 +19,121 @@ class CodexIntegrityError(Exception):
     """
     pass
 
+class CodexIngestion:
+    """
+    Background ingestion of a Codex's `knowledge.initial_state`, streamed from the
+    file on the event loop.
+
+    Ingesting a fact (embedding it, writing it, notifying the fact listeners)
+    touches state the loop reads without locks, so it is not moved to a thread:
+    instead the ingestion yields to the loop whenever it has run for
+    `time_budget` seconds, which keeps the loop blocked for at most that long
+    plus one fact.
+    """
+    def __init__(self, engine: NoeticEngine, reader: CodexReader, total: int, batch_size: int = 500, on_progress: Optional[Callable[["CodexIngestion"], Any]] = None, time_budget: float = 0.005):
+        self.engine = engine
+        self.reader = reader
+        self.total = total
+        self.batch_size = batch_size
+        # Called with the ingestion after every batch
+        self.on_progress = on_progress
+        self.time_budget = time_budget
+        self.ingested = 0
+        self.failed = 0
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self) -> "CodexIngestion":
+        self.task = asyncio.create_task(self._run())
+        return self
+
+    async def _run(self):
+        deadline = time.monotonic() + self.time_budget
+        for fact_def in self.reader.facts():
+            if _ingest_fact(self.engine, fact_def):
+                self.ingested += 1
+            else:
+                self.failed += 1
+            if (self.ingested + self.failed) % self.batch_size == 0:
+                self._report()
+            if time.monotonic() >= deadline:
+                await asyncio.sleep(0)
+                deadline = time.monotonic() + self.time_budget
+        self.finished_at = time.monotonic()
+        self._report()
+        logger.info(f"Ingested {self.ingested} initial facts ({self.failed} failed) in {self.finished_at - self.started_at:.1f}s")
+
+    def _report(self):
+        if self.on_progress is not None:
+            try:
+                self.on_progress(self)
+            except Exception as e:
+                logger.error(f"Ingestion progress callback failed: {e}")
+
+    @property
+    def progress(self) -> float:
+        return (self.ingested + self.failed) / self.total if self.total else 1.0
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    async def wait(self):
+        if self.task is not None:
+            await self.task
+
+    def cancel(self):
+        if self.task is not None:
+            self.task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "ingested": self.ingested,
+            "failed": self.failed,
+            "progress": self.progress,
+            "done": self.done
+        }
+
 class NoeticLoader:
     def load(self, engine: NoeticEngine, codex_path: str):
         """
         Hydrates the engine with the definitions from a .noetic Codex file.
+
+        The file is read incrementally (see CodexReader): the initial facts are
+        ingested one at a time, never all held in memory.
         """
+        reader = CodexReader(codex_path)
         try:
-            with open(codex_path, 'r') as f:
-                data = json.load(f)
+            data, _ = reader.sections()
         except Exception as e:
             logger.error(f"Failed to load Codex file: {e}")
             return
 
-        # 0.5 Load Initial Knowledge
-        knowledge_data = data.get("knowledge", {})
-        initial_state = knowledge_data.get("initial_state", [])
-        for fact_def in initial_state:
-            try:
-                import uuid
-                # Simple mapper: [subject_id, predicate, object]
-                if isinstance(fact_def, list) and len(fact_def) == 3:
-                    sub_id, pred, obj = fact_def
-                    # Generate deterministic UUID for named entities if they aren't UUIDs
-                    try:
-                        u_sub = uuid.UUID(sub_id)
-                    except ValueError:
-                        u_sub = uuid.uuid5(uuid.NAMESPACE_DNS, sub_id)
-                    
-                    # Infer type from prefix
-                    subject_type = "Project" if sub_id.startswith("project.") else "unknown"
-                    
-                    if isinstance(obj, str) and obj.startswith("entity:"):
-                        # Object is an entity reference
-                        obj_entity_name = obj.replace("entity:", "")
-                        u_obj = uuid.uuid5(uuid.NAMESPACE_DNS, obj_entity_name)
-                        engine.knowledge.ingest_fact(u_sub, pred, object_entity_id=u_obj, subject_type=subject_type)
-                    else:
-                        # Object is a literal
-                        engine.knowledge.ingest_fact(u_sub, pred, object_literal=str(obj), subject_type=subject_type)
-                    
-                    # Also ensure the entity has a 'name' attribute for easier binding lookup
-                    engine.knowledge.ingest_fact(u_sub, "name", object_literal=sub_id, subject_type=subject_type)
-            except Exception as e:
-                logger.error(f"Failed to load initial fact {fact_def}: {e}")
+        self._load_definitions(engine, data)
+        for fact_def in reader.facts():
+            _ingest_fact(engine, fact_def)
+
+    async def load_async(self, engine: NoeticEngine, codex_path: str, batch_size: int = 500, on_progress: Optional[Callable[[CodexIngestion], Any]] = None) -> Optional[CodexIngestion]:
+        """
+        Registers the definitions of a Codex and returns as soon as the engine can
+        serve: flows are compiled on first use, and the initial facts are ingested
+        in the background by the returned CodexIngestion (None if the file could
+        not be read).
+        """
+        reader = CodexReader(codex_path)
+        try:
+            # Reading past a large knowledge section takes a while: off the event loop
+            data, total = await asyncio.to_thread(reader.sections)
+        except Exception as e:
+            logger.error(f"Failed to load Codex file: {e}")
+            return None
 
+        self._load_definitions(engine, data, lazy=True)
+        return CodexIngestion(engine, reader, total, batch_size=batch_size, on_progress=on_progress).start()
+
+    def _load_definitions(self, engine: NoeticEngine, data: Dict[str, Any], lazy: bool = False):
         # 1. Load Skills (Load these first so Agents can reference them)
         skills_data = data.get("skills", [])
         for skill_def in skills_data:
@@ -123,6 +198,11 @@ class NoeticLoader:
 
                 agent = AgentContext(**agent_data)
                 engine.agent_manager.register(agent)
+                planner = getattr(engine, "planner", None)
+                if not lazy and planner is not None and getattr(planner, "evaluator", None) is not None:
+                    # Build the principle relevance index now rather than on the first judgement
+                    index = planner.evaluator.load_principles(agent.principles)
+                    logger.debug(f"Indexed {len(agent.principles)} principles for {agent.id} ({index.guarded} guarded)")
                 logger.info(f"Loaded Agent: {agent.id}")
             except CodexIntegrityError as e:
                 logger.error(f"Integrity Error: {e}")
@@ -152,7 +232,41 @@ class NoeticLoader:
         flows = orchestration.get("flows", [])
         for flow_data in flows:
             try:
-                engine.flow_manager.register(flow_data)
+                engine.flow_manager.register(flow_data, lazy=lazy)
                 logger.info(f"Loaded Flow: {flow_data.get('id')}")
             except Exception as e:
                 logger.error(f"Failed to parse flow: {e}")
+
+def _ingest_fact(engine: NoeticEngine, fact_def: Any) -> bool:
+    """
+    Ingests one `knowledge.initial_state` entry; False if it was malformed or failed.
+    """
+    try:
+        # Simple mapper: [subject_id, predicate, object]
+        if not (isinstance(fact_def, list) and len(fact_def) == 3):
+            return False
+        sub_id, pred, obj = fact_def
+        # Generate deterministic UUID for named entities if they aren't UUIDs
+        try:
+            u_sub = uuid.UUID(sub_id)
+        except ValueError:
+            u_sub = uuid.uuid5(uuid.NAMESPACE_DNS, sub_id)
+        
+        # Infer type from prefix
+        subject_type = "Project" if sub_id.startswith("project.") else "unknown"
+        
+        if isinstance(obj, str) and obj.startswith("entity:"):
+            # Object is an entity reference
+            obj_entity_name = obj.replace("entity:", "")
+            u_obj = uuid.uuid5(uuid.NAMESPACE_DNS, obj_entity_name)
+            engine.knowledge.ingest_fact(u_sub, pred, object_entity_id=u_obj, subject_type=subject_type)
+        else:
+            # Object is a literal
+            engine.knowledge.ingest_fact(u_sub, pred, object_literal=str(obj), subject_type=subject_type)
+        
+        # Also ensure the entity has a 'name' attribute for easier binding lookup
+        engine.knowledge.ingest_fact(u_sub, "name", object_literal=sub_id, subject_type=subject_type)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to load initial fact {fact_def}: {e}")
+        return False
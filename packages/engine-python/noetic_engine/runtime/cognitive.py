@@ -1,8 +1,13 @@
 import asyncio
 import logging
+import time
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel
 from noetic_knowledge import KnowledgeStore, WorldState
-from noetic_lang.core import Goal, PlanStep, AgentDefinition as AgentContext
-from noetic_engine.skills import SkillRegistry, SkillContext
+from noetic_knowledge.store.schema import Event
+from noetic_lang.core import Goal, Plan, PlanStep, AgentDefinition as AgentContext
+from noetic_engine.skills import SkillRegistry, SkillContext, SkillResultCache
+from noetic_engine.skills.streaming import StreamSink, runner_for
 from noetic_engine.cognition.planner import Planner
 from noetic_engine.cognition.manager import AgentManager
 from noetic_engine.cognition.evaluator import Evaluator as RedTeamEvaluator
@@ -11,12 +16,21 @@ from noetic_engine.cognition.flow_manager import FlowManager
 
 logger = logging.getLogger(__name__)
 
+class PlanExecutionReport(BaseModel):
+    steps: int
+    wall_clock_ms: float
+    sequential_ms: float # Sum of step durations, i.e. what strictly sequential execution would have taken
+    saved_ms: float
+    max_parallelism: int
+    failed: int = 0 # Steps whose skill was missing, raised or returned success=False
+    skipped: int = 0 # Steps not run because a step they depend on failed or was skipped
+
 class CognitiveSystem:
     """
     Manages the 'Cognitive Loop' (System 2) - Planning and Decision Making.
     Running asynchronously from the UI loop.
     """
-    def __init__(self, knowledge: KnowledgeStore, skills: SkillRegistry, planner: Planner, agent_manager: AgentManager, red_teamer: RedTeamEvaluator = None, flow_manager: FlowManager = None):
+    def __init__(self, knowledge: KnowledgeStore, skills: SkillRegistry, planner: Planner, agent_manager: AgentManager, red_teamer: RedTeamEvaluator = None, flow_manager: FlowManager = None, max_concurrency: int = 4, result_cache: Optional[SkillResultCache] = None, engine: Optional[Any] = None):
         self.knowledge = knowledge
         self.skills = skills
         self.planner = planner
@@ -24,17 +38,33 @@ class CognitiveSystem:
         self.red_teamer = red_teamer
         self.flow_manager = flow_manager
         self.active_tasks = set()
+        self.max_concurrency = max_concurrency
+        # Results of skills declaring a CachePolicy (shared with flows by the engine)
+        self.result_cache = result_cache or SkillResultCache()
+        # Handed to skills in their SkillContext (its pooled `http` transport, its lifecycle)
+        self.engine = engine
+        # Receive the chunks of streaming skills while they run (memory stack, UI)
+        self.stream_sinks: List[StreamSink] = []
+        self.last_report: PlanExecutionReport = None
+        # Resource tag -> Lock. Shared across plans so concurrent plans also respect them.
+        self._resource_locks: Dict[str, asyncio.Lock] = {}
 
     async def process_next(self, state: WorldState):
         """
         Called when the Reflex loop detects a Trigger (Event).
-        Decides what to do.
+        Handles the event at the head of the queue. Use CognitionDispatcher
+        to process the whole queue concurrently.
         """
-        try:
-            if not state.event_queue:
-                return
+        if not state.event_queue:
+            return
+        await self.process_event(state.event_queue[0], state)
 
-            event = state.event_queue[0] 
+    async def process_event(self, event: Event, state: WorldState, agent_id: Optional[str] = None):
+        """
+        Decides what to do about a single event.
+        If no agent_id is given, the first registered agent handles it.
+        """
+        try:
             logger.info(f"Cognitive System processing event: {event.type}")
             
             # --- Flow Execution Trigger ---
@@ -45,19 +75,26 @@ class CognitiveSystem:
                     if executor:
                         logger.info(f"Triggering Flow: {flow_id}")
                         # Provide skill context for flow nodes to use
-                        event.payload["_skill_context"] = SkillContext(
+                        context = SkillContext(
                             agent_id="system.flow", # Or derived from event
-                            store=self.knowledge
+                            store=self.knowledge,
+                            engine=self.engine
                         )
-                        await executor.step(event.payload, state)
+                        # A run_id names the run for checkpointing: sending it again resumes the run
+                        await executor.step(event.payload, state, skill_context=context, run_id=event.payload.get("run_id"))
                         return
             
-            agent_ids = list(self.agent_manager.agents.keys())
-            if not agent_ids:
-                logger.warning("No agents registered to handle event.")
-                return
+            if agent_id is None:
+                agent_ids = list(self.agent_manager.agents.keys())
+                if not agent_ids:
+                    logger.warning("No agents registered to handle event.")
+                    return
+                agent_id = agent_ids[0]
 
-            agent = self.agent_manager.get(agent_ids[0])
+            agent = self.agent_manager.get(agent_id)
+            if not agent:
+                logger.warning(f"Agent '{agent_id}' not found to handle event {event.type}.")
+                return
             
             # Simple heuristic: if we have a test-event, we want to 'wait'
             target = {"done": True} if event.type == "test-event" else {}
@@ -69,7 +106,14 @@ class CognitiveSystem:
             self.knowledge.ingest_fact(agent_uuid, "current_goal", object_literal=goal.description)
             
             plan = await self.planner.generate_plan(agent, goal, state)
-            
+            if not plan.complete:
+                if not plan.budget_exhausted:
+                    # The search ran out of options: no prefix of the plan leads to the goal
+                    logger.info(f"Goal unreachable for {event.type} ({plan.expansions} expansions): nothing executed")
+                    return
+                # Anytime planning: act on the best partial plan, the next event replans
+                logger.info(f"Partial plan for {event.type}: {len(plan.steps)} steps, {plan.heuristic_distance} goal conditions left ({plan.expansions} expansions, {plan.planning_ms:.1f}ms)")
+
             # --- Confidence Engine Logic ---
             # 1. Risk Check
             # Using total_cost as proxy for Risk Score for now
@@ -95,28 +139,114 @@ class CognitiveSystem:
                 else:
                     logger.warning("High risk plan detected but no Red Teamer configured. Proceeding with caution.")
 
-            for step in plan.steps:
-                await self._execute_step(step, agent)
+            await self._execute_plan(plan, agent)
         except Exception as e:
             logger.error(f"Cognitive System Error: {e}")
             # Log error to Knowledge so UI can show it
             # TODO: Implement a system error log in knowledge
 
-    async def _execute_step(self, step: PlanStep, agent: AgentContext):
+    async def _execute_plan(self, plan: Plan, agent: AgentContext) -> PlanExecutionReport:
+        """
+        Executes the plan as a dependency DAG.
+        A step starts as soon as the steps in its `depends_on` have finished, bounded by
+        `max_concurrency` and by the resource tags of its skill. Steps without
+        dependency information wait for every previous step (sequential, as before).
+        A step that fails leaves its postconditions unmet: the steps depending on it,
+        directly or not, are skipped.
+        """
+        steps = plan.steps
+        finished = [asyncio.Event() for _ in steps]
+        succeeded = [False] * len(steps)
+        durations = [0.0] * len(steps)
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        running = 0
+        peak = 0
+        failed = 0
+        skipped = 0
+
+        async def run(index: int, step: PlanStep):
+            nonlocal running, peak, failed, skipped
+            try:
+                deps = [dep for dep in (range(index) if step.depends_on is None else step.depends_on) if 0 <= dep < index]
+                for dep in deps:
+                    await finished[dep].wait()
+                blocking = next((dep for dep in deps if not succeeded[dep]), None)
+                if blocking is not None:
+                    logger.warning(f"Skipping step {index} ({step.skill_id}): step {blocking} did not succeed")
+                    skipped += 1
+                    return
+
+                locks = self._resource_locks_for(step)
+                async with semaphore:
+                    for lock in locks:
+                        await lock.acquire()
+                    running += 1
+                    peak = max(peak, running)
+                    start = time.monotonic()
+                    try:
+                        succeeded[index] = await self._execute_step(step, agent)
+                        if not succeeded[index]:
+                            failed += 1
+                    finally:
+                        durations[index] = (time.monotonic() - start) * 1000
+                        running -= 1
+                        for lock in reversed(locks):
+                            lock.release()
+            finally:
+                # Dependents wait for every outcome, then check `succeeded`
+                finished[index].set()
+
+        start_time = time.monotonic()
+        await asyncio.gather(*(run(i, step) for i, step in enumerate(steps)))
+        wall_clock_ms = (time.monotonic() - start_time) * 1000
+
+        sequential_ms = sum(durations)
+        report = PlanExecutionReport(
+            steps=len(steps),
+            wall_clock_ms=wall_clock_ms,
+            sequential_ms=sequential_ms,
+            saved_ms=max(0.0, sequential_ms - wall_clock_ms),
+            max_parallelism=peak,
+            failed=failed,
+            skipped=skipped
+        )
+        self.last_report = report
+        logger.info(f"Plan executed: {report.steps} steps in {report.wall_clock_ms:.1f}ms "
+                    f"(sequential {report.sequential_ms:.1f}ms, saved {report.saved_ms:.1f}ms, peak parallelism {report.max_parallelism}, "
+                    f"{report.failed} failed, {report.skipped} skipped)")
+        return report
+
+    def _resource_locks_for(self, step: PlanStep) -> List[asyncio.Lock]:
+        skill = self.skills.get_skill(step.skill_id)
+        tags = getattr(skill, "resource_tags", None) if skill else None
+        if not isinstance(tags, (list, tuple, set)):
+            return []
+        # Sorted acquisition order prevents lock-order deadlocks between steps
+        return [self._resource_locks.setdefault(tag, asyncio.Lock()) for tag in sorted(set(tags))]
+
+    def _runner_for(self, skill):
+        # Innermost call under the registry's middleware (flows use the same)
+        return runner_for(skill, self.stream_sinks, self.result_cache)
+
+    async def _execute_step(self, step: PlanStep, agent: AgentContext) -> bool:
+        """
+        Runs one plan step and logs it to memory. Errors are logged, not raised;
+        returns whether the skill succeeded.
+        """
         skill = self.skills.get_skill(step.skill_id)
         if not skill:
             logger.error(f"Skill not found: {step.skill_id}")
-            return
+            return False
 
         if step.skill_id not in agent.allowed_skills:
             logger.warning(f"Agent {agent.id} not allowed to use {step.skill_id}")
 
-        context = SkillContext(agent_id=agent.id, store=self.knowledge)
+        context = SkillContext(agent_id=agent.id, store=self.knowledge, engine=self.engine)
         logger.info(f"Executing Skill: {step.skill_id}")
         
         start_time = asyncio.get_event_loop().time()
         try:
-            result = await skill.execute(context, **step.params)
+            result = await self.skills.execute(skill, context, step.params, run=self._runner_for(skill))
             end_time = asyncio.get_event_loop().time()
             duration_ms = int((end_time - start_time) * 1000)
             
@@ -141,6 +271,8 @@ class CognitiveSystem:
                 )
             except Exception as e:
                 logger.error(f"Failed to log skill usage fact: {e}")
+            return getattr(result, "success", True) is not False
 
         except Exception as e:
             logger.error(f"Skill execution failed: {e}")
+            return False
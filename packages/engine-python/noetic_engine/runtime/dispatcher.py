@@ -0,0 +1,123 @@
+import asyncio
+import fnmatch
+import logging
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+from noetic_knowledge import WorldState
+from noetic_knowledge.store.schema import Event
+
+logger = logging.getLogger(__name__)
+
+# Lane used for events that are not handled by an agent (e.g. cmd.run_flow)
+SYSTEM_LANE = "system.flow"
+
+class CognitionDispatcher:
+    """
+    Routes every queued event to the agents that handle it and processes them
+    concurrently through the CognitiveSystem.
+
+    - Routing: explicit `subscribe()` patterns and `AgentDefinition.subscriptions`
+      (glob patterns on event type). Unrouted events go to the first registered agent.
+    - Ordering: each agent has its own FIFO lane, drained by a single worker,
+      so one agent sees its events in order while different agents run in parallel.
+    - Backpressure: at most `max_in_flight` events are being processed at once.
+    - Worker tasks are tracked in `cognitive.active_tasks` and cancelled by `stop()`.
+    """
+    def __init__(self, cognitive, max_in_flight: int = 8):
+        self.cognitive = cognitive
+        self.max_in_flight = max_in_flight
+        self._slots = asyncio.Semaphore(max(1, max_in_flight))
+        self._subscriptions: Dict[str, Set[str]] = {} # pattern -> agent ids
+        self._lanes: Dict[str, Deque[Tuple[Event, WorldState]]] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self.in_flight = 0
+        self.processed = 0
+
+    def subscribe(self, agent_id: str, patterns: List[str]):
+        for pattern in patterns:
+            self._subscriptions.setdefault(pattern, set()).add(agent_id)
+
+    def route(self, event: Event) -> List[str]:
+        """
+        Returns the lanes (agent ids) that should handle the event.
+        """
+        if event.type == "cmd.run_flow":
+            return [SYSTEM_LANE]
+
+        targets: List[str] = []
+        for pattern, agent_ids in self._subscriptions.items():
+            if fnmatch.fnmatchcase(event.type, pattern):
+                targets.extend(a for a in agent_ids if a not in targets)
+
+        for agent_id, agent in self.cognitive.agent_manager.agents.items():
+            patterns = getattr(agent, "subscriptions", None) or []
+            if agent_id not in targets and any(fnmatch.fnmatchcase(event.type, p) for p in patterns):
+                targets.append(agent_id)
+
+        if not targets:
+            agent_ids = list(self.cognitive.agent_manager.agents.keys())
+            if agent_ids:
+                targets.append(agent_ids[0])
+        return targets
+
+    def dispatch(self, state: WorldState) -> int:
+        """
+        Enqueues every event of the state's queue. Returns the number of routed deliveries.
+        Must be called from within the running event loop; it never blocks.
+        """
+        routed = 0
+        for event in state.event_queue:
+            lanes = self.route(event)
+            if not lanes:
+                logger.warning(f"No agents registered to handle event {event.type}.")
+            for lane in lanes:
+                self._lanes.setdefault(lane, deque()).append((event, state))
+                self._ensure_worker(lane)
+                routed += 1
+        return routed
+
+    def _ensure_worker(self, lane: str):
+        if lane in self._workers:
+            return
+        task = asyncio.create_task(self._drain_lane(lane))
+        self._workers[lane] = task
+        self.cognitive.active_tasks.add(task)
+        task.add_done_callback(self.cognitive.active_tasks.discard)
+
+    async def _drain_lane(self, lane: str):
+        queue = self._lanes[lane]
+        try:
+            while queue:
+                event, state = queue.popleft()
+                async with self._slots:
+                    self.in_flight += 1
+                    try:
+                        agent_id = None if lane == SYSTEM_LANE else lane
+                        await self.cognitive.process_event(event, state, agent_id=agent_id)
+                    finally:
+                        self.in_flight -= 1
+                        self.processed += 1
+        finally:
+            # No await between the empty check and this removal, so no event can be stranded
+            self._workers.pop(lane, None)
+
+    def pending(self) -> int:
+        return sum(len(q) for q in self._lanes.values())
+
+    async def drain(self):
+        """
+        Waits until every queued event has been processed.
+        """
+        while self._workers:
+            await asyncio.gather(*list(self._workers.values()), return_exceptions=True)
+
+    async def stop(self):
+        """
+        Cancels all in-flight cognition and drops queued events.
+        """
+        workers = list(self._workers.values())
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._workers.clear()
+        self._lanes.clear()
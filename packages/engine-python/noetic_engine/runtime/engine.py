@@ -1,26 +1,46 @@
 import asyncio
 import time
-from typing import Optional
-from noetic_knowledge import KnowledgeStore
-from noetic_engine.skills import SkillRegistry
+from typing import Dict, List, Optional, Union
+from noetic_knowledge import KnowledgeStore, MemoryStack
+from noetic_engine.skills import ExecutionPolicy, SkillRegistry, SkillResultCache
+from noetic_engine.skills.streaming import MemoryStackSink, StreamSink, UiStreamSink
+from noetic_engine.skills.mcp_client import McpClient
+from noetic_engine.skills.mcp_transport import McpTransport
 from noetic_engine.skills.library.system.control import WaitSkill, LogSkill
 from noetic_engine.skills.library.memory import MemorizeSkill, RecallSkill
 from noetic_engine.cognition.adk_adapter import ADKAdapter
+from noetic_engine.cognition import AgentManager, FlowManager, Planner
 from noetic_engine.runtime.mesh import MeshOrchestrator
+from noetic_stdlib.transport import HttpTransport
 from .reflex import ReflexSystem
 from .scheduler import Scheduler
 from .lifecycle import LifecycleManager
+from .cognitive import CognitiveSystem
+from .dispatcher import CognitionDispatcher
+from .executors.checkpoints import FlowCheckpointStore
+from .executors.flow_cache import FlowCompileCache
+
+# Deadline of a skill call when neither the skill nor `SkillRegistry.set_policy` sets one
+DEFAULT_SKILL_TIMEOUT = 300.0
 
 class NoeticEngine:
-    def __init__(self, db_url: str = "sqlite:///:memory:"):
+    def __init__(self, db_url: str = "sqlite:///:memory:", knowledge: Optional[KnowledgeStore] = None, http: Optional[HttpTransport] = None, flow_checkpoints: Optional[FlowCheckpointStore] = None, flow_cache: Optional[FlowCompileCache] = None, skill_timeout: Optional[float] = DEFAULT_SKILL_TIMEOUT):
         self.running = False
         
         # 1. Initialize Core Subsystems
-        self.knowledge = KnowledgeStore(db_url=db_url)
-        self.skills = SkillRegistry()
+        # A pre-built store can be injected (e.g. by EngineHost, which shares pooled resources between tenants)
+        self.knowledge = knowledge or KnowledgeStore(db_url=db_url)
+        # A hung skill fails after `skill_timeout` seconds instead of stalling its plan
+        # or flow forever (None: no deadline)
+        self.skills = SkillRegistry(default_policy=ExecutionPolicy(timeout=skill_timeout))
+        # Pooled keep-alive HTTP for remote skills and agents (MCP, n8n).
+        # An injected transport may be shared, so only our own is closed in stop()
+        self.http = http or HttpTransport()
+        self._owns_http = http is None
+        self.mcp_clients: Dict[str, McpClient] = {}
         
-        # 2. Initialize Mesh & Brain (Replaces CognitiveSystem)
-        self.mesh = MeshOrchestrator()
+        # 2. Initialize Mesh & Brain (ADK reasoning for mesh agents)
+        self.mesh = MeshOrchestrator(http=self.http)
         
         # In the future, we load the AgentDefinition from a file/DB
         # For now, we mock the primary definition
@@ -35,8 +55,28 @@ class NoeticEngine:
         self.skills.register(MemorizeSkill())
         self.skills.register(RecallSkill())
         
-        # 4. Initialize Reflex Loop
+        # 4. Initialize Cognitive Loop (event-driven, runs beside the ADK brain)
+        self.agent_manager = AgentManager()
+        self.planner = Planner(self.skills)
+        # One result cache for plans and flows, invalidated by the facts they ingest
+        self.result_cache = SkillResultCache()
+        self.knowledge.add_fact_listener(self.result_cache.on_fact)
+        # Working memory: streamed skill output is logged to its current frame
+        self.memory = MemoryStack()
+        self.memory.push_frame(goal="engine")
+        # Receive the chunks of streaming skills run by plans and flows alike
+        self.stream_sinks: List[StreamSink] = [MemoryStackSink(self.memory, max_logs=1000)]
+        # With a checkpoint store, flow runs survive a crash and are resumed on start.
+        # Compiled flows are shared with the other engines of the process (unless given a cache)
+        self.flow_manager = FlowManager(skill_registry=self.skills, result_cache=self.result_cache, checkpoints=flow_checkpoints, compile_cache=flow_cache, stream_sinks=self.stream_sinks)
+        self.cognitive = CognitiveSystem(self.knowledge, self.skills, self.planner, self.agent_manager, flow_manager=self.flow_manager, result_cache=self.result_cache, engine=self)
+        self.cognitive.stream_sinks = self.stream_sinks
+        self.dispatcher = CognitionDispatcher(self.cognitive)
+        
+        # 5. Initialize Reflex Loop
         self.reflex = ReflexSystem()
+        # Live output of streaming skills, bound in the Codex at /ui/local/streams/<skill id>
+        self.stream_sinks.append(UiStreamSink(self.reflex.manager))
         self.scheduler = Scheduler(target_fps=60)
         self.lifecycle = LifecycleManager(self)
 
@@ -45,12 +85,44 @@ class NoeticEngine:
         print("Noetic Engine Starting...")
         # Start the Brain (ADK)
         await self.brain.start()
+        self.resume_interrupted_runs()
         await self.run_loop()
 
+    def resume_interrupted_runs(self):
+        """
+        Queues the flow runs left unfinished by a crash or a shutdown, to be resumed
+        from their checkpoints.
+        """
+        for run in self.flow_manager.interrupted_runs():
+            self.push_event("cmd.run_flow", {"flow_id": run["flow_id"], "run_id": run["run_id"]})
+
+    async def add_mcp_server(self, server: Union[str, McpTransport], cache_dir: Optional[str] = None, wait: bool = False) -> McpClient:
+        """
+        Registers every tool of an MCP server as a skill (see McpClient.discover).
+        `server` is an HTTP URL or an McpTransport (e.g. StdioMcpTransport, SseMcpTransport).
+        With `cache_dir`, a cached tool catalog is used at once and revalidated in the background.
+        """
+        key = server if isinstance(server, str) else server.url
+        client = self.mcp_clients.get(key)
+        if client is None:
+            if isinstance(server, str):
+                client = McpClient(server, transport=self.http, cache_dir=cache_dir)
+            else:
+                client = McpClient(transport=self.http, cache_dir=cache_dir, connection=server)
+            self.mcp_clients[key] = client
+        await client.discover(self.skills, wait=wait)
+        return client
+
     async def stop(self):
         self.running = False
         print("Noetic Engine Stopping...")
+        await self.dispatcher.stop()
+        await self.skills.stop_inputs()
         await self.brain.stop()
+        for client in self.mcp_clients.values():
+            await client.close()
+        if self._owns_http:
+            await self.http.aclose()
 
     def push_event(self, event_type: str, payload: dict = None):
         """
@@ -78,21 +150,7 @@ class NoeticEngine:
             start_time = time.monotonic()
 
             try:
-                # --- 1. REFLEX PHASE (Fast) ---
-                world_state = self.knowledge.get_world_state()
-                events = self.skills.poll_inputs()
-                
-                # Update Lifecycle
-                if events:
-                    await self.lifecycle.notify_interaction()
-                await self.lifecycle.tick()
-                
-                # Update UI
-                self.latest_ui = self.reflex.tick(events, world_state)
-
-                # --- 2. COGNITIVE PHASE (Handled by ADKAdapter background task) ---
-                # We do NOT block here.
-
+                await self.tick()
             except Exception as e:
                 # Reflex Loop Failure is CRITICAL
                 print(f"CRITICAL: Reflex Loop Failure: {e}")
@@ -102,3 +160,24 @@ class NoeticEngine:
             # --- 3. SLEEP ---
             await self.scheduler.sleep_until_next_tick(start_time)
 
+    async def tick(self):
+        """
+        Performs a single frame of the loop. Exposed so that a host can drive
+        many engines from one scheduler instead of one busy loop per engine.
+        """
+        # --- 1. REFLEX PHASE (Fast) ---
+        world_state = self.knowledge.get_world_state()
+        events = self.skills.poll_inputs()
+        
+        # Update Lifecycle
+        if events:
+            await self.lifecycle.notify_interaction()
+        await self.lifecycle.tick()
+        
+        # Update UI
+        self.latest_ui = self.reflex.tick(events, world_state)
+
+        # --- 2. COGNITIVE PHASE ---
+        # Events are handed to the dispatcher's background workers. We do NOT block here.
+        if world_state.event_queue:
+            self.dispatcher.dispatch(world_state)
@@ -1,4 +1,6 @@
 from .flow import FlowExecutor
+from .checkpoints import FlowCheckpointStore
+from .flow_cache import FlowCompileCache
 from .stanza import StanzaExecutor
 
-__all__ = ["FlowExecutor", "StanzaExecutor"]
+__all__ = ["FlowExecutor", "FlowCheckpointStore", "FlowCompileCache", "StanzaExecutor"]
@@ -0,0 +1,131 @@
+import json
+import logging
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from noetic_engine.skills.interfaces import SkillResult
+
+logger = logging.getLogger(__name__)
+
+class FlowCheckpointStore:
+    """
+    Durable journal of flow runs in SQLite, keyed by run id.
+
+    Each completed flow state appends its own update (trace entry, skill result,
+    variables, next state) under an idempotency key unique to that visit, so a
+    checkpoint costs O(1) whatever the run's length. Resuming a run replays its
+    journal and continues from the last completed state: states already recorded,
+    and the skills they ran, are not executed again.
+
+    The database runs in WAL mode with `synchronous=NORMAL`: a recorded state
+    survives a crash of the process (not necessarily a power loss).
+    """
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS flow_runs (
+                run_id TEXT PRIMARY KEY,
+                flow_id TEXT NOT NULL,
+                parent_id TEXT,
+                status TEXT NOT NULL,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS flow_runs_status ON flow_runs (status);
+            CREATE TABLE IF NOT EXISTS flow_steps (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL,
+                key TEXT NOT NULL,
+                state TEXT,
+                update_json TEXT NOT NULL,
+                UNIQUE (run_id, key)
+            );
+        """)
+
+    def start(self, run_id: str, flow_id: str, parent_id: Optional[str] = None):
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO flow_runs VALUES (?, ?, ?, 'running', NULL, ?, ?)",
+                (run_id, flow_id, parent_id, now, now)
+            )
+            self._conn.execute("UPDATE flow_runs SET status = 'running', error = NULL, updated_at = ? WHERE run_id = ?", (now, run_id))
+
+    def record(self, run_id: str, key: str, state: Optional[str], update: Dict[str, Any]):
+        """
+        Appends a state's update. A key already recorded for the run is ignored.
+        Values other than JSON types and SkillResults raise TypeError.
+        """
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO flow_steps (run_id, key, state, update_json) VALUES (?, ?, ?, ?)",
+                (run_id, key, state, json.dumps(update, default=_encode))
+            )
+
+    def steps(self, run_id: str) -> List[Tuple[str, Optional[str], Dict[str, Any]]]:
+        """
+        The recorded (key, state, update) of a run, in order.
+        """
+        rows = self._conn.execute(
+            "SELECT key, state, update_json FROM flow_steps WHERE run_id = ? ORDER BY seq", (run_id,)
+        ).fetchall()
+        return [(key, state, json.loads(update, object_hook=_decode)) for key, state, update in rows]
+
+    def finish(self, run_id: str, status: str, error: Optional[str] = None):
+        with self._conn:
+            self._conn.execute(
+                "UPDATE flow_runs SET status = ?, error = ?, updated_at = ? WHERE run_id = ?",
+                (status, error, time.time(), run_id)
+            )
+
+    def status(self, run_id: str) -> Optional[str]:
+        row = self._conn.execute("SELECT status FROM flow_runs WHERE run_id = ?", (run_id,)).fetchone()
+        return row[0] if row else None
+
+    def runs(self, status: Optional[str] = None, flow_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Top-level runs (not the branches of Parallel and Map states), oldest first.
+        """
+        sql = "SELECT run_id, flow_id, status, error, created_at, updated_at FROM flow_runs WHERE parent_id IS NULL"
+        params: List[Any] = []
+        if status is not None:
+            sql += " AND status = ?"
+            params.append(status)
+        if flow_id is not None:
+            sql += " AND flow_id = ?"
+            params.append(flow_id)
+        rows = self._conn.execute(sql + " ORDER BY created_at", params).fetchall()
+        return [{"run_id": run_id, "flow_id": flow, "status": state, "error": error, "created_at": created, "updated_at": updated}
+                for run_id, flow, state, error, created, updated in rows]
+
+    def delete(self, run_id: str):
+        """
+        Forgets a run and the runs of its branches.
+        """
+        with self._conn:
+            ids = [run_id]
+            while ids:
+                placeholders = ",".join("?" * len(ids))
+                self._conn.execute(f"DELETE FROM flow_steps WHERE run_id IN ({placeholders})", ids)
+                self._conn.execute(f"DELETE FROM flow_runs WHERE run_id IN ({placeholders})", ids)
+                ids = [row[0] for row in self._conn.execute(f"SELECT run_id FROM flow_runs WHERE parent_id IN ({placeholders})", ids)]
+
+    def close(self):
+        self._conn.close()
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, SkillResult):
+        return {"__skill_result__": value.model_dump(mode="json")}
+    # Anything else would come back as a string or a dict on resume: a run
+    # carrying it cannot be journaled
+    raise TypeError(f"Flow state of type {type(value).__name__} cannot be checkpointed: {value!r}")
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    if "__skill_result__" in obj and len(obj) == 1:
+        return SkillResult.model_validate(obj["__skill_result__"])
+    return obj
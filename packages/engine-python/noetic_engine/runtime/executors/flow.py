@@ -1,31 +1,105 @@
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+import uuid
+from typing import Annotated, Any, Dict, List, Optional, TypedDict, Union
 from noetic_knowledge import WorldState
-from noetic_lang.core import FlowDefinition, FlowState
+from noetic_lang.core import FlowDefinition, FlowState, FlowBranch
+from noetic_conscience.logic import compile_rule
+from noetic_engine.skills.streaming import runner_for
+from .checkpoints import FlowCheckpointStore
 
 logger = logging.getLogger(__name__)
 
 try:
     from langgraph.graph import StateGraph, END
+    from langgraph.types import Send
+    from langchain_core.runnables import RunnableConfig
 except ImportError:
     StateGraph = None
     END = "END"
+    Send = None
+    RunnableConfig = Dict[str, Any]
 
-try:
-    from json_logic import jsonLogic
-except ImportError:
-    jsonLogic = None
+# Reducers mutate the channel's own value in place: a node returns only its
+# delta (one trace entry, one result) and a run costs O(states), where
+# rebuilding the list or dict in every node would cost O(states^2).
+def _append(left: List[Any], right: List[Any]) -> List[Any]:
+    left.extend(right)
+    return left
 
-class FlowExecutor:
+def _merge(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    left.update(right)
+    return left
+
+def _join(left: Dict[str, Dict[int, Any]], right: Optional[Dict[str, Dict[int, Any]]]) -> Dict[str, Dict[int, Any]]:
+    # Branch outputs by fan-out state and index; None clears them once joined
+    if right is None:
+        return {}
+    for name, outputs in right.items():
+        left.setdefault(name, {}).update(outputs)
+    return left
+
+class FlowRunState(TypedDict, total=False):
     """
-    Wraps LangGraph to execute deterministic state machines defined in the Codex.
+    LangGraph state of a flow run.
+
+    - `trace`: names of the states visited, in order.
+    - `results`: SkillResult of each state that ran a skill, by state name.
+    - `vars`: flow variables, the run's inputs updated with each state's `params`.
+    - `at`: name of the state to run next.
+    - `fork`: the pending fan-out of a Parallel or Map state (its branch inputs),
+      `joins`: the outputs of its branches, collected until the state joins them.
+
+    Runtime objects (the SkillContext, the WorldState, the engine's skill registry,
+    result cache and checkpoint store, the run's Map concurrency slots) are not part
+    of the state: they travel by reference in the run's config (`configurable`).
     """
-    def __init__(self, flow_definition: Dict[str, Any], skill_registry: Optional[Any] = None):
-        # Validate against the portable schema
-        self.flow_model = FlowDefinition.model_validate(flow_definition)
-        self.flow_def = self.flow_model.model_dump()
-        self.skills = skill_registry
-        self.graph = self._build_graph(self.flow_model)
+    trace: Annotated[List[str], _append]
+    results: Annotated[Dict[str, Any], _merge]
+    vars: Annotated[Dict[str, Any], _merge]
+    at: Optional[str] # The state to run next (None: the flow has ended)
+    fork: Optional[Dict[str, Any]]
+    joins: Annotated[Dict[str, Dict[int, Any]], _join]
+
+STATE_NODE = "state"
+BRANCH_NODE = "branch"
+
+class _Position(TypedDict):
+    at: Optional[str]
+    fork: Optional[Dict[str, Any]]
+    joins: Dict[str, Dict[int, Any]]
+
+def _route(state: _Position) -> Union[str, List[Any]]:
+    # Reads `at`, `fork` and the (idempotent) `joins` only: LangGraph evaluates routes on
+    # shallow copies of the channels it reads, which `_append` must not be applied to twice
+    fork = state.get("fork")
+    if fork is not None:
+        # One concurrent branch task per input not joined yet (all of them, unless a
+        # run resumes mid fan-out); the state runs again to join them
+        done = (state.get("joins") or {}).get(fork["state"], {})
+        pending = [Send(BRANCH_NODE, {"state": fork["state"], "index": i, "position": fork["position"], "vars": inputs})
+                   for i, inputs in enumerate(fork["inputs"]) if i not in done]
+        if pending:
+            return pending
+    return END if state.get("at") is None else STATE_NODE
+
+class CompiledFlow:
+    """
+    The LangGraph compiled from one flow definition.
+
+    It holds no engine state: the skill registry, result cache and checkpoint store
+    a run uses travel in its config (see `FlowExecutor`), so one compiled flow can
+    serve every engine of the process that registers the same definition.
+    """
+    def __init__(self, definition: FlowDefinition, max_steps: Optional[int] = None):
+        self.flow_model = definition
+        # Every visited state is one LangGraph step (two for Parallel and Map states).
+        # Flows looping through `choices` may need more: pass `max_steps`.
+        self.max_steps = max_steps
+        self.recursion_limit = max_steps or max(25, 2 * len(definition.states) + 1)
+        # Compiled sub-flows of Parallel (one per branch) and Map (the iterator) states
+        self._branches: Dict[str, List["CompiledFlow"]] = {}
+        self.graph = self._build_graph(definition)
         self.runnable = self.graph.compile() if self.graph else None
 
     def _build_graph(self, definition: FlowDefinition):
@@ -33,55 +107,130 @@ class FlowExecutor:
             logger.warning("LangGraph not found. Flows will not execute.")
             return None
         
-        workflow = StateGraph(dict)
-        
-        # Use the model fields
-        start_at = definition.start_at
-        states = definition.states
-        
-        for name, state_def in states.items():
-            # Create a node for each state
-            node_func = self._make_node_func(name, state_def)
-            workflow.add_node(name, node_func)
-            
-        # Add Edges
-        for name, state_def in states.items():
-            if state_def.next:
-                 workflow.add_edge(name, state_def.next)
-            elif state_def.end:
-                 workflow.add_edge(name, END)
+        # One LangGraph node runs whichever state the `at` channel names. LangGraph's
+        # per-step bookkeeping grows with the number of nodes and channels, so a node
+        # per state would make each step cost O(states) and a run O(states^2).
+        self._nodes = {}
+        for name, state_def in definition.states.items():
+            if state_def.type in ("Parallel", "Map"):
+                branches = state_def.branches if state_def.type == "Parallel" else [state_def.iterator]
+                self._branches[name] = [self._sub_flow(name, i, branch) for i, branch in enumerate(branches)]
+                self._nodes[name] = self._make_fan_out_func(name, state_def)
             else:
-                 # Default to END if no next and not explicitly marked end?
-                 # Better to be explicit, but for now let's add END
-                 workflow.add_edge(name, END)
+                self._nodes[name] = self._make_node_func(name, state_def)
 
-        workflow.set_entry_point(start_at)
+        workflow = StateGraph(FlowRunState)
+        workflow.add_node(STATE_NODE, self._run_state)
+        workflow.add_node(BRANCH_NODE, self._run_branch)
+        workflow.add_conditional_edges(STATE_NODE, _route, [STATE_NODE, BRANCH_NODE, END])
+        # Branch tasks of one fan-out run in the same superstep: the state node
+        # runs once after all of them, to join
+        workflow.add_edge(BRANCH_NODE, STATE_NODE)
+        # Routed on entry too, so a resumed run continues a pending fan-out or ends
+        workflow.set_conditional_entry_point(_route, [STATE_NODE, BRANCH_NODE, END])
 
         return workflow
 
+    def _sub_flow(self, name: str, index: int, branch: FlowBranch) -> "CompiledFlow":
+        definition = FlowDefinition(id=f"{self.flow_model.id}/{name}[{index}]", start_at=branch.start_at, states=branch.states)
+        return CompiledFlow(definition, max_steps=self.max_steps)
+
+    async def _run_state(self, state: FlowRunState, config: RunnableConfig):
+        name = state["at"]
+        update = await self._nodes[name](state, config)
+        fork = state.get("fork")
+        # A state's visit is identified by its position in the trace (a fan-out's
+        # join comes one position after the fork, and is told apart by its suffix)
+        key = _position(state) if fork is None or fork["state"] != name else f"{_position(state)}:join"
+        _record(config, key, name, update)
+        return update
+
+    async def _run_branch(self, task: Dict[str, Any], config: RunnableConfig):
+        name, index = task["state"], task["index"]
+        state_def = self.flow_model.states[name]
+        configurable = config.get("configurable") or {}
+        run_id = configurable.get("run_id")
+        key = f"{task['position']}.{name}[{index}]"
+        # Each branch is a run of its own, resumable on its own
+        branch_config = {**config, "configurable": {**configurable, "run_id": f"{run_id}/{key}", "parent_run_id": run_id}}
+        branch = self._branches[name][index if state_def.type == "Parallel" else 0]
+        slots = None
+        if state_def.type == "Map" and state_def.max_concurrency:
+            # Held by the run (see run()), so they go away with it however it ends
+            slots = configurable["map_slots"].setdefault(name, asyncio.Semaphore(state_def.max_concurrency))
+        if slots is None:
+            output = await branch.run(task["vars"], branch_config)
+        else:
+            async with slots:
+                output = await branch.run(task["vars"], branch_config)
+        update = {"joins": {name: {index: output}}}
+        _record(config, key, name, update)
+        return update
+
+    def _make_fan_out_func(self, name: str, state_def: FlowState):
+        transitions = self._compile_choices(state_def)
+        is_map = state_def.type == "Map"
+
+        async def node(state: FlowRunState, config: RunnableConfig):
+            variables = state.get("vars") or {}
+            fork = state.get("fork")
+            if fork is not None and fork["state"] == name:
+                # Join: every branch has completed; outputs in branch (or item) order
+                outputs = (state.get("joins") or {}).get(name, {})
+                joined = [outputs.get(i) for i in range(len(fork["inputs"]))]
+                return {"results": {name: joined}, "fork": None, "joins": None,
+                        "at": _choose(transitions, state_def.next, variables, joined)}
+
+            logger.info(f"--- Flow Fan-out: {name} ---")
+            position = _position(state)
+            if is_map:
+                items = _lookup(variables, state_def.items)
+                if not isinstance(items, (list, tuple)):
+                    raise ValueError(f"Map state {name}: variable '{state_def.items}' is not a list")
+                inputs = [{**variables, state_def.item_var: item} for item in items]
+            else:
+                inputs = [dict(variables) for _ in state_def.branches]
+            if not inputs:
+                return {"trace": [name], "results": {name: []}, "at": _choose(transitions, state_def.next, variables, [])}
+            return {"trace": [name], "fork": {"state": name, "position": position, "inputs": inputs}, "at": name}
+        return node
+
+    def _compile_choices(self, state_def: FlowState) -> List[tuple]:
+        return [(compile_rule(choice.condition), choice.next) for choice in state_def.choices]
+
     def _make_node_func(self, name: str, state_def: FlowState):
-        async def node(state: Dict[str, Any]):
+        params = state_def.params
+        skill_id = state_def.skill
+        next_state = state_def.next
+        transitions = self._compile_choices(state_def)
+
+        async def node(state: FlowRunState, config: RunnableConfig):
             logger.info(f"--- Flow Node Execution: {name} ---")
-            trace = state.get("trace", [])
-            new_trace = trace + [name]
-            params = state_def.params
-            
+            # Without `next` the flow ends here, whether or not `end` is set
+            update: Dict[str, Any] = {"trace": [name], "at": next_state}
+            if params:
+                update["vars"] = params
+            result = None
+            configurable = config.get("configurable") or {}
+            skills = configurable.get("skills")
+
             # Execute associated skill if any
-            skill_id = state_def.skill
-            if skill_id and self.skills:
-                skill = self.skills.get_skill(skill_id)
+            if skill_id and skills:
+                skill = skills.get_skill(skill_id)
                 if skill:
                     logger.debug(f"Executing skill {skill_id} for node {name}")
-                    ctx = state.get("_skill_context")
+                    ctx = configurable.get("skill_context")
                     if ctx:
-                        import time
-                        start_time = time.monotonic()
-                        result = await skill.execute(ctx, **params)
-                        duration_ms = int((time.monotonic() - start_time) * 1000)
+                        if configurable.get("run_id"):
+                            # Stable across resumes: lets skills deduplicate their side effects
+                            ctx = ctx.model_copy(update={"idempotency_key": f"{configurable['run_id']}:{_position(state)}"})
+                        # Streaming skills stream to the engine's sinks, as in plans
+                        run = runner_for(skill, configurable.get("stream_sinks"), configurable.get("result_cache"))
+                        result = await skills.execute(skill, ctx, params, run=run)
+                        update["results"] = {name: result}
                         
                         # Log to knowledge if possible
                         if ctx.store:
-                            import uuid
                             agent_uuid = uuid.uuid5(uuid.NAMESPACE_DNS, ctx.agent_id)
                             # Add unique ID to ensure distinct facts for repetitive logs
                             log_id = uuid.uuid4().hex[:8]
@@ -96,33 +245,167 @@ class FlowExecutor:
                                 allow_multiple=True
                             )
                     else:
-                        logger.warning(f"No _skill_context found in state for node {name}")
-            
-            logger.info(f"Node {name} complete. Returning trace: {new_trace}")
-            
-            # Create update dict
-            output = {"trace": new_trace, **params}
+                        logger.warning(f"No skill context given to the flow for node {name}")
             
-            # Preserve internal keys for next nodes
-            for key in ["_skill_context", "_world_state"]:
-                if key in state:
-                    output[key] = state[key]
-                    
-            return output
+            if transitions:
+                variables = {**(state.get("vars") or {}), **params}
+                update["at"] = _choose(transitions, next_state, variables, result.data if result is not None else None)
+
+            logger.debug(f"Node {name} complete.")
+            return update
         return node
-    
-    async def step(self, inputs: Dict[str, Any], state: WorldState) -> Dict[str, Any]:
+
+    async def run(self, inputs: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+        """
+        Runs the flow to its end with the given run config; errors propagate.
+        """
+        configurable = config.get("configurable") or {}
+        run_id = configurable.get("run_id")
+        checkpoints: Optional[FlowCheckpointStore] = configurable.get("checkpoints")
+        run_input: Optional[FlowRunState] = None
+        if checkpoints is not None:
+            steps = checkpoints.steps(run_id)
+            if steps:
+                run_input = _replay(steps)
+                if checkpoints.status(run_id) == "completed":
+                    return _output(run_input)
+                logger.info(f"Resuming flow run {run_id} of {self.flow_model.id} after {len(steps) - 1} recorded states")
+            checkpoints.start(run_id, self.flow_model.id, parent_id=configurable.get("parent_run_id"))
+
+        # Concurrency limits of this run's Map states, by state. The compiled flow is
+        # shared by every run of it, so it keeps no per-run state itself
+        config = {**config, "recursion_limit": self.recursion_limit, "configurable": {**configurable, "map_slots": {}}}
+        try:
+            if run_input is None:
+                inputs = dict(inputs)
+                trace = inputs.pop("trace", None) or []
+                run_input = {"at": self.flow_model.start_at, "trace": trace, "vars": inputs}
+                if checkpoints is not None:
+                    checkpoints.record(run_id, "input", None, run_input)
+            final = await self.runnable.ainvoke(run_input, config)
+        except BaseException as e:
+            if checkpoints is not None:
+                # Cancellation (e.g. shutdown) leaves the run resumable as "running"
+                if isinstance(e, Exception):
+                    checkpoints.finish(run_id, "failed", str(e))
+            raise
+        if checkpoints is not None:
+            checkpoints.finish(run_id, "completed")
+        return _output(final)
+
+class FlowExecutor:
+    """
+    Wraps LangGraph to execute deterministic state machines defined in the Codex.
+
+    Binds a compiled flow to an engine's skill registry, result cache, checkpoint
+    store and stream sinks. With a `compile_cache` (a `FlowCompileCache`), the compiled flow is shared
+    with every executor of an identical definition.
+    """
+    def __init__(self, flow_definition: Union[Dict[str, Any], FlowDefinition], skill_registry: Optional[Any] = None, result_cache: Optional[Any] = None, max_steps: Optional[int] = None, checkpoints: Optional[FlowCheckpointStore] = None, compile_cache: Optional[Any] = None, stream_sinks: Optional[List[Any]] = None):
+        if compile_cache is not None:
+            self.compiled = compile_cache.compile(flow_definition, max_steps=max_steps)
+        else:
+            # Validate against the portable schema
+            self.compiled = CompiledFlow(FlowDefinition.model_validate(flow_definition), max_steps=max_steps)
+        self.flow_model = self.compiled.flow_model
+        self.skills = skill_registry
+        # SkillResultCache for skills declaring a CachePolicy (None: always execute)
+        self.result_cache = result_cache
+        # Durable journal of runs, for resume after a crash (None: runs are not recorded)
+        self.checkpoints = checkpoints
+        # Receive the chunks of streaming skills (None: they run without sinks)
+        self.stream_sinks = stream_sinks
+        self.max_steps = max_steps
+        self.recursion_limit = self.compiled.recursion_limit
+        self.graph = self.compiled.graph
+        self.runnable = self.compiled.runnable
+
+    @property
+    def flow_def(self) -> Dict[str, Any]:
+        return self.flow_model.model_dump()
+
+    async def step(self, inputs: Dict[str, Any], state: WorldState, skill_context: Optional[Any] = None, run_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Executes one step (or run) of the flow.
+
+        Returns the flow variables, with the `trace` of visited states and the
+        skill `results` by state name (for Parallel and Map states, the list of
+        their branch outputs, each shaped like this return value).
+
+        With a checkpoint store, passing the `run_id` of an interrupted or failed
+        run resumes it from its last completed state (`inputs` are then ignored);
+        a completed run returns its recorded output. A failed run returns only its
+        `run_id` (generated when none was passed) and `error`.
         """
         if not self.runnable:
             return {}
 
-        # Inject WorldState into the flow state for logic evaluation
-        inputs["_world_state"] = state 
-        
+        run_id = run_id or uuid.uuid4().hex
+        # WorldState (for logic evaluation) and SkillContext are passed by reference
+        config = {"configurable": {"world_state": state, "skill_context": skill_context, "run_id": run_id}}
         try:
-            return await self.runnable.ainvoke(inputs)
+            return await self.run(inputs, config)
         except Exception as e:
-            logger.error(f"Error executing flow: {e}")
-            return {}
+            logger.error(f"Error executing flow {self.flow_model.id} (run {run_id}): {e}")
+            return {"run_id": run_id, "error": str(e)}
+
+    async def run(self, inputs: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+        """
+        Runs the flow to its end with the given run config; errors propagate.
+        """
+        configurable = {**(config.get("configurable") or {}), "skills": self.skills, "result_cache": self.result_cache, "checkpoints": self.checkpoints, "stream_sinks": self.stream_sinks}
+        return await self.compiled.run(inputs, {**config, "configurable": configurable})
+
+def _record(config: RunnableConfig, key: str, name: Optional[str], update: Dict[str, Any]):
+    checkpoints = (config.get("configurable") or {}).get("checkpoints")
+    if checkpoints is not None:
+        run_id = (config.get("configurable") or {}).get("run_id")
+        checkpoints.record(run_id, key, name, update)
+
+def _position(state: FlowRunState) -> str:
+    return str(len(state.get("trace") or []))
+
+def _output(final: FlowRunState) -> Dict[str, Any]:
+    return {**(final.get("vars") or {}), "trace": final.get("trace") or [], "results": final.get("results") or {}}
+
+def _replay(steps: List[tuple]) -> FlowRunState:
+    """
+    Rebuilds the channels of a run from its recorded updates.
+    """
+    channels: FlowRunState = {"trace": [], "results": {}, "vars": {}, "at": None, "fork": None, "joins": {}}
+    for _, _, update in steps:
+        if "trace" in update:
+            _append(channels["trace"], update["trace"])
+        if "results" in update:
+            _merge(channels["results"], update["results"])
+        if "vars" in update:
+            _merge(channels["vars"], update["vars"])
+        for key in ("at", "fork"):
+            if key in update:
+                channels[key] = update[key]
+        if "joins" in update:
+            # JSON object keys are strings: branch indexes come back as ints
+            joins = None if update["joins"] is None else {name: {int(i): output for i, output in outputs.items()} for name, outputs in update["joins"].items()}
+            channels["joins"] = _join(channels["joins"], joins)
+    return channels
+
+def _choose(transitions: List[tuple], default: Optional[str], variables: Dict[str, Any], result: Any) -> Optional[str]:
+    """
+    The first transition whose condition holds for the variables (and `result`),
+    or the default `next`.
+    """
+    if not transitions:
+        return default
+    data = {**variables, "result": result}
+    for condition, target in transitions:
+        if condition(data):
+            return target
+    return default
+
+def _lookup(variables: Dict[str, Any], path: str) -> Any:
+    value: Any = variables
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
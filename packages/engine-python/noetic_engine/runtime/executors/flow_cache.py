@@ -0,0 +1,80 @@
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+from noetic_lang.core import FlowDefinition
+from .flow import CompiledFlow
+
+logger = logging.getLogger(__name__)
+
+class FlowCompileCache:
+    """
+    LRU cache of compiled flows, keyed by the hash of the canonical flow definition
+    (and `max_steps`).
+
+    Compiling a flow (validating it and building its LangGraph) costs milliseconds;
+    running one does not need it again. Compiled flows hold no engine state, so the
+    engines of a process (e.g. the tenants of an EngineHost) loading the same Codex
+    share them: registering a flow already compiled by any engine costs a hash.
+    Skills are resolved at run time, so registry changes never make an entry stale.
+    """
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, CompiledFlow]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def digest(flow_definition: Union[Dict[str, Any], FlowDefinition]) -> str:
+        if isinstance(flow_definition, FlowDefinition):
+            flow_definition = flow_definition.model_dump(mode="json")
+        canonical = json.dumps(flow_definition, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+    def compile(self, flow_definition: Union[Dict[str, Any], FlowDefinition], max_steps: Optional[int] = None) -> CompiledFlow:
+        """
+        The compiled flow of a definition, compiled on first use. Invalid
+        definitions raise (and are not cached).
+        """
+        key: Tuple[str, Optional[int]] = (self.digest(flow_definition), max_steps)
+        compiled = self._entries.get(key)
+        if compiled is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return compiled
+
+        self.misses += 1
+        compiled = CompiledFlow(FlowDefinition.model_validate(flow_definition), max_steps=max_steps)
+        self._entries[key] = compiled
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return compiled
+
+    def clear(self):
+        self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+# Shared by the engines of the process unless they are given their own
+_shared = FlowCompileCache()
+
+def shared_flow_cache() -> FlowCompileCache:
+    return _shared
@@ -0,0 +1,353 @@
+import asyncio
+import gc
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine, event, text
+
+from noetic_knowledge import KnowledgeStore
+from noetic_stdlib.transport import HttpTransport
+from .engine import NoeticEngine
+from .scheduler import Scheduler
+from .executors.checkpoints import FlowCheckpointStore
+from .executors.flow_cache import FlowCompileCache, shared_flow_cache
+
+logger = logging.getLogger(__name__)
+
+# SQLite refuses more than SQLITE_MAX_ATTACHED (default: 10) databases per connection.
+SQLITE_MAX_ATTACHED = 10
+
+
+class TenantDatabase:
+    """
+    One pooled SQLAlchemy engine shared by every tenant.
+
+    Each tenant lives in its own schema. On SQLite a schema is a separate database
+    file that is ATTACHed on demand to whichever pooled connection runs the statement
+    (least recently used attachments are DETACHed to stay under SQLite's limit).
+    On server databases (e.g. PostgreSQL) a real schema is created per tenant.
+    """
+    def __init__(self, db_url: str = "sqlite://", data_dir: Optional[str] = None, max_attached: int = SQLITE_MAX_ATTACHED):
+        self.db_url = db_url
+        self.engine = create_engine(db_url, echo=False, connect_args={"check_same_thread": False} if db_url.startswith("sqlite") else {})
+        self.is_sqlite = self.engine.dialect.name == "sqlite"
+        self.data_dir = data_dir or (tempfile.mkdtemp(prefix="noetic_tenants_") if self.is_sqlite else None)
+        self.max_attached = max_attached
+        self._schemas: Dict[str, str] = {}
+
+        if self.is_sqlite:
+            event.listen(self.engine, "before_cursor_execute", self._attach_tenant)
+
+    def schema_for(self, tenant_id: str) -> str:
+        """
+        Maps a tenant id to a stable, SQL-safe schema name.
+        """
+        schema = self._schemas.get(tenant_id)
+        if schema is None:
+            slug = re.sub(r"[^a-zA-Z0-9_]", "_", tenant_id)[:40]
+            digest = hashlib.sha1(tenant_id.encode("utf-8")).hexdigest()[:8]
+            schema = f"t_{slug}_{digest}"
+            self._schemas[tenant_id] = schema
+        return schema
+
+    def engine_for(self, tenant_id: str) -> Any:
+        """
+        Returns a lightweight view of the shared engine that routes unqualified
+        tables to the tenant's schema. The connection pool is not duplicated.
+        """
+        schema = self.schema_for(tenant_id)
+        if not self.is_sqlite:
+            with self.engine.begin() as conn:
+                conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{schema}"'))
+        return self.engine.execution_options(schema_translate_map={None: schema}, noetic_tenant=schema)
+
+    def path_for(self, schema: str) -> str:
+        return os.path.join(self.data_dir, f"{schema}.db")
+
+    def _attach_tenant(self, conn, cursor, statement, parameters, context, executemany):
+        schema = conn.get_execution_options().get("noetic_tenant")
+        if not schema:
+            return
+
+        attached: "OrderedDict[str, bool]" = conn.connection.info.setdefault("noetic_attached", OrderedDict())
+        if schema in attached:
+            attached.move_to_end(schema)
+            return
+
+        while len(attached) >= self.max_attached:
+            stale = next(iter(attached))
+            try:
+                cursor.execute(f'DETACH DATABASE "{stale}"')
+            except Exception as e:
+                # Still attached: keep the map in line with SQLite's and fail the statement
+                logger.error(f"Could not detach tenant schema {stale}: {e}")
+                raise
+            del attached[stale]
+
+        cursor.execute(f'ATTACH DATABASE ? AS "{schema}"', (self.path_for(schema),))
+        attached[schema] = True
+
+    def dispose(self):
+        self.engine.dispose()
+
+
+class TenantSession:
+    """
+    Book-keeping for one resident tenant.
+    """
+    def __init__(self, tenant_id: str, engine: NoeticEngine):
+        self.tenant_id = tenant_id
+        self.engine = engine
+        self.last_active = time.monotonic()
+
+    def touch(self):
+        self.last_active = time.monotonic()
+
+
+class EngineHost:
+    """
+    Multiplexes many NoeticEngine sessions (one per tenant) in a single process.
+
+    - One Scheduler drives the reflex tick of every resident engine.
+    - One pooled database engine, one Chroma client, one embedding backend and one
+      pooled HttpTransport are shared.
+    - On SQLite, each tenant's flow runs are checkpointed beside its schema and
+      interrupted runs are resumed when the tenant wakes.
+    - Flows are compiled once for all tenants (one FlowCompileCache).
+    - Tenants are woken lazily on first use and evicted when idle or when the host
+      exceeds its residency / memory cap. Evicted tenants keep their data in their schema;
+      their vector collection is dropped and rebuilt from it on the next wake.
+    """
+    def __init__(self,
+                 db_url: str = "sqlite://",
+                 data_dir: Optional[str] = None,
+                 chroma_client: Optional[Any] = None,
+                 embedding_function: Optional[Any] = None,
+                 max_resident: int = 64,
+                 memory_limit_mb: Optional[float] = None,
+                 idle_evict_after: float = 900.0,
+                 target_fps: int = 60,
+                 engine_factory: Optional[Any] = None,
+                 flow_cache: Optional[FlowCompileCache] = None,
+                 http: Optional[HttpTransport] = None):
+        self.database = TenantDatabase(db_url=db_url, data_dir=data_dir)
+
+        if chroma_client is None:
+            import chromadb
+            chroma_client = chromadb.EphemeralClient()
+        self.chroma_client = chroma_client
+        self.embedding_function = embedding_function
+
+        self.max_resident = max_resident
+        self.memory_limit_mb = memory_limit_mb
+        self.idle_evict_after = idle_evict_after
+        self.scheduler = Scheduler(target_fps=target_fps)
+        self.flow_cache = flow_cache if flow_cache is not None else shared_flow_cache()
+        # An injected transport may be shared beyond the host, so only our own is closed in stop()
+        self.http = http or HttpTransport()
+        self._owns_http = http is None
+        self.engine_factory = engine_factory or self._new_engine
+        # Checkpoint stores opened for the default engines, closed on eviction
+        self._checkpoints: Dict[str, FlowCheckpointStore] = {}
+
+        # Resident tenants, least recently used first
+        self.tenants: "OrderedDict[str, TenantSession]" = OrderedDict()
+        # Wakes in progress: concurrent wakes of a tenant share one engine
+        self._waking: Dict[str, "asyncio.Future[NoeticEngine]"] = {}
+        self.running = False
+        self.evictions = 0
+        if memory_limit_mb is not None and _current_rss_bytes() is None:
+            logger.warning("Host: the resident memory of this process cannot be measured here; memory_limit_mb is ignored.")
+
+    # --- Tenant Management ---
+
+    async def wake(self, tenant_id: str) -> NoeticEngine:
+        """
+        Returns the tenant's engine, building and starting it if it is not resident.
+        """
+        session = self.tenants.get(tenant_id)
+        if session:
+            session.touch()
+            self.tenants.move_to_end(tenant_id)
+            return session.engine
+
+        waking = self._waking.get(tenant_id)
+        if waking is not None:
+            return await asyncio.shield(waking)
+
+        waking = asyncio.get_running_loop().create_future()
+        self._waking[tenant_id] = waking
+        try:
+            engine = await self._build(tenant_id)
+        except asyncio.CancelledError:
+            waking.cancel()
+            raise
+        except BaseException as e:
+            waking.set_exception(e)
+            # Retrieved here, so a wake nobody else awaited does not log it again
+            waking.exception()
+            raise
+        else:
+            waking.set_result(engine)
+        finally:
+            self._waking.pop(tenant_id, None)
+
+        await self._enforce_caps(protect=tenant_id)
+        return engine
+
+    async def _build(self, tenant_id: str) -> NoeticEngine:
+        knowledge = KnowledgeStore(
+            sql_engine=self.database.engine_for(tenant_id),
+            chroma_client=self.chroma_client,
+            embedding_function=self.embedding_function,
+            collection_name=self._collection_for(tenant_id)
+        )
+        if knowledge.collection.count() == 0:
+            # Dropped on eviction (or never built): re-embed the tenant's facts before it serves
+            await asyncio.to_thread(knowledge.reindex)
+        engine = self.engine_factory(tenant_id, knowledge)
+
+        # The host owns the loop: mark the engine running without spawning its own run_loop
+        engine.running = True
+        await engine.brain.start()
+        engine.resume_interrupted_runs()
+
+        self.tenants[tenant_id] = TenantSession(tenant_id, engine)
+        logger.info(f"Host: woke tenant '{tenant_id}' ({len(self.tenants)} resident)")
+        return engine
+
+    def _new_engine(self, tenant_id: str, knowledge: KnowledgeStore) -> NoeticEngine:
+        checkpoints = None
+        if self.database.data_dir is not None:
+            path = os.path.join(self.database.data_dir, f"{self.database.schema_for(tenant_id)}.flows.db")
+            checkpoints = self._checkpoints[tenant_id] = FlowCheckpointStore(path)
+        return NoeticEngine(knowledge=knowledge, http=self.http, flow_checkpoints=checkpoints, flow_cache=self.flow_cache)
+
+    async def evict(self, tenant_id: str):
+        """
+        Stops a tenant's engine and releases its in-memory state. Its data stays in its schema.
+        """
+        session = self.tenants.pop(tenant_id, None)
+        if not session:
+            return
+        try:
+            await session.engine.stop()
+        except Exception as e:
+            logger.error(f"Host: error stopping tenant '{tenant_id}': {e}")
+        checkpoints = self._checkpoints.pop(tenant_id, None)
+        if checkpoints is not None:
+            checkpoints.close()
+        try:
+            # The shared client keeps every collection in memory until it is deleted
+            self.chroma_client.delete_collection(self._collection_for(tenant_id))
+        except Exception as e:
+            logger.error(f"Host: error dropping the vector collection of tenant '{tenant_id}': {e}")
+        self.evictions += 1
+        logger.info(f"Host: evicted tenant '{tenant_id}' ({len(self.tenants)} resident)")
+
+    def _collection_for(self, tenant_id: str) -> str:
+        return f"knowledge_facts_{self.database.schema_for(tenant_id)}"
+
+    async def push_event(self, tenant_id: str, event_type: str, payload: dict = None):
+        engine = await self.wake(tenant_id)
+        engine.push_event(event_type, payload)
+
+    def resident(self) -> List[str]:
+        return list(self.tenants.keys())
+
+    # --- Main Loop ---
+
+    async def start(self):
+        self.running = True
+        await self.run_loop()
+
+    async def stop(self):
+        self.running = False
+        for tenant_id in list(self.tenants.keys()):
+            await self.evict(tenant_id)
+        if self._owns_http:
+            await self.http.aclose()
+        self.database.dispose()
+
+    async def run_loop(self):
+        """
+        One loop for all tenants. A tenant whose reflex tick fails is evicted;
+        the host and the other tenants stay alive.
+        """
+        while self.running:
+            start_time = time.monotonic()
+            await self.tick()
+            await self.scheduler.sleep_until_next_tick(start_time)
+
+    async def tick(self):
+        for tenant_id, session in list(self.tenants.items()):
+            if not session.engine.running:
+                await self.evict(tenant_id)
+                continue
+            try:
+                await session.engine.tick()
+            except Exception as e:
+                logger.error(f"Host: reflex failure in tenant '{tenant_id}': {e}")
+                await self.evict(tenant_id)
+
+        await self._evict_idle()
+
+    # --- Eviction Policy ---
+
+    async def _evict_idle(self):
+        now = time.monotonic()
+        for tenant_id, session in list(self.tenants.items()):
+            if now - session.last_active > self.idle_evict_after:
+                await self.evict(tenant_id)
+
+    async def _enforce_caps(self, protect: Optional[str] = None):
+        while len(self.tenants) > self.max_resident:
+            victim = next((t for t in self.tenants if t != protect), None)
+            if victim is None:
+                break
+            await self.evict(victim)
+
+        if self.memory_limit_mb is None:
+            return
+
+        rss = _current_rss_bytes()
+        if rss is None:
+            return
+        while rss > self.memory_limit_mb * 1024 * 1024:
+            victim = next((t for t in self.tenants if t != protect), None)
+            if victim is None:
+                logger.warning("Host: memory cap exceeded but no evictable tenant is left.")
+                break
+            await self.evict(victim)
+            gc.collect()
+            freed = rss - (_current_rss_bytes() or rss)
+            if freed <= 0:
+                # The allocator kept what the tenant released: evicting more would not help
+                logger.warning(f"Host: memory cap exceeded; evicting '{victim}' freed no memory, not evicting further.")
+                break
+            rss -= freed
+
+
+def _current_rss_bytes() -> Optional[int]:
+    """
+    Current resident set size of this process, from /proc on Linux or psutil when
+    installed; None when it cannot be measured (peak figures such as getrusage's
+    ru_maxrss never go down, so they are not used).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
@@ -1,27 +1,55 @@
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
+import asyncio
 import datetime
-from noetic_conscience.contracts import AgenticIntentContract
+from noetic_conscience.contracts import AgenticIntentContract, VerificationCache, verify_many
 from noetic_stdlib.agents.base import Agent
 
 class MeshOrchestrator:
     """
     The Runtime Kernel: Manages Agents and enforces Contracts.
     """
-    def __init__(self):
+    def __init__(self, http: Optional[Any] = None):
         self.agents: Dict[str, Agent] = {}
+        # Pooled HttpTransport given to registered agents that have none (e.g. N8nAgent)
+        self.http = http
         self.public_key: Optional[Any] = None
+        # Contracts are reused across many tool calls: verify each signature once
+        self.verification_cache = VerificationCache()
 
     def set_public_key(self, public_key):
         self.public_key = public_key
+        self.verification_cache.clear()
 
     def register_agent(self, agent: Agent):
         print(f"Registering agent: {agent.definition.name} ({agent.definition.id})")
+        if self.http is not None and getattr(agent, "transport", self.http) is None:
+            agent.transport = self.http
         self.agents[agent.definition.id] = agent
 
     async def route_intent(self, agent_id: str, tool: str, params: Dict[str, Any], contract: AgenticIntentContract) -> Any:
+        return await self._route(agent_id, tool, params, contract, verified=False)
+
+    async def _route(self, agent_id: str, tool: str, params: Dict[str, Any], contract: AgenticIntentContract, verified: bool) -> Any:
+        # `verified`: the signature was checked by verify_many (route_intents only)
+        target_agent = self._authorize(agent_id, tool, contract, verified)
+
+        # 5. Execute
+        print(f"Routing intent '{tool}' to agent '{agent_id}'...")
+        return await target_agent.execute(tool, params, contract)
+
+    async def route_intent_stream(self, agent_id: str, tool: str, params: Dict[str, Any], contract: AgenticIntentContract) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Like `route_intent`, but yields the agent's output chunks as they are produced
+        and its result last (see Agent.execute_stream).
+        """
+        target_agent = self._authorize(agent_id, tool, contract, False)
+        async for item in target_agent.execute_stream(tool, params, contract):
+            yield item
+
+    def _authorize(self, agent_id: str, tool: str, contract: AgenticIntentContract, verified: bool) -> Agent:
         # 1. Verify Contract Signature
-        if self.public_key:
-             if not contract.verify(self.public_key):
+        if self.public_key and not verified:
+             if not contract.verify(self.public_key, cache=self.verification_cache):
                 raise PermissionError("Invalid contract signature")
         
         # 2. Verify Capabilities (Scope Check)
@@ -36,7 +64,22 @@ class MeshOrchestrator:
         # 4. Verify Agent Capability
         if tool not in target_agent.definition.allowed_tools:
              raise PermissionError(f"Agent '{agent_id}' does not have capability '{tool}'")
+        return target_agent
 
-        # 5. Execute
-        print(f"Routing intent '{tool}' to agent '{agent_id}'...")
-        return await target_agent.execute(tool, params, contract)
+    async def route_intents(self, intents: List[Tuple[str, str, Dict[str, Any], AgenticIntentContract]]) -> List[Any]:
+        """
+        Fan-out routing: verifies the contracts of all (agent_id, tool, params, contract)
+        intents in one batch, then routes them concurrently. Returns one result per
+        intent, in order; a failed intent yields its exception.
+        """
+        valid = [True] * len(intents)
+        if self.public_key:
+            valid = verify_many([intent[3] for intent in intents], self.public_key, cache=self.verification_cache)
+
+        async def route(intent, is_valid):
+            if not is_valid:
+                raise PermissionError("Invalid contract signature")
+            agent_id, tool, params, contract = intent
+            return await self._route(agent_id, tool, params, contract, verified=True)
+
+        return await asyncio.gather(*(route(i, v) for i, v in zip(intents, valid)), return_exceptions=True)
@@ -16,8 +16,9 @@ async def lifespan(app: FastAPI):
     codex_path = app.state.codex_path
     engine = app.state.engine
     
+    # Definitions are registered up front; the Codex's initial facts are ingested in the background
     loader = NoeticLoader()
-    loader.load(engine, codex_path)
+    app.state.ingestion = await loader.load_async(engine, codex_path)
     
     # Run engine start in a task so it doesn't block lifespan
     task = asyncio.create_task(engine.start())
@@ -26,6 +27,8 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown
+    if app.state.ingestion is not None:
+        app.state.ingestion.cancel()
     await engine.stop()
     task.cancel()
     try:
@@ -1,4 +1,6 @@
-from .interfaces import Skill, SkillResult, SkillContext
+from .interfaces import Skill, SkillResult, SkillChunk, SkillContext, CachePolicy, ExecutionPolicy
 from .registry import SkillRegistry
+from .result_cache import SkillResultCache
+from .inputs import InputEvent, InputSkill, InputSource
 
-__all__ = ["Skill", "SkillResult", "SkillContext", "SkillRegistry"]
+__all__ = ["Skill", "SkillResult", "SkillChunk", "SkillContext", "CachePolicy", "ExecutionPolicy", "SkillRegistry", "SkillResultCache", "InputEvent", "InputSkill", "InputSource"]
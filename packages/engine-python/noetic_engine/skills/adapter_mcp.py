@@ -1,7 +1,8 @@
 import asyncio
+import itertools
 import logging
 from typing import Dict, Any, Optional
-from .interfaces import Skill, SkillResult, SkillContext
+from .interfaces import Skill, SkillResult, SkillContext, ExecutionPolicy
 
 logger = logging.getLogger(__name__)
 
@@ -11,19 +12,51 @@ try:
 except ImportError:
     httpx = None
 
+# JSON-RPC ids of standalone calls (an McpClient numbers its own requests)
+_request_ids = itertools.count(1)
+
+class McpError(Exception):
+    """
+    A JSON-RPC error returned by an MCP server.
+    """
+    def __init__(self, error: Dict[str, Any]):
+        self.code = error.get("code")
+        self.data = error.get("data")
+        super().__init__(error.get("message", "Unknown MCP error"))
+
 class McpSkillAdapter(Skill):
     """
     Adapts a remote MCP Tool to the Noetic Skill interface.
+    Tools registered by McpClient use its connection (HTTP, stdio or SSE); a
+    standalone adapter POSTs JSON-RPC to `server_url`.
     """
-    def __init__(self, server_url: str, tool_name: str, tool_description: str, input_schema: Dict[str, Any]):
+    def __init__(self, server_url: str, tool_name: str, tool_description: str, input_schema: Dict[str, Any], transport: Optional[Any] = None, client: Optional[Any] = None):
+        """
+        :param transport: Pooled HttpTransport. Defaults to the engine's (`context.engine.http`);
+            without either, each call opens its own connection.
+        :param client: McpClient of the server (set by discovery); calls go through it and
+            are batched with concurrent calls to the same server.
+        """
         self.server_url = server_url
+        self.transport = transport
+        self.client = client
         self._tool_name = tool_name
         self._description = tool_description
         self._schema = input_schema
 
+    @property
+    def execution_policy(self) -> ExecutionPolicy:
+        # A slow or failing server must not hold every plan step: bound the calls
+        # in flight and stop calling it for a while once most calls fail
+        return ExecutionPolicy(max_concurrency=16, timeout=60.0, failure_rate=0.5)
+
+    @staticmethod
+    def skill_id(tool_name: str) -> str:
+        return f"mcp.{tool_name}"
+
     @property
     def id(self) -> str:
-        return f"mcp.{self._tool_name}"
+        return self.skill_id(self._tool_name)
 
     @property
     def description(self) -> str:
@@ -44,6 +77,15 @@ class McpSkillAdapter(Skill):
                 cost=0.0
             )
 
+        if self.client is not None:
+            try:
+                return self._to_result(await self.client.call_tool(self._tool_name, kwargs))
+            except McpError as e:
+                return SkillResult(success=False, error=f"MCP Error: {e}", cost=0.0)
+            except Exception as e:
+                logger.error(f"MCP Call Failed: {e}")
+                return SkillResult(success=False, error=str(e), cost=0.0)
+
         # JSON-RPC 2.0 Request
         payload = {
             "jsonrpc": "2.0",
@@ -52,44 +94,47 @@ class McpSkillAdapter(Skill):
                 "name": self._tool_name,
                 "arguments": kwargs
             },
-            "id": 1
+            "id": next(_request_ids)
         }
 
+        transport = self.transport or getattr(context.engine, "http", None)
         try:
-            async with httpx.AsyncClient() as client:
-                # We assume the MCP server accepts POST requests for RPC at the root or /jsonrpc
-                # The MCP spec uses SSE for transport usually, but simple HTTP POST is common for simple servers.
-                # If SSE is required, this needs a much more complex implementation (sse_client).
-                # For this adapter, we assume a simple HTTP endpoint for now.
-                
-                resp = await client.post(self.server_url, json=payload, timeout=30.0)
-                resp.raise_for_status()
-                
-                rpc_response = resp.json()
-                
-                if "error" in rpc_response:
-                    return SkillResult(
-                        success=False,
-                        error=f"MCP Error: {rpc_response['error'].get('message')}",
-                        cost=0.0
-                    )
-                
-                result_content = rpc_response.get("result", {})
-                
-                # Extract text/content from result
-                # MCP 'tools/call' result structure: { "content": [ { "type": "text", "text": "..." } ] }
-                content = result_content.get("content", [])
-                text_output = ""
-                for item in content:
-                    if item.get("type") == "text":
-                        text_output += item.get("text", "")
-                
+            # We assume the MCP server accepts POST requests for RPC at the root or /jsonrpc
+            # The MCP spec uses SSE for transport usually, but simple HTTP POST is common for simple servers.
+            if transport is not None:
+                resp = await transport.post(self.server_url, json=payload, timeout=30.0)
+            else:
+                async with httpx.AsyncClient() as client:
+                    resp = await client.post(self.server_url, json=payload, timeout=30.0)
+            resp.raise_for_status()
+            
+            rpc_response = resp.json()
+            
+            if "error" in rpc_response:
                 return SkillResult(
-                    success=True,
-                    data=text_output if text_output else result_content,
-                    cost=1.0 # Default cost
+                    success=False,
+                    error=f"MCP Error: {rpc_response['error'].get('message')}",
+                    cost=0.0
                 )
+            
+            return self._to_result(rpc_response.get("result", {}))
 
         except Exception as e:
             logger.error(f"MCP Call Failed: {e}")
             return SkillResult(success=False, error=str(e), cost=0.0)
+
+    def _to_result(self, result_content: Any) -> SkillResult:
+        result_content = result_content or {}
+        # Extract text/content from result
+        # MCP 'tools/call' result structure: { "content": [ { "type": "text", "text": "..." } ] }
+        content = result_content.get("content", [])
+        text_output = ""
+        for item in content:
+            if item.get("type") == "text":
+                text_output += item.get("text", "")
+        
+        return SkillResult(
+            success=True,
+            data=text_output if text_output else result_content,
+            cost=1.0 # Default cost
+        )
@@ -0,0 +1,151 @@
+import itertools
+import logging
+import time
+from abc import abstractmethod
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from pydantic import BaseModel, Field
+
+from .interfaces import Skill, SkillContext, SkillResult
+
+logger = logging.getLogger(__name__)
+
+class InputEvent(BaseModel):
+    source: str
+    type: str # e.g. "key_down", "mouse_move", "file_modified"
+    payload: Dict[str, Any] = Field(default_factory=dict)
+    coalesce_key: Optional[str] = None # Pending events with the same key collapse into the latest
+    timestamp: float = Field(default_factory=time.monotonic)
+    seq: int = 0 # Order of arrival across all sources
+
+class InputSource:
+    """
+    Producer side of one input source. `push` may be called from any task or
+    thread without locking: it only appends to a bounded deque or sets a dict
+    item, both atomic in CPython.
+
+    - Events carrying a `coalesce_key` (or whose type is in `coalesce_types`)
+      replace the pending event with the same key, so a burst of mouse moves or
+      writes to one file is delivered once, as its latest value.
+    - At most `max_pending` events (and `max_pending` coalescing keys) wait per
+      source. Beyond that the oldest plain events are dropped, as are events
+      with new coalescing keys, and counted in `dropped`.
+
+    Counters are approximate when several threads push concurrently.
+    """
+    def __init__(self, name: str, max_pending: int = 1024, coalesce_types: Iterable[str] = (), seq: Optional[Any] = None):
+        self.name = name
+        self.max_pending = max_pending
+        self.coalesce_types: Set[str] = set(coalesce_types)
+        self._seq = seq or itertools.count()
+        self._events: Deque[InputEvent] = deque(maxlen=max_pending)
+        self._latest: Dict[str, InputEvent] = {}
+        self.pushed = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def push(self, type: str, payload: Optional[Dict[str, Any]] = None, coalesce_key: Optional[str] = None) -> bool:
+        """
+        Queues an event. Returns False if it was dropped by backpressure.
+        """
+        if coalesce_key is None and type in self.coalesce_types:
+            coalesce_key = type
+        event = InputEvent(source=self.name, type=type, payload=payload or {}, coalesce_key=coalesce_key, seq=next(self._seq))
+        self.pushed += 1
+        if coalesce_key is not None:
+            if coalesce_key in self._latest:
+                self.coalesced += 1
+            elif len(self._latest) >= self.max_pending:
+                self.dropped += 1
+                return False
+            self._latest[coalesce_key] = event
+            return True
+        if len(self._events) >= self.max_pending:
+            self.dropped += 1 # deque(maxlen) evicts the oldest
+        self._events.append(event)
+        return True
+
+    @property
+    def pending(self) -> int:
+        return len(self._events) + len(self._latest)
+
+    def drain(self, into: List[InputEvent]):
+        """
+        Moves every pending event into `into`, plain events in arrival order
+        followed by the coalesced ones.
+        """
+        events = self._events
+        for _ in range(len(events)):
+            into.append(events.popleft())
+        latest = self._latest
+        # list() of a dict runs without releasing the GIL: safe against concurrent pushes
+        for key in list(latest):
+            event = latest.pop(key, None)
+            if event is not None:
+                into.append(event)
+
+class InputQueue:
+    """
+    Input events of every source, drained by the reflex loop through
+    `SkillRegistry.poll_inputs`.
+    """
+    def __init__(self):
+        self.sources: Dict[str, InputSource] = {}
+        self._seq = itertools.count(1)
+
+    def source(self, name: str, max_pending: int = 1024, coalesce_types: Iterable[str] = ()) -> InputSource:
+        """
+        The producer handle of a source, created on first use.
+        """
+        source = self.sources.get(name)
+        if source is None:
+            source = InputSource(name, max_pending, coalesce_types, seq=self._seq)
+            self.sources[name] = source
+        return source
+
+    def remove(self, name: str):
+        self.sources.pop(name, None)
+
+    def drain(self) -> List[InputEvent]:
+        """
+        Every pending event, in arrival order. Cost is linear in the number of
+        events: each source yields sorted runs, which the sort merges in one pass.
+        """
+        events: List[InputEvent] = []
+        for source in list(self.sources.values()):
+            source.drain(events)
+        if len(self.sources) > 1 or any(event.coalesce_key is not None for event in events):
+            events.sort(key=_seq_of)
+        return events
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {name: {"pushed": s.pushed, "dropped": s.dropped, "coalesced": s.coalesced, "pending": s.pending}
+                for name, s in self.sources.items()}
+
+class InputSkill(Skill):
+    """
+    An I/O skill producing input events (sensors, keyboard, file watches).
+
+    The registry runs `produce` as a background task once the reflex loop polls
+    inputs, and cancels it on `SkillRegistry.stop_inputs` or unregister. Threads
+    started by `produce` may call `source.push` directly.
+    """
+    max_pending: int = 1024
+    coalesce_types: Tuple[str, ...] = () # Event types collapsed to their latest value
+    source: Optional[InputSource] = None # Set by the registry on register
+
+    @abstractmethod
+    async def produce(self, source: InputSource):
+        pass
+
+    async def execute(self, context: SkillContext, **kwargs) -> SkillResult:
+        # Invoking an input skill reports its source's counters
+        if self.source is None:
+            return SkillResult(success=False, error=f"Input skill {self.id} is not registered")
+        source = self.source
+        return SkillResult(success=True, data={"pushed": source.pushed, "dropped": source.dropped,
+                                               "coalesced": source.coalesced, "pending": source.pending})
+
+def _seq_of(event: InputEvent) -> int:
+    return event.seq
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, AsyncIterator, Optional, List, Union
 from pydantic import BaseModel, Field
 
 class SkillResult(BaseModel):
@@ -8,11 +8,41 @@ class SkillResult(BaseModel):
     error: Optional[str] = None
     cost: float = 0.0
     latency_ms: int = 0
+    metadata: Dict[str, Any] = Field(default_factory=dict) # e.g. {"cache_hit": True}
+
+class CachePolicy(BaseModel):
+    """
+    Caching semantics of a skill's results (see SkillResultCache).
+    A result is cacheable when the skill is `pure` or has a `ttl`.
+    """
+    pure: bool = False # Same arguments, same result, no side effects
+    ttl: Optional[float] = None # Seconds a result stays valid
+    invalidate_on: List[str] = Field(default_factory=list) # Fact predicates whose ingestion drops the results ("*": any)
+
+class ExecutionPolicy(BaseModel):
+    """
+    Limits applied around a skill's execution (see SkillMiddleware).
+    """
+    max_concurrency: Optional[int] = None # Calls running at once; more wait for a slot
+    timeout: Optional[float] = None # Deadline in seconds, slot wait included
+    failure_rate: Optional[float] = None # Error rate over the last `window` calls that opens the breaker (None: no breaker)
+    window: int = 20
+    min_calls: int = 5 # Calls in the window before the rate is trusted
+    cooldown: float = 30.0 # Seconds the breaker stays open before a trial call
+    fallback: Optional[str] = None # Skill id run instead while the breaker is open
+
+class SkillChunk(BaseModel):
+    """
+    A piece of a streaming skill's output, delivered while the skill runs.
+    """
+    stream: str = "output" # e.g. "stdout", "stderr"
+    data: Any = None
 
 class SkillContext(BaseModel):
     agent_id: str
     store: Optional[Any] = Field(default=None, exclude=True) # Exclude from serialization, hold runtime ref
     engine: Optional[Any] = Field(default=None, exclude=True) # Access to the NoeticEngine instance
+    idempotency_key: Optional[str] = None # Same on every retry of one flow state (e.g. for an Idempotency-Key header)
     # Add other context like permissions here
 
 class Skill(ABC):
@@ -36,9 +66,47 @@ class Skill(ABC):
         """
         return {}
 
+    @property
+    def resource_tags(self) -> List[str]:
+        """
+        Shared resources this skill holds while running (e.g. "gpu", "fs:/repo").
+        Steps with a common tag never run concurrently.
+        """
+        return []
+
+    @property
+    def cache_policy(self) -> Optional[CachePolicy]:
+        """
+        How the executor may reuse this skill's results. None: never cached.
+        """
+        return None
+
+    @property
+    def execution_policy(self) -> Optional[ExecutionPolicy]:
+        """
+        Concurrency limit, deadline and circuit breaker of this skill.
+        None: the registry's default policy. `SkillRegistry.set_policy` overrides it.
+        """
+        return None
+
     @abstractmethod
     async def execute(self, context: SkillContext, **kwargs) -> SkillResult:
         """
         The uniform entry point.
         """
         pass
+
+    @property
+    def streams(self) -> bool:
+        """
+        True when `execute_stream` is overridden to yield output incrementally.
+        """
+        return type(self).execute_stream is not Skill.execute_stream
+
+    async def execute_stream(self, context: SkillContext, **kwargs) -> AsyncIterator[Union[SkillChunk, SkillResult]]:
+        """
+        Streaming entry point: yields SkillChunks as output is produced, then the
+        SkillResult last. Long-running or large-output skills override it and keep
+        only a bounded summary in the result; the default yields `execute`'s result.
+        """
+        yield await self.execute(context, **kwargs)
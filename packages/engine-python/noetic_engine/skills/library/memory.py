@@ -1,6 +1,6 @@
 import uuid
 from typing import Any, Optional
-from noetic_engine.skills.interfaces import Skill, SkillResult, SkillContext
+from noetic_engine.skills.interfaces import Skill, SkillResult, SkillContext, CachePolicy
 
 class MemorizeSkill(Skill):
     id = "skill.memory.memorize"
@@ -52,6 +52,11 @@ class RecallSkill(Skill):
         "required": ["query"]
     }
 
+    @property
+    def cache_policy(self) -> CachePolicy:
+        # Any ingested fact may change the search results
+        return CachePolicy(ttl=30.0, invalidate_on=["*"])
+
     async def execute(self, context: SkillContext, query: str, limit: int = 5, **kwargs) -> SkillResult:
         if not context.store:
             return SkillResult(success=False, error="KnowledgeStore not available in context.")
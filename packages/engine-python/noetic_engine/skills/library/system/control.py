@@ -1,7 +1,7 @@
 import asyncio
 import time
 from typing import Any, Dict
-from noetic_engine.skills.interfaces import Skill, SkillResult, SkillContext
+from noetic_engine.skills.interfaces import ExecutionPolicy, Skill, SkillResult, SkillContext
 
 class WaitSkill(Skill):
     id = "skill.system.wait"
@@ -14,6 +14,11 @@ class WaitSkill(Skill):
         "required": ["seconds"]
     }
 
+    @property
+    def execution_policy(self) -> ExecutionPolicy:
+        # The wait is as long as asked for, so the engine's default deadline does not apply
+        return ExecutionPolicy()
+
     async def execute(self, context: SkillContext, seconds: float = 1.0, **kwargs) -> SkillResult:
         start = time.monotonic()
         await asyncio.sleep(seconds)
@@ -0,0 +1,288 @@
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .adapter_mcp import McpError, McpSkillAdapter
+from .mcp_transport import McpTransport, HttpMcpTransport, StdioMcpTransport, SseMcpTransport
+from .registry import SkillRegistry
+
+logger = logging.getLogger(__name__)
+
+class McpClient:
+    """
+    JSON-RPC client of one MCP server, over HTTP POST, a stdio subprocess or SSE
+    (see mcp_transport).
+
+    - `discover` registers every tool from `tools/list` into a SkillRegistry. The
+      catalog is cached on disk: a cached catalog is registered immediately and
+      revalidated in the background (If-None-Match / ETag, or by comparing the tool
+      list), so startup does not wait on the network.
+    - Over HTTP, `call_tool` coalesces the calls issued in the same event-loop tick
+      (e.g. the parallel steps of a plan) into one JSON-RPC batch request. Sessions
+      (stdio, SSE) multiplex concurrent calls by id instead.
+    """
+    def __init__(self, server_url: Optional[str] = None, transport: Optional[Any] = None, cache_dir: Optional[str] = None,
+                 catalog_ttl: float = 3600.0, batching: bool = True, connection: Optional[McpTransport] = None):
+        """
+        :param transport: Pooled HttpTransport (e.g. NoeticEngine.http) for the HTTP connection.
+            Without one, each request opens its own connection.
+        :param cache_dir: Directory of the cached tool catalog (no disk cache if None).
+        :param catalog_ttl: Age after which a cached catalog is revalidated at startup.
+        :param connection: McpTransport to use instead of HTTP POST to `server_url`
+            (StdioMcpTransport, SseMcpTransport).
+        """
+        if connection is None:
+            if not server_url:
+                raise ValueError("McpClient needs a server_url or a connection")
+            connection = HttpMcpTransport(server_url, http=transport)
+        self.connection = connection
+        self.server_url = server_url or connection.url
+        self.transport = transport
+        self.cache_dir = cache_dir
+        self.catalog_ttl = catalog_ttl
+        self.batching = batching and connection.batches
+        self._ids = itertools.count(1)
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._flush_scheduled = False
+        # Running flushes: the loop only keeps weak references to tasks
+        self._flush_tasks: Set[asyncio.Task] = set()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.stats = {"requests": 0, "batches": 0, "calls": 0}
+
+    @classmethod
+    def stdio(cls, command: List[str], cache_dir: Optional[str] = None, **kwargs: Any) -> "McpClient":
+        """
+        Client of a local MCP server run as a long-lived subprocess (`command`, no shell).
+        """
+        return cls(cache_dir=cache_dir, connection=StdioMcpTransport(command, **kwargs))
+
+    @classmethod
+    def sse(cls, url: str, transport: Optional[Any] = None, cache_dir: Optional[str] = None, **kwargs: Any) -> "McpClient":
+        """
+        Client of an MCP server streaming responses over Server-Sent Events.
+        """
+        return cls(transport=transport, cache_dir=cache_dir, connection=SseMcpTransport(url, http=transport, **kwargs))
+
+    # --- JSON-RPC ---
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    async def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Sends one request and returns its result (raises McpError on a JSON-RPC error).
+        """
+        message = {"jsonrpc": "2.0", "method": method, "params": params or {}, "id": self.next_id()}
+        self.stats["requests"] += 1
+        return _result_of(await self.connection.request(message))
+
+    async def batch(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """
+        Sends (method, params) calls together (one JSON-RPC batch over HTTP). Returns
+        one item per call, in order: the result, or the McpError of a failed call.
+        """
+        messages = [{"jsonrpc": "2.0", "method": method, "params": params, "id": self.next_id()} for method, params in calls]
+        responses = await self._send_batch(messages)
+        return [_result_or_error(responses.get(m["id"])) for m in messages]
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """
+        `tools/call`; concurrent calls are batched (HTTP) or multiplexed (sessions).
+        """
+        self.stats["calls"] += 1
+        message = {"jsonrpc": "2.0", "method": "tools/call", "params": {"name": name, "arguments": arguments}, "id": self.next_id()}
+        if not self.batching:
+            self.stats["requests"] += 1
+            return _result_of(await self.connection.request(message))
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((message, future))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._start_flush)
+        return await future
+
+    def _start_flush(self):
+        task = asyncio.get_running_loop().create_task(self._flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self):
+        pending, self._pending = self._pending, []
+        self._flush_scheduled = False
+        if not pending:
+            return
+        try:
+            if len(pending) == 1:
+                message, future = pending[0]
+                self.stats["requests"] += 1
+                responses = {message["id"]: await self.connection.request(message)}
+            else:
+                responses = await self._send_batch([message for message, _ in pending])
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for message, future in pending:
+            if future.done():
+                continue
+            outcome = _result_or_error(responses.get(message["id"]))
+            if isinstance(outcome, Exception):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    async def _send_batch(self, messages: List[Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+        self.stats["batches"] += 1
+        self.stats["requests"] += 1 if self.connection.batches else len(messages)
+        return await self.connection.batch(messages)
+
+    # --- Discovery ---
+
+    async def list_tools(self, etag: Optional[str] = None) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+        """
+        Fetches the full tool list (following `nextCursor`). Returns (tools, etag);
+        tools is None when the server confirmed `etag` is still current (HTTP 304).
+        """
+        tools: List[Dict[str, Any]] = []
+        cursor = None
+        new_etag = None
+        while True:
+            params = {"cursor": cursor} if cursor else {}
+            message = {"jsonrpc": "2.0", "method": "tools/list", "params": params, "id": self.next_id()}
+            self.stats["requests"] += 1
+            if cursor is None:
+                response, new_etag = await self.connection.request_if_changed(message, etag)
+                if response is None:
+                    return None, new_etag
+            else:
+                response = await self.connection.request(message)
+            result = _result_of(response) or {}
+            tools.extend(result.get("tools", []))
+            cursor = result.get("nextCursor")
+            if not cursor:
+                return tools, new_etag
+
+    async def discover(self, registry: SkillRegistry, wait: bool = False) -> List[str]:
+        """
+        Registers the server's tools as skills and returns their ids.
+
+        With a cached catalog, its tools are registered right away and the catalog
+        is revalidated in the background when older than `catalog_ttl` (or always,
+        with `wait=True`, before returning). Without one, tools/list is awaited.
+        """
+        cached = self._load_catalog()
+        if cached is None:
+            tools, etag = await self.list_tools()
+            self._save_catalog(tools, etag)
+            return self._register(registry, tools, [])
+
+        skill_ids = self._register(registry, cached["tools"], [])
+        if wait:
+            return await self._revalidate(registry, cached)
+        if time.time() - cached.get("fetched_at", 0) >= self.catalog_ttl:
+            self._refresh_task = asyncio.create_task(self._revalidate(registry, cached))
+        return skill_ids
+
+    async def _revalidate(self, registry: SkillRegistry, cached: Dict[str, Any]) -> List[str]:
+        try:
+            tools, etag = await self.list_tools(etag=cached.get("etag"))
+        except Exception as e:
+            logger.warning(f"MCP catalog revalidation failed for {self.server_url}, keeping cached tools: {e}")
+            return [McpSkillAdapter.skill_id(t["name"]) for t in cached["tools"]]
+
+        if tools is None or _digest(tools) == _digest(cached["tools"]):
+            # Unchanged: only refresh the timestamp
+            self._save_catalog(cached["tools"], etag or cached.get("etag"))
+            return [McpSkillAdapter.skill_id(t["name"]) for t in cached["tools"]]
+
+        logger.info(f"MCP catalog of {self.server_url} changed: {len(cached['tools'])} -> {len(tools)} tools")
+        self._save_catalog(tools, etag)
+        return self._register(registry, tools, cached["tools"])
+
+    def _register(self, registry: SkillRegistry, tools: List[Dict[str, Any]], previous: List[Dict[str, Any]]) -> List[str]:
+        current = {t["name"] for t in tools}
+        for tool in previous:
+            if tool["name"] not in current:
+                registry.unregister(McpSkillAdapter.skill_id(tool["name"]))
+        known = {t["name"]: t for t in previous}
+        skill_ids = []
+        for tool in tools:
+            skill_id = McpSkillAdapter.skill_id(tool["name"])
+            skill_ids.append(skill_id)
+            if known.get(tool["name"]) == tool and registry.get_skill(skill_id) is not None:
+                continue # Unchanged: keep the registry version (and the plans cached on it)
+            registry.register(McpSkillAdapter(
+                self.server_url,
+                tool["name"],
+                tool.get("description", ""),
+                tool.get("inputSchema", {}),
+                client=self
+            ))
+        return skill_ids
+
+    async def close(self):
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+        await self.connection.close()
+
+    # --- Catalog cache ---
+
+    def _catalog_path(self) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        name = hashlib.sha1(self.server_url.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"mcp_catalog_{name}.json")
+
+    def _load_catalog(self) -> Optional[Dict[str, Any]]:
+        path = self._catalog_path()
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                catalog = json.load(f)
+            if catalog.get("server_url") != self.server_url or not isinstance(catalog.get("tools"), list):
+                return None
+            return catalog
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable MCP catalog cache {path}: {e}")
+            return None
+
+    def _save_catalog(self, tools: List[Dict[str, Any]], etag: Optional[str]):
+        path = self._catalog_path()
+        if not path:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        catalog = {"server_url": self.server_url, "etag": etag, "fetched_at": time.time(), "tools": tools}
+        # Write then rename, so a crash never leaves a truncated catalog
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(catalog, f)
+        os.replace(tmp, path)
+
+def _digest(tools: List[Dict[str, Any]]) -> str:
+    return hashlib.sha1(json.dumps(tools, sort_keys=True).encode("utf-8")).hexdigest()
+
+def _result_of(response: Dict[str, Any]) -> Any:
+    if "error" in response:
+        raise McpError(response["error"])
+    return response.get("result")
+
+def _result_or_error(response: Optional[Dict[str, Any]]) -> Any:
+    if response is None:
+        return McpError({"message": "No response to request in batch"})
+    if "error" in response:
+        return McpError(response["error"])
+    return response.get("result")
@@ -0,0 +1,406 @@
+import asyncio
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+from .adapter_mcp import McpError
+
+logger = logging.getLogger(__name__)
+
+# Try importing httpx for async HTTP
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+PROTOCOL_VERSION = "2024-11-05"
+CLIENT_INFO = {"name": "noetic-engine", "version": "0.1.0"}
+
+class McpTransport(ABC):
+    """
+    Carries JSON-RPC messages between an McpClient and one MCP server.
+
+    The client numbers its requests; a transport delivers each request and returns
+    the response with the same id. `batches` tells the client whether concurrent
+    calls should be packed into JSON-RPC batch requests (HTTP) or can simply be sent
+    concurrently over the session (stdio, SSE).
+    """
+    url: str = ""
+    batches: bool = False
+
+    @abstractmethod
+    async def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sends a request and returns its response.
+        """
+        pass
+
+    async def request_if_changed(self, message: Dict[str, Any], etag: Optional[str]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Sends a request that the server may answer with "not modified" for `etag`.
+        Returns (response or None if not modified, new etag). Only HTTP supports it.
+        """
+        return await self.request(message), None
+
+    async def batch(self, messages: List[Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+        """
+        Sends several requests and returns their responses by id.
+        """
+        responses = await asyncio.gather(*(self.request(m) for m in messages), return_exceptions=True)
+        result = {}
+        for message, response in zip(messages, responses):
+            if isinstance(response, BaseException):
+                result[message["id"]] = {"jsonrpc": "2.0", "id": message["id"], "error": {"code": -32603, "message": str(response)}}
+            elif response is not None:
+                result[message["id"]] = response
+        return result
+
+    async def close(self):
+        pass
+
+class HttpMcpTransport(McpTransport):
+    """
+    Stateless JSON-RPC over HTTP POST, one request (or batch) per POST, through a
+    pooled HttpTransport when one is given.
+    """
+    batches = True
+
+    def __init__(self, url: str, http: Optional[Any] = None, timeout: float = 30.0):
+        self.url = url
+        self.http = http
+        self.timeout = timeout
+
+    async def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        body, _ = await self._post(message)
+        return body
+
+    async def request_if_changed(self, message: Dict[str, Any], etag: Optional[str]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        return await self._post(message, {"If-None-Match": etag} if etag else None)
+
+    async def batch(self, messages: List[Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+        body, _ = await self._post(messages)
+        if isinstance(body, dict):
+            if "error" in body and body.get("id") is None:
+                # Servers without batch support answer with a single error object
+                raise McpError(body["error"])
+            body = [body]
+        return {response.get("id"): response for response in body or [] if isinstance(response, dict)}
+
+    async def _post(self, payload: Any, headers: Optional[Dict[str, str]] = None) -> Tuple[Any, Optional[str]]:
+        """
+        POSTs a message (or batch). Returns (decoded body, ETag); the body is None on 304.
+        """
+        if httpx is None:
+            raise RuntimeError("MCP client requires 'httpx' library.")
+        if self.http is not None:
+            resp = await self.http.post(self.url, json=payload, headers=headers, timeout=self.timeout)
+        else:
+            async with httpx.AsyncClient() as client:
+                resp = await client.post(self.url, json=payload, headers=headers, timeout=self.timeout)
+        etag = resp.headers.get("ETag")
+        if resp.status_code == 304:
+            return None, etag or (headers or {}).get("If-None-Match")
+        resp.raise_for_status()
+        return resp.json(), etag
+
+class _Session(McpTransport):
+    """
+    A long-lived MCP session: requests are multiplexed by id over one connection,
+    at most `max_in_flight` at a time (backpressure). The session is opened (with
+    the initialize handshake) on first use and reopened after it drops, waiting
+    `reconnect_delay` (doubling up to `max_reconnect_delay`) between attempts.
+    Requests in flight when it drops fail with ConnectionError: a tool call may
+    already have run, so it is not replayed.
+    """
+    def __init__(self, max_in_flight: int = 64, timeout: float = 60.0,
+                 reconnect_delay: float = 0.1, max_reconnect_delay: float = 5.0):
+        self.timeout = timeout
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._delay = 0.0
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._pending: Dict[Any, asyncio.Future] = {}
+        self._open_lock = asyncio.Lock()
+        self._ready = False # Open and initialized
+        self._closed = False
+        self._handshake_ids = 0
+        self.server_info: Dict[str, Any] = {}
+        self.connects = 0
+
+    async def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        async with self._slots:
+            await self._ensure_open()
+            return await self._roundtrip(message)
+
+    async def _roundtrip(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message["id"]] = future
+        try:
+            await self._write(message)
+            return await asyncio.wait_for(future, self.timeout)
+        finally:
+            self._pending.pop(message["id"], None)
+
+    async def _ensure_open(self):
+        if self._ready:
+            return
+        async with self._open_lock:
+            if self._ready:
+                return
+            if self._closed:
+                raise ConnectionError(f"MCP session {self.url} is closed")
+            if self._delay:
+                await asyncio.sleep(self._delay)
+            try:
+                await self._open()
+                await self._initialize()
+            except Exception:
+                self._delay = min(max(self._delay * 2, self.reconnect_delay), self.max_reconnect_delay)
+                await self._drop(ConnectionError(f"Could not open MCP session {self.url}"))
+                raise
+            self._delay = 0.0
+            self._ready = True
+            self.connects += 1
+
+    async def _initialize(self):
+        self._handshake_ids += 1
+        response = await self._roundtrip({
+            "jsonrpc": "2.0",
+            "id": f"init-{self._handshake_ids}", # Never collides with the client's integer ids
+            "method": "initialize",
+            "params": {"protocolVersion": PROTOCOL_VERSION, "capabilities": {}, "clientInfo": CLIENT_INFO}
+        })
+        if "error" in response:
+            raise ConnectionError(f"MCP initialize failed: {response['error'].get('message')}")
+        self.server_info = response.get("result", {}).get("serverInfo", {})
+        await self._write({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+    async def _dispatch(self, message: Any):
+        """
+        Routes one incoming message: responses to their waiting request, server
+        requests (ping) answered, notifications ignored.
+        """
+        if isinstance(message, list):
+            for item in message:
+                await self._dispatch(item)
+            return
+        if not isinstance(message, dict):
+            return
+        if "method" in message:
+            if "id" in message:
+                if message["method"] == "ping":
+                    reply = {"jsonrpc": "2.0", "id": message["id"], "result": {}}
+                else:
+                    reply = {"jsonrpc": "2.0", "id": message["id"], "error": {"code": -32601, "message": "Method not found"}}
+                try:
+                    await self._write(reply)
+                except Exception as e:
+                    logger.debug(f"Could not answer MCP server request: {e}")
+            else:
+                logger.debug(f"MCP notification from {self.url}: {message['method']}")
+            return
+        future = self._pending.get(message.get("id"))
+        if future is not None and not future.done():
+            future.set_result(message)
+
+    async def _drop(self, error: Exception):
+        """
+        Marks the session as disconnected and fails the requests in flight.
+        """
+        self._ready = False
+        for future in list(self._pending.values()):
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+        await self._disconnect()
+
+    async def close(self):
+        self._closed = True
+        await self._drop(ConnectionError(f"MCP session {self.url} closed"))
+
+    @abstractmethod
+    async def _open(self):
+        pass
+
+    @abstractmethod
+    async def _write(self, message: Dict[str, Any]):
+        pass
+
+    @abstractmethod
+    async def _disconnect(self):
+        pass
+
+class StdioMcpTransport(_Session):
+    """
+    A local MCP server run as a long-lived subprocess, speaking newline-delimited
+    JSON-RPC on stdin/stdout (no shell, no network). A server that exits is
+    restarted on the next request.
+    """
+    def __init__(self, command: List[str], env: Optional[Dict[str, str]] = None, cwd: Optional[str] = None,
+                 line_limit: int = 16 * 1024 * 1024, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.command = list(command)
+        self.env = env
+        self.cwd = cwd
+        self.line_limit = line_limit
+        self.url = "stdio:" + " ".join(self.command)
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def _open(self):
+        env = {**os.environ, **self.env} if self.env else None
+        self._process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+            cwd=self.cwd,
+            limit=self.line_limit
+        )
+        self._tasks = [
+            asyncio.create_task(self._read_stdout(self._process)),
+            asyncio.create_task(self._read_stderr(self._process)),
+        ]
+
+    async def _write(self, message: Dict[str, Any]):
+        process = self._process
+        if process is None or process.stdin is None or process.returncode is not None:
+            raise ConnectionError(f"MCP server {self.url} is not running")
+        process.stdin.write(json.dumps(message).encode("utf-8") + b"\n")
+        # Waits while the pipe is full: a slow server slows its callers down
+        await process.stdin.drain()
+
+    async def _read_stdout(self, process: asyncio.subprocess.Process):
+        try:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    logger.debug(f"Ignoring non-JSON output of {self.url}: {line[:200]!r}")
+                    continue
+                await self._dispatch(message)
+        except Exception as e:
+            logger.warning(f"MCP stdio session {self.url} failed: {e}")
+        if self._process is process:
+            logger.info(f"MCP server {self.url} exited")
+            await self._drop(ConnectionError(f"MCP server {self.url} exited"))
+
+    async def _read_stderr(self, process: asyncio.subprocess.Process):
+        while True:
+            line = await process.stderr.readline()
+            if not line:
+                return
+            logger.debug(f"[{self.url}] {line.decode('utf-8', 'replace').rstrip()}")
+
+    async def _disconnect(self):
+        process, self._process = self._process, None
+        current = asyncio.current_task()
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            if task is not current:
+                task.cancel()
+        if process is not None and process.returncode is None:
+            try:
+                process.stdin.close()
+                await asyncio.wait_for(process.wait(), 2.0)
+            except Exception:
+                process.kill()
+                await process.wait()
+
+class SseMcpTransport(_Session):
+    """
+    An MCP server over HTTP + Server-Sent Events: responses stream back on a
+    long-lived GET, requests are POSTed to the endpoint the stream announces.
+    A dropped stream is reopened on the next request.
+    """
+    def __init__(self, url: str, http: Optional[Any] = None, connect_timeout: float = 10.0, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.url = url
+        self.http = http
+        self.connect_timeout = connect_timeout
+        self._client = None
+        self._owns_client = False
+        self._endpoint: Optional[str] = None
+        self._reader: Optional[asyncio.Task] = None
+
+    async def _open(self):
+        if httpx is None:
+            raise RuntimeError("MCP client requires 'httpx' library.")
+        if self.http is not None:
+            self._client = self.http.client_for(self.url)
+        else:
+            self._client = httpx.AsyncClient()
+            self._owns_client = True
+        endpoint = asyncio.get_running_loop().create_future()
+        self._reader = asyncio.create_task(self._read_stream(endpoint))
+        self._endpoint = await asyncio.wait_for(endpoint, self.connect_timeout)
+
+    async def _read_stream(self, endpoint: asyncio.Future):
+        error: Exception = ConnectionError(f"MCP SSE stream {self.url} closed")
+        try:
+            timeout = httpx.Timeout(self.connect_timeout, read=None)
+            async with self._client.stream("GET", self.url, headers={"Accept": "text/event-stream"}, timeout=timeout) as resp:
+                resp.raise_for_status()
+                event, data = "message", []
+                async for line in resp.aiter_lines():
+                    if line == "":
+                        if data:
+                            await self._on_event(event, "\n".join(data), endpoint)
+                        event, data = "message", []
+                    elif line.startswith(":"):
+                        continue # Comment / keep-alive
+                    else:
+                        field, _, value = line.partition(":")
+                        value = value[1:] if value.startswith(" ") else value
+                        if field == "event":
+                            event = value
+                        elif field == "data":
+                            data.append(value)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = ConnectionError(f"MCP SSE stream {self.url} failed: {e}")
+        if not endpoint.done():
+            endpoint.set_exception(error)
+        if self._reader is asyncio.current_task():
+            await self._drop(error)
+
+    async def _on_event(self, event: str, data: str, endpoint: asyncio.Future):
+        if event == "endpoint":
+            if not endpoint.done():
+                endpoint.set_result(urljoin(self.url, data.strip()))
+            return
+        if event == "message":
+            try:
+                await self._dispatch(json.loads(data))
+            except ValueError:
+                logger.debug(f"Ignoring non-JSON SSE message from {self.url}")
+
+    async def _write(self, message: Dict[str, Any]):
+        if not self._endpoint or self._client is None:
+            raise ConnectionError(f"MCP SSE session {self.url} is not open")
+        resp = await self._client.post(self._endpoint, json=message, timeout=self.timeout)
+        resp.raise_for_status()
+
+    async def _disconnect(self):
+        reader, self._reader = self._reader, None
+        if reader is not None and reader is not asyncio.current_task():
+            reader.cancel()
+            try:
+                await reader
+            except (asyncio.CancelledError, Exception):
+                pass
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+        self._client = None
+        self._owns_client = False
+        self._endpoint = None
@@ -0,0 +1,232 @@
+import asyncio
+import bisect
+import logging
+import time
+from collections import Counter, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from .interfaces import ExecutionPolicy, Skill, SkillContext, SkillResult
+
+logger = logging.getLogger(__name__)
+
+# (skill, context, params) -> result: the innermost call (plain execute, the result cache, a stream)
+Runner = Callable[[Skill, SkillContext, Dict[str, Any]], Awaitable[SkillResult]]
+
+# Upper bounds (ms) of the latency histogram buckets; the last one catches the rest
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000, float("inf")]
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class LatencyHistogram:
+    """
+    Counts of call latencies in fixed buckets (LATENCY_BUCKETS_MS).
+    """
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS_MS)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, latency_ms: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self.total += 1
+        self.sum_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Upper bound of the bucket holding the q-th percentile (0-100), capped by the max seen.
+        """
+        if not self.total:
+            return None
+        rank = q / 100.0 * self.total
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.total,
+            "mean_ms": self.sum_ms / self.total if self.total else None,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_ms,
+            "buckets": {("inf" if bound == float("inf") else bound): count for bound, count in zip(LATENCY_BUCKETS_MS, self.counts) if count}
+        }
+
+class CircuitBreaker:
+    """
+    Opens when the error rate of the last `window` calls reaches `failure_rate`
+    (once `min_calls` were seen). After `cooldown` seconds one trial call is let
+    through (half-open): its success closes the breaker, its failure reopens it.
+    """
+    def __init__(self, failure_rate: float, window: int = 20, min_calls: int = 5, cooldown: float = 30.0):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._trial = False
+
+    def allow(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self._trial:
+            self._trial = True
+            return True
+        return False
+
+    def record(self, success: bool):
+        if self.state == HALF_OPEN:
+            self._trial = False
+            if success:
+                self.state = CLOSED
+                self._outcomes.clear()
+            else:
+                self._open()
+            return
+        self._outcomes.append(success)
+        failures = self._outcomes.count(False)
+        if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate:
+            self._open()
+
+    def release(self):
+        # A trial call was cancelled: let the next call try instead
+        self._trial = False
+
+    def _open(self):
+        if self.state != OPEN:
+            logger.warning(f"Circuit breaker opened ({self._outcomes.count(False)}/{len(self._outcomes)} recent calls failed)")
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+
+class _SkillState:
+    def __init__(self, policy: ExecutionPolicy):
+        self.policy = policy
+        self.semaphore = asyncio.Semaphore(policy.max_concurrency) if policy.max_concurrency else None
+        self.breaker = CircuitBreaker(policy.failure_rate, policy.window, policy.min_calls, policy.cooldown) if policy.failure_rate is not None else None
+        self.latency = LatencyHistogram()
+        self.errors: Counter = Counter()
+        self.calls = 0
+        self.rejected = 0
+        self.fallbacks = 0
+
+class SkillMiddleware:
+    """
+    Execution layer around `Skill.execute`, owned by the SkillRegistry: per-skill
+    concurrency limits, deadlines and circuit breakers (ExecutionPolicy), with
+    latency and error histograms per skill.
+
+    - A call waits for one of the skill's `max_concurrency` slots.
+    - Past `timeout` (slot wait included) the call is cancelled and a failed
+      SkillResult is returned.
+    - While the breaker is open, calls are rejected without running: the
+      `fallback` skill answers instead, or a failed SkillResult is returned.
+    - Exceptions raised by the skill count as errors and are re-raised.
+    - `SkillResult.latency_ms` is set to the measured latency when the skill left it at 0.
+    """
+    def __init__(self, registry: Any):
+        self.registry = registry
+        self._states: Dict[str, _SkillState] = {}
+
+    async def execute(self, skill: Skill, context: SkillContext, params: Dict[str, Any], run: Optional[Runner] = None, allow_fallback: bool = True) -> SkillResult:
+        run = run or _execute
+        policy = self.registry.policy_for(skill)
+        state = self._state(skill.id, policy)
+        breaker = state.breaker
+
+        if breaker is not None and not breaker.allow():
+            state.rejected += 1
+            state.errors["rejected"] += 1
+            return await self._fallback(skill, policy, state, context, params, run, allow_fallback)
+
+        state.calls += 1
+        start = time.monotonic()
+        recorded = False
+        try:
+            try:
+                result = await asyncio.wait_for(self._run(state, run, skill, context, params), policy.timeout)
+                if getattr(result, "success", True) is not True:
+                    state.errors["failure"] += 1
+            except asyncio.TimeoutError:
+                state.errors["timeout"] += 1
+                result = SkillResult(success=False, error=f"Skill {skill.id} timed out after {policy.timeout}s")
+            except Exception as e:
+                state.errors[type(e).__name__] += 1
+                if breaker is not None:
+                    breaker.record(False)
+                    recorded = True
+                raise
+
+            latency_ms = (time.monotonic() - start) * 1000
+            state.latency.record(latency_ms)
+            if isinstance(result, SkillResult) and not result.latency_ms:
+                result.latency_ms = int(latency_ms)
+            if breaker is not None:
+                breaker.record(getattr(result, "success", True) is True)
+                recorded = True
+            return result
+        finally:
+            if breaker is not None and not recorded:
+                breaker.release()
+
+    def stats(self, skill_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Calls, rejections, errors by kind, breaker state and latency histogram of a skill.
+        """
+        state = self._states.get(skill_id)
+        if state is None:
+            return None
+        return {
+            "calls": state.calls,
+            "rejected": state.rejected,
+            "fallbacks": state.fallbacks,
+            "errors": dict(state.errors),
+            "breaker": state.breaker.state if state.breaker else None,
+            "latency": state.latency.to_dict()
+        }
+
+    def reset(self, skill_id: str):
+        self._states.pop(skill_id, None)
+
+    async def _run(self, state: _SkillState, run: Runner, skill: Skill, context: SkillContext, params: Dict[str, Any]) -> SkillResult:
+        if state.semaphore is None:
+            return await run(skill, context, params)
+        async with state.semaphore:
+            return await run(skill, context, params)
+
+    async def _fallback(self, skill: Skill, policy: ExecutionPolicy, state: _SkillState, context: SkillContext, params: Dict[str, Any], run: Runner, allow_fallback: bool) -> SkillResult:
+        fallback = self.registry.get_skill(policy.fallback) if policy.fallback and allow_fallback else None
+        if fallback is None or fallback is skill:
+            return SkillResult(success=False, error=f"Circuit open for skill {skill.id}")
+        state.fallbacks += 1
+        logger.info(f"Circuit open for {skill.id}, falling back to {fallback.id}")
+        # One level only: a fallback's own fallback is not followed
+        result = await self.execute(fallback, context, params, run, allow_fallback=False)
+        if isinstance(result, SkillResult):
+            result.metadata["fallback_for"] = skill.id
+        return result
+
+    def _state(self, skill_id: str, policy: ExecutionPolicy) -> _SkillState:
+        state = self._states.get(skill_id)
+        if state is None or state.policy != policy:
+            # New skill, or its policy changed: start over with the new limits
+            previous = state
+            state = _SkillState(policy)
+            if previous is not None:
+                state.latency, state.errors = previous.latency, previous.errors
+                state.calls, state.rejected, state.fallbacks = previous.calls, previous.rejected, previous.fallbacks
+            self._states[skill_id] = state
+        return state
+
+async def _execute(skill: Skill, context: SkillContext, params: Dict[str, Any]) -> SkillResult:
+    return await skill.execute(context, **params)
@@ -1,18 +1,69 @@
+import asyncio
+import logging
 from typing import Dict, Optional, List, Any
-from .interfaces import Skill
+from .interfaces import Skill, SkillContext, SkillResult, ExecutionPolicy
+from .middleware import SkillMiddleware, Runner
+from .inputs import InputEvent, InputQueue, InputSkill
+
+logger = logging.getLogger(__name__)
 
 class SkillRegistry:
-    def __init__(self):
+    def __init__(self, default_policy: Optional[ExecutionPolicy] = None):
         self._skills: Dict[str, Skill] = {}
+        # Bumped on every change so caches derived from the registry can detect staleness
+        self.version = 0
+        # Concurrency limits, deadlines and circuit breakers around every execution
+        self.default_policy = default_policy or ExecutionPolicy()
+        self._policies: Dict[str, ExecutionPolicy] = {}
+        self.middleware = SkillMiddleware(self)
+        # Events pushed by input skills (and other producers), drained by poll_inputs
+        self.inputs = InputQueue()
+        self._producers: Dict[str, asyncio.Task] = {}
 
     def register(self, skill: Skill):
         if skill.id in self._skills:
             # Warning: Overwriting skill
-            pass
+            self._stop_producer(skill.id)
         self._skills[skill.id] = skill
+        self.version += 1
+        if isinstance(skill, InputSkill):
+            skill.source = self.inputs.source(skill.id, skill.max_pending, skill.coalesce_types)
+
+    def unregister(self, skill_id: str):
+        skill = self._skills.pop(skill_id, None)
+        if skill is not None:
+            self.version += 1
+            if isinstance(skill, InputSkill):
+                self._stop_producer(skill_id)
+                self.inputs.remove(skill_id)
 
     def get_skill(self, skill_id: str) -> Optional[Skill]:
         return self._skills.get(skill_id)
+
+    def set_policy(self, skill_id: str, policy: Optional[ExecutionPolicy]):
+        """
+        Overrides the execution policy of a skill (None restores the skill's own).
+        """
+        if policy is None:
+            self._policies.pop(skill_id, None)
+        else:
+            self._policies[skill_id] = policy
+
+    def policy_for(self, skill: Skill) -> ExecutionPolicy:
+        policy = self._policies.get(skill.id)
+        if policy is None:
+            policy = getattr(skill, "execution_policy", None)
+        return policy if isinstance(policy, ExecutionPolicy) else self.default_policy
+
+    async def execute(self, skill: Skill, context: SkillContext, params: Dict[str, Any], run: Optional[Runner] = None) -> SkillResult:
+        """
+        Executes a skill through the middleware (see SkillMiddleware). `run` is the
+        innermost call, `skill.execute` by default.
+        """
+        return await self.middleware.execute(skill, context, params, run)
+
+    def stats(self, skill_id: str) -> Optional[Dict[str, Any]]:
+        return self.middleware.stats(skill_id)
         
     def get_all_skills(self) -> List[Skill]:
         return list(self._skills.values())
@@ -27,9 +78,44 @@ class SkillRegistry:
         
         return skill_id in agent.allowed_skills
 
-    def poll_inputs(self) -> List[Any]:
+    def poll_inputs(self) -> List[InputEvent]:
+        """
+        Drains the input events (e.g. key presses, sensor data) pushed since the last
+        poll, in arrival order. Starts the producers of input skills on first use.
+        """
+        self._start_producers()
+        return self.inputs.drain()
+
+    async def stop_inputs(self):
         """
-        Polls active I/O skills for raw input events (e.g. key presses, sensor data).
+        Cancels the producer tasks of input skills.
         """
-        # TODO: Iterate over IO skills and collect events
-        return []
\ No newline at end of file
+        tasks = list(self._producers.values())
+        self._producers.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _start_producers(self):
+        missing = [s for s in self._skills.values() if isinstance(s, InputSkill) and s.id not in self._producers]
+        if not missing:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return # Polled outside the event loop: producers start on the next poll inside it
+        for skill in missing:
+            self._producers[skill.id] = loop.create_task(self._produce(skill))
+
+    async def _produce(self, skill: InputSkill):
+        try:
+            await skill.produce(skill.source)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Input skill {skill.id} stopped producing: {e}")
+
+    def _stop_producer(self, skill_id: str):
+        task = self._producers.pop(skill_id, None)
+        if task is not None:
+            task.cancel()
\ No newline at end of file
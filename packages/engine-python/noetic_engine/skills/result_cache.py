@@ -0,0 +1,187 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .interfaces import CachePolicy, Skill, SkillContext, SkillResult
+
+logger = logging.getLogger(__name__)
+
+# Invalidate on any ingested fact
+ANY_PREDICATE = "*"
+
+class _Entry:
+    __slots__ = ("skill", "result", "size", "stored_at", "expires_at", "predicates")
+
+    def __init__(self, skill: Skill, result: SkillResult, size: int, expires_at: Optional[float], predicates: List[str]):
+        self.skill = skill
+        self.result = result
+        self.size = size
+        self.stored_at = time.monotonic()
+        self.expires_at = expires_at
+        self.predicates = predicates
+
+class SkillResultCache:
+    """
+    Results of skills that declare a CachePolicy, keyed by skill id and canonical
+    (sorted-key JSON) arguments.
+
+    - Entries are evicted least-recently-used beyond `max_entries` or `max_bytes`
+      (size of the JSON-encoded result data), and expire after the policy's `ttl`.
+    - Ingesting a fact whose predicate a policy lists in `invalidate_on` drops that
+      skill's results (`on_fact` is registered with KnowledgeStore.add_fact_listener).
+    - Concurrent calls with the same key share one execution. A failed result is
+      handed to every caller, but never as a cache hit.
+    - Only successful results are stored. Returned results carry
+      `metadata["cache_hit"]`.
+    """
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._by_predicate: Dict[str, Set[Tuple[str, str]]] = {}
+        # key -> (future of the running execution, its invalidating predicates)
+        self._inflight: Dict[Tuple[str, str], Tuple[asyncio.Future, List[str]]] = {}
+        # In-flight keys invalidated while running: their result is not stored
+        self._stale: Set[Tuple[str, str]] = set()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0, "invalidations": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def run(self, skill: Skill, context: SkillContext, params: Dict[str, Any]) -> SkillResult:
+        """
+        Executes the skill, or answers from the cache when its policy allows.
+        """
+        policy = getattr(skill, "cache_policy", None)
+        if not isinstance(policy, CachePolicy) or not (policy.pure or policy.ttl is not None):
+            return await skill.execute(context, **params)
+        key = self.key_for(skill.id, params)
+        if key is None:
+            # Arguments without a canonical form are never cached
+            return await skill.execute(context, **params)
+
+        entry = self._lookup(key, skill)
+        if entry is not None:
+            self.stats["hits"] += 1
+            return _copy(entry.result, cache_hit=True, cache_age_ms=int((time.monotonic() - entry.stored_at) * 1000))
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            result = await asyncio.shield(inflight[0])
+            # None: the running execution was cancelled or raised, run our own
+            if result is None:
+                return await self.run(skill, context, params)
+            self.stats["coalesced"] += 1
+            if not result.success:
+                # A failure is shared, not served from the cache
+                return _copy(result, cache_hit=False)
+            return _copy(result, cache_hit=True, cache_age_ms=0)
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = (future, policy.invalidate_on)
+        shared = None
+        try:
+            result = await skill.execute(context, **params)
+            if isinstance(result, SkillResult):
+                shared = result.model_copy(deep=True)
+                if result.success and key not in self._stale:
+                    self._store(key, skill, shared, policy)
+                result.metadata["cache_hit"] = False
+            return result
+        finally:
+            self._inflight.pop(key, None)
+            self._stale.discard(key)
+            future.set_result(shared)
+
+    def key_for(self, skill_id: str, params: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        try:
+            return skill_id, json.dumps(params, sort_keys=True, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return None
+
+    def on_fact(self, fact: Any):
+        """
+        KnowledgeStore fact listener.
+        """
+        self.invalidate_predicate(fact.predicate)
+
+    def invalidate_predicate(self, predicate: str) -> int:
+        """
+        Drops the results invalidated by a fact with this predicate. Returns how many.
+        """
+        keys = self._by_predicate.get(predicate, set()) | self._by_predicate.get(ANY_PREDICATE, set())
+        for key in list(keys):
+            self._remove(key)
+        for key, (_, predicates) in self._inflight.items():
+            if predicate in predicates or ANY_PREDICATE in predicates:
+                self._stale.add(key)
+        self.stats["invalidations"] += len(keys)
+        return len(keys)
+
+    def invalidate_skill(self, skill_id: str) -> int:
+        keys = [key for key in self._entries if key[0] == skill_id]
+        for key in keys:
+            self._remove(key)
+        self.stats["invalidations"] += len(keys)
+        return len(keys)
+
+    def clear(self):
+        self._entries.clear()
+        self._by_predicate.clear()
+        self._stale.update(self._inflight)
+        self.size_bytes = 0
+
+    def _lookup(self, key: Tuple[str, str], skill: Skill) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.skill is not skill or (entry.expires_at is not None and time.monotonic() >= entry.expires_at):
+            # Expired, or the skill was re-registered with a new implementation
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: Tuple[str, str], skill: Skill, result: SkillResult, policy: CachePolicy):
+        size = _size_of(result)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires_at = time.monotonic() + policy.ttl if policy.ttl is not None else None
+        self._entries[key] = _Entry(skill, result, size, expires_at, list(policy.invalidate_on))
+        self.size_bytes += size
+        for predicate in policy.invalidate_on:
+            self._by_predicate.setdefault(predicate, set()).add(key)
+        while self._entries and (len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+            self.stats["evictions"] += 1
+
+    def _remove(self, key: Tuple[str, str]):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size_bytes -= entry.size
+        for predicate in entry.predicates:
+            keys = self._by_predicate.get(predicate)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_predicate[predicate]
+
+def _copy(result: SkillResult, **metadata: Any) -> SkillResult:
+    # Callers may mutate what they get back; the cached result stays untouched
+    copy = result.model_copy(deep=True)
+    copy.metadata.update(metadata)
+    return copy
+
+def _size_of(result: SkillResult) -> int:
+    try:
+        return len(json.dumps(result.data, default=str))
+    except (TypeError, ValueError):
+        return 0
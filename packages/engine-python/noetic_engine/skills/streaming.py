@@ -0,0 +1,96 @@
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional
+
+from .interfaces import Skill, SkillChunk, SkillContext, SkillResult
+
+logger = logging.getLogger(__name__)
+
+class StreamSink(ABC):
+    """
+    Receives the chunks of a streaming skill as they arrive.
+    """
+    @abstractmethod
+    def on_chunk(self, skill_id: str, seq: int, chunk: SkillChunk):
+        pass
+
+    def on_result(self, skill_id: str, result: SkillResult):
+        pass
+
+class MemoryStackSink(StreamSink):
+    """
+    Appends each chunk to the current frame of a MemoryStack as a log entry,
+    keeping the frame's last `max_logs` entries (None: all of them).
+    """
+    def __init__(self, stack: Any, max_logs: Optional[int] = None):
+        self.stack = stack
+        self.max_logs = max_logs
+
+    def on_chunk(self, skill_id: str, seq: int, chunk: SkillChunk):
+        self.stack.add_log(_text(chunk.data), metadata={"skill_id": skill_id, "stream": chunk.stream, "seq": seq})
+        frame = self.stack.current_frame
+        if self.max_logs is not None and frame is not None and len(frame.logs) > self.max_logs:
+            del frame.logs[:len(frame.logs) - self.max_logs]
+
+class UiStreamSink(StreamSink):
+    """
+    Mirrors the live output of each skill into the Reflex local state, under
+    `/ui/local/<key>/<skill id>`, keeping its last `max_chars` characters.
+    """
+    def __init__(self, manager: Any, key: str = "streams", max_chars: int = 64 * 1024):
+        self.manager = manager
+        self.key = key
+        self.max_chars = max_chars
+
+    def on_chunk(self, skill_id: str, seq: int, chunk: SkillChunk):
+        streams = self.manager.local_state.setdefault(self.key, {})
+        entry = streams.setdefault(skill_id, {"output": "", "done": False})
+        if seq == 0:
+            entry.update(output="", done=False)
+        entry["output"] = (entry["output"] + _text(chunk.data))[-self.max_chars:]
+
+    def on_result(self, skill_id: str, result: SkillResult):
+        streams = self.manager.local_state.setdefault(self.key, {})
+        entry = streams.setdefault(skill_id, {"output": ""})
+        entry.update(done=True, success=result.success)
+
+async def run_stream(skill: Skill, context: SkillContext, params: Dict[str, Any], sinks: Optional[List[StreamSink]] = None) -> SkillResult:
+    """
+    Drives a skill's `execute_stream`, handing every chunk to the sinks as it
+    arrives, and returns the final result. Chunks are not kept: only the sinks
+    see them, so memory stays bounded by what each sink retains.
+    """
+    sinks = sinks or []
+    result: Optional[SkillResult] = None
+    seq = 0
+    async for item in skill.execute_stream(context, **params):
+        if isinstance(item, SkillChunk):
+            for sink in sinks:
+                try:
+                    sink.on_chunk(skill.id, seq, item)
+                except Exception as e:
+                    logger.error(f"Stream sink failed on {skill.id}: {e}")
+            seq += 1
+        else:
+            result = item
+    if result is None:
+        result = SkillResult(success=False, error=f"Skill {skill.id} ended its stream without a result")
+    result.metadata["chunks"] = seq
+    for sink in sinks:
+        try:
+            sink.on_result(skill.id, result)
+        except Exception as e:
+            logger.error(f"Stream sink failed on {skill.id}: {e}")
+    return result
+
+def runner_for(skill: Skill, sinks: Optional[List[StreamSink]] = None, result_cache: Optional[Any] = None) -> Optional[Callable]:
+    """
+    The innermost call of a skill under the registry's middleware: streaming skills
+    stream to the sinks, others go through the result cache (None: executed directly).
+    """
+    if getattr(skill, "streams", False) is True:
+        return lambda streaming, context, params: run_stream(streaming, context, params, sinks)
+    return result_cache.run if result_cache is not None else None
+
+def _text(data: Any) -> str:
+    return data if isinstance(data, str) else str(data)
@@ -0,0 +1,127 @@
+import time
+import pytest
+from unittest.mock import MagicMock
+from noetic_engine.cognition.planner import Planner
+from noetic_engine.cognition.plan_cache import PlanCache
+from noetic_engine.skills import SkillRegistry, Skill, SkillResult
+from noetic_lang.core import AgentDefinition, Goal, Plan, PlanStep
+from noetic_conscience import Principle
+
+class MockSkill(Skill):
+    def __init__(self, id, pre, post):
+        self.id = id
+        self._pre = pre
+        self._post = post
+        
+    @property
+    def preconditions(self):
+        return self._pre
+        
+    @property
+    def postconditions(self):
+        return self._post
+        
+    async def execute(self, context, **kwargs):
+        return SkillResult(success=True)
+
+def make_planner():
+    registry = SkillRegistry()
+    registry.register(MockSkill("skill.make_b", {"has_A": "True"}, {"has_B": "True"}))
+    registry.register(MockSkill("skill.make_c", {"has_B": "True"}, {"has_C": "True"}))
+    planner = Planner(registry)
+    agent = AgentDefinition(
+        id="test_agent",
+        system_prompt="",
+        allowed_skills=["skill.make_b", "skill.make_c"],
+        principles=[]
+    )
+    goal = Goal(description="Get C", target_state={"has_C": "True"})
+    return registry, planner, agent, goal
+
+@pytest.mark.asyncio
+async def test_identical_situations_hit_the_cache():
+    registry, planner, agent, goal = make_planner()
+    planner._search = MagicMock(wraps=planner._search)
+    
+    planner._extract_state = MagicMock(return_value={"has_A": "True", "clock": "1"})
+    first = await planner.generate_plan(agent, goal, None)
+    # Only irrelevant facts changed -> same plan, no search
+    planner._extract_state = MagicMock(return_value={"has_A": "True", "clock": "2"})
+    second = await planner.generate_plan(agent, goal, None)
+    
+    assert [s.skill_id for s in second.steps] == [s.skill_id for s in first.steps]
+    assert planner._search.call_count == 1
+    assert planner.cache.stats()["hits"] == 1
+    assert planner.cache.hit_rate == 0.5
+    
+    # Relevant facts changed -> new search
+    planner._extract_state = MagicMock(return_value={"has_B": "True"})
+    third = await planner.generate_plan(agent, goal, None)
+    assert [s.skill_id for s in third.steps] == ["skill.make_c"]
+    assert planner._search.call_count == 2
+
+@pytest.mark.asyncio
+async def test_registry_and_principle_changes_invalidate():
+    registry, planner, agent, goal = make_planner()
+    planner._extract_state = MagicMock(return_value={"has_A": "True"})
+    
+    await planner.generate_plan(agent, goal, None)
+    assert len(planner.cache) == 1
+    
+    registry.register(MockSkill("skill.other", {}, {"has_D": "True"}))
+    await planner.generate_plan(agent, goal, None)
+    assert planner.cache.hits == 0
+    
+    agent.principles = [Principle(id="p_cost", affects="val.test", logic={"if": [True, 0.5, 0.0]})]
+    plan = await planner.generate_plan(agent, goal, None)
+    assert planner.cache.hits == 0
+    assert plan.total_cost == 3.0
+
+@pytest.mark.asyncio
+async def test_cached_plan_is_rechecked_against_vetoes():
+    registry, planner, agent, goal = make_planner()
+    # Vetoes make_c whenever an (otherwise irrelevant) alarm is raised
+    agent.principles = [Principle(
+        id="p_alarm",
+        affects="val.safety",
+        logic={"if": [{"and": [
+            {"==": [{"var": "world_state.alarm"}, "on"]},
+            {"==": [{"var": "action.id"}, "skill.make_c"]}
+        ]}, 1e999, 0.0]}
+    )]
+    
+    planner._extract_state = MagicMock(return_value={"has_A": "True", "alarm": "off"})
+    plan = await planner.generate_plan(agent, goal, None)
+    assert len(plan.steps) == 2
+    
+    planner._extract_state = MagicMock(return_value={"has_A": "True", "alarm": "on"})
+    plan = await planner.generate_plan(agent, goal, None)
+    assert plan.steps == []
+    assert len(planner.cache) == 0
+
+def test_lru_and_ttl_eviction():
+    cache = PlanCache(max_size=2, ttl=60.0)
+    plan = Plan(steps=[PlanStep(skill_id="s", params={})], total_cost=1.0)
+    for i in range(3):
+        cache.put(("agent", frozenset(), frozenset({("i", i)})), plan, 1, "d")
+    assert len(cache) == 2
+    assert cache.get(("agent", frozenset(), frozenset({("i", 0)})), 1, "d") is None
+    
+    cache.ttl = 0.0
+    key = ("agent", frozenset(), frozenset({("i", 3)}))
+    cache.put(key, plan, 1, "d")
+    time.sleep(0.001)
+    assert cache.get(key, 1, "d") is None
+
+@pytest.mark.asyncio
+async def test_plans_are_not_shared_across_skill_permissions():
+    registry, planner, agent, goal = make_planner()
+    planner._extract_state = MagicMock(return_value={"has_A": "True"})
+    plan = await planner.generate_plan(agent, goal, None)
+    assert [s.skill_id for s in plan.steps] == ["skill.make_b", "skill.make_c"]
+
+    # Same id, goal and state, but no longer allowed to make B
+    restricted = agent.model_copy(update={"allowed_skills": ["skill.make_c"]})
+    plan = await planner.generate_plan(restricted, goal, None)
+    assert planner.cache.hits == 0
+    assert "skill.make_b" not in [s.skill_id for s in plan.steps]
@@ -4,6 +4,7 @@ from noetic_engine.cognition.planner import Planner
 from noetic_engine.skills import SkillRegistry, Skill, SkillResult
 from noetic_lang.core import AgentDefinition, Goal
 from noetic_knowledge.store.schema import WorldState
+from noetic_conscience import Evaluator, Principle
 
 class MockSkill(Skill):
     def __init__(self, id, pre, post, cost=1.0):
@@ -77,4 +78,150 @@ async def test_planner_no_path():
     
     plan = await planner.generate_plan(agent, goal, None)
     
-    assert len(plan.steps) == 0
\ No newline at end of file
+    assert len(plan.steps) == 0
+    assert plan.complete is False and plan.budget_exhausted is False
+
+@pytest.mark.asyncio
+async def test_planner_emits_dependency_dag():
+    registry = SkillRegistry()
+    
+    # fetch_a and fetch_b touch disjoint keys; merge needs both
+    registry.register(MockSkill("skill.fetch_a", {}, {"has_A": "True"}))
+    registry.register(MockSkill("skill.fetch_b", {}, {"has_B": "True"}))
+    registry.register(MockSkill("skill.merge", {"has_A": "True", "has_B": "True"}, {"merged": "True"}))
+    
+    planner = Planner(registry)
+    agent = AgentDefinition(
+        id="test_agent",
+        system_prompt="",
+        allowed_skills=["skill.fetch_a", "skill.fetch_b", "skill.merge"],
+        principles=[]
+    )
+    goal = Goal(description="Merge", target_state={"merged": "True"})
+    planner._extract_state = MagicMock(return_value={})
+    
+    plan = await planner.generate_plan(agent, goal, None)
+    
+    assert [s.skill_id for s in plan.steps][-1] == "skill.merge"
+    assert plan.steps[0].depends_on == []
+    assert plan.steps[1].depends_on == []
+    assert plan.steps[2].depends_on == [0, 1]
+
+@pytest.mark.asyncio
+async def test_planner_ignores_irrelevant_facts_and_memoizes_judgements():
+    registry = SkillRegistry()
+    registry.register(MockSkill("skill.make_b", {"has_A": "True"}, {"has_B": "True"}))
+    registry.register(MockSkill("skill.make_c", {"has_B": "True"}, {"has_C": "True"}))
+    registry.register(MockSkill("skill.gated", {"has_Z": "True"}, {"has_C": "True"}))
+    
+    evaluator = Evaluator()
+    evaluator.judge_batch = MagicMock(wraps=evaluator.judge_batch)
+    planner = Planner(registry, evaluator)
+    agent = AgentDefinition(
+        id="test_agent",
+        system_prompt="",
+        allowed_skills=["skill.make_b", "skill.make_c", "skill.gated"],
+        principles=[]
+    )
+    goal = Goal(description="Get C", target_state={"has_C": "True"})
+    
+    # Thousands of facts no skill reads or writes
+    state = {f"noise_{i}": str(i) for i in range(5000)}
+    state["has_A"] = "True"
+    planner._extract_state = MagicMock(return_value=state)
+    
+    plan = await planner.generate_plan(agent, goal, None)
+    assert [s.skill_id for s in plan.steps] == ["skill.make_b", "skill.make_c"]
+    
+    # One judgement per (skill, reachable state), batched per expansion; the gated skill is never considered
+    batches = [[ctx.action_id for ctx in c.args[0]] for c in evaluator.judge_batch.call_args_list]
+    assert batches == [["skill.make_b"], ["skill.make_c"]]
+    # Principles still see the whole world state
+    assert evaluator.judge_batch.call_args_list[0].args[0][0].world_state["noise_42"] == "42"
+    
+    # The skill index is reused until the registry changes
+    index = planner._skill_index(agent)
+    assert planner._skill_index(agent) is index
+    registry.register(MockSkill("skill.other", {}, {"has_D": "True"}))
+    assert planner._skill_index(agent) is not index
+
+@pytest.mark.asyncio
+async def test_planner_anytime_budget_returns_best_partial_plan():
+    registry = SkillRegistry()
+    ids = []
+    # 12 independent toggles -> 4096 reachable states, none of them the goal
+    for i in range(12):
+        registry.register(MockSkill(f"skill.toggle_{i}", {}, {f"bit_{i}": "on"}))
+        ids.append(f"skill.toggle_{i}")
+    registry.register(MockSkill("skill.make_b", {}, {"has_B": "True"}))
+    ids.append("skill.make_b")
+    
+    planner = Planner(registry)
+    agent = AgentDefinition(id="test_agent", system_prompt="", allowed_skills=ids, principles=[])
+    goal = Goal(description="Unreachable", target_state={"has_B": "True", "has_C": "True"})
+    planner._extract_state = MagicMock(return_value={})
+    
+    plan = await planner.generate_plan(agent, goal, None, max_expansions=50)
+    assert plan.complete is False and plan.budget_exhausted is True
+    assert plan.expansions == 50
+    assert plan.heuristic_distance == 1.0
+    assert [s.skill_id for s in plan.steps] == ["skill.make_b"]
+    assert plan.planning_ms > 0
+    # Partial plans are not cached
+    assert len(planner.cache) == 0
+    
+    plan = await planner.generate_plan(agent, goal, None, deadline_ms=0)
+    assert plan.complete is False
+    assert plan.expansions == 0
+    assert plan.steps == []
+
+@pytest.mark.asyncio
+async def test_planner_weighted_astar_expands_fewer_nodes():
+    registry = SkillRegistry()
+    ids = []
+    for i in range(3):
+        registry.register(MockSkill(f"skill.goal_{i}", {}, {f"g_{i}": "True"}))
+        ids.append(f"skill.goal_{i}")
+    
+    planner = Planner(registry)
+    planner.cache = None # Compare two fresh searches
+    agent = AgentDefinition(id="test_agent", system_prompt="", allowed_skills=ids, principles=[])
+    goal = Goal(description="All", target_state={f"g_{i}": "True" for i in range(3)})
+    planner._extract_state = MagicMock(return_value={})
+    
+    optimal = await planner.generate_plan(agent, goal, None)
+    greedy = await planner.generate_plan(agent, goal, None, weight=2.0)
+    
+    assert optimal.complete and greedy.complete
+    assert len(greedy.steps) == 3
+    assert greedy.expansions < optimal.expansions
+
+@pytest.mark.asyncio
+async def test_planner_batches_neighbor_judgements_and_skips_vetoed():
+    registry = SkillRegistry()
+    ids = []
+    for i in range(12):
+        registry.register(MockSkill(f"skill.route_{i}", {}, {"arrived": "True", "route": str(i)}))
+        ids.append(f"skill.route_{i}")
+    
+    evaluator = Evaluator(vector_threshold=4)
+    evaluator.judge_batch = MagicMock(wraps=evaluator.judge_batch)
+    planner = Planner(registry, evaluator)
+    agent = AgentDefinition(
+        id="test_agent",
+        system_prompt="",
+        allowed_skills=ids,
+        principles=[
+            # Routes 0-5 are forbidden, route 6 is expensive
+            Principle(id="p_forbidden", affects="val.safety", logic={"if": [{"<": [{"var": "world_state.route"}, 6]}, 1e999, 0.0]}),
+            Principle(id="p_toll", affects="val.cost", logic={"if": [{"==": [{"var": "world_state.route"}, "6"]}, 5.0, 0.0]})
+        ]
+    )
+    goal = Goal(description="Arrive", target_state={"arrived": "True"})
+    planner._extract_state = MagicMock(return_value={})
+    
+    plan = await planner.generate_plan(agent, goal, None)
+    
+    assert [s.skill_id for s in plan.steps] == ["skill.route_7"]
+    # All 12 neighbors of the start node were judged in a single batch
+    assert [len(c.args[0]) for c in evaluator.judge_batch.call_args_list] == [12]
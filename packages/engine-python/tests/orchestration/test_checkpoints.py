@@ -0,0 +1,161 @@
+import asyncio
+import uuid
+from datetime import datetime
+import pytest
+from noetic_engine.runtime.executors.flow import FlowExecutor
+from noetic_engine.runtime.executors.checkpoints import FlowCheckpointStore
+from noetic_engine.cognition.flow_manager import FlowManager
+from noetic_engine.skills import Skill, SkillResult, SkillContext, SkillRegistry
+from noetic_knowledge import WorldState
+
+WORLD = WorldState(tick=0, entities={}, facts=[])
+CONTEXT = SkillContext(agent_id="agent-1")
+
+class ExpensiveSkill(Skill):
+    """Counts its calls per step; fails (or hangs) on the steps it is told to."""
+    description = "Stands in for an LLM or MCP call"
+    schema = {}
+
+    def __init__(self, id: str = "skill.expensive"):
+        self.id = id
+        self.calls = []
+        self.fail_on = set()
+        self.hang_on = set()
+        self.keys = []
+
+    async def execute(self, context, **kwargs):
+        step = kwargs["step"]
+        self.calls.append(step)
+        self.keys.append(context.idempotency_key)
+        if step in self.hang_on:
+            await asyncio.sleep(30)
+        if step in self.fail_on:
+            await asyncio.sleep(0.05) # Let concurrent branches finish first
+            raise RuntimeError(f"crash in {step}")
+        return SkillResult(success=True, data={"step": step})
+
+def linear_flow(n: int) -> dict:
+    states = {}
+    for i in range(n):
+        states[f"S{i}"] = {"skill": "skill.expensive", "params": {"step": f"S{i}"}, "next": f"S{i + 1}" if i + 1 < n else None}
+    return {"id": "flow.linear", "start_at": "S0", "states": states}
+
+def executor_for(flow: dict, store: FlowCheckpointStore, skill: ExpensiveSkill) -> FlowExecutor:
+    registry = SkillRegistry()
+    registry.register(skill)
+    return FlowExecutor(flow, skill_registry=registry, checkpoints=store)
+
+@pytest.mark.asyncio
+async def test_failed_run_resumes_from_the_last_completed_state(tmp_path):
+    path = str(tmp_path / "flows.db")
+    skill = ExpensiveSkill()
+    skill.fail_on = {"S3"}
+    executor = executor_for(linear_flow(5), FlowCheckpointStore(path), skill)
+
+    assert await executor.step({"topic": "graphs"}, WORLD, skill_context=CONTEXT, run_id="run-1") == {"run_id": "run-1", "error": "crash in S3"}
+    assert skill.calls == ["S0", "S1", "S2", "S3"]
+    assert executor.checkpoints.runs()[0]["status"] == "failed"
+
+    # A new process: fresh store handle, executor and skill
+    resumed_skill = ExpensiveSkill()
+    resumed = executor_for(linear_flow(5), FlowCheckpointStore(path), resumed_skill)
+    result = await resumed.step({}, WORLD, skill_context=CONTEXT, run_id="run-1")
+
+    assert resumed_skill.calls == ["S3", "S4"] # S0-S2 are not executed again
+    assert resumed_skill.keys == ["run-1:3", "run-1:4"] # S3 keeps the key of its first attempt
+    assert result["trace"] == ["S0", "S1", "S2", "S3", "S4"]
+    assert result["results"]["S1"].data == {"step": "S1"} # Restored from the journal
+    assert result["topic"] == "graphs"
+    assert resumed.checkpoints.status("run-1") == "completed"
+
+    # A completed run returns its recorded output
+    again = await resumed.step({}, WORLD, skill_context=CONTEXT, run_id="run-1")
+    assert again["trace"] == result["trace"] and resumed_skill.calls == ["S3", "S4"]
+
+@pytest.mark.asyncio
+async def test_interrupted_run_stays_resumable():
+    store = FlowCheckpointStore()
+    skill = ExpensiveSkill()
+    skill.hang_on = {"S2"}
+    executor = executor_for(linear_flow(4), store, skill)
+
+    task = asyncio.create_task(executor.step({}, WORLD, skill_context=CONTEXT, run_id="run-2"))
+    while "S2" not in skill.calls:
+        await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert [run["run_id"] for run in store.runs(status="running")] == ["run-2"]
+
+    # On start the engine resumes the runs its flow manager reports
+    manager = FlowManager(skill_registry=executor.skills, checkpoints=store)
+    manager.register(linear_flow(4))
+    assert [run["run_id"] for run in manager.interrupted_runs()] == ["run-2"]
+
+    skill.hang_on = set()
+    result = await manager.get_executor("flow.linear").step({}, WORLD, skill_context=CONTEXT, run_id="run-2")
+    assert skill.calls == ["S0", "S1", "S2", "S2", "S3"]
+    assert result["trace"] == ["S0", "S1", "S2", "S3"]
+
+@pytest.mark.asyncio
+async def test_completed_branches_are_not_rerun():
+    store = FlowCheckpointStore()
+    skill = ExpensiveSkill()
+    skill.fail_on = {"slow"}
+    flow = {
+        "id": "flow.fan_out",
+        "start_at": "Both",
+        "states": {
+            "Both": {
+                "type": "Parallel",
+                "branches": [
+                    {"start_at": "A", "states": {"A": {"skill": "skill.expensive", "params": {"step": "fast"}}}},
+                    {"start_at": "B", "states": {"B": {"skill": "skill.expensive", "params": {"step": "slow"}}}}
+                ],
+                "next": "After"
+            },
+            "After": {"skill": "skill.expensive", "params": {"step": "after"}}
+        }
+    }
+    executor = executor_for(flow, store, skill)
+
+    assert await executor.step({}, WORLD, skill_context=CONTEXT, run_id="run-3") == {"run_id": "run-3", "error": "crash in slow"}
+    assert sorted(skill.calls) == ["fast", "slow"]
+
+    skill.fail_on = set()
+    result = await executor.step({}, WORLD, skill_context=CONTEXT, run_id="run-3")
+    assert sorted(skill.calls) == ["after", "fast", "slow", "slow"]
+    assert [output["results"][name].data["step"] for output, name in zip(result["results"]["Both"], ["A", "B"])] == ["fast", "slow"]
+    assert result["trace"] == ["Both", "After"]
+    # Branch runs are journaled under the parent, not listed as runs of their own
+    assert [run["run_id"] for run in store.runs()] == ["run-3"]
+
+    store.delete("run-3")
+    assert store.runs() == [] and store.steps("run-3/0.Both[0]") == []
+
+@pytest.mark.asyncio
+async def test_failed_runs_report_their_generated_run_id():
+    store = FlowCheckpointStore()
+    skill = ExpensiveSkill()
+    skill.fail_on = {"S1"}
+    executor = executor_for(linear_flow(3), store, skill)
+
+    failed = await executor.step({}, WORLD, skill_context=CONTEXT)
+    assert failed["error"] == "crash in S1"
+    assert store.status(failed["run_id"]) == "failed"
+
+    skill.fail_on = set()
+    result = await executor.step({}, WORLD, skill_context=CONTEXT, run_id=failed["run_id"])
+    assert result["trace"] == ["S0", "S1", "S2"] and skill.calls == ["S0", "S1", "S1", "S2"]
+
+@pytest.mark.asyncio
+async def test_values_json_cannot_restore_fail_the_run():
+    store = FlowCheckpointStore()
+    skill = ExpensiveSkill()
+    executor = executor_for(linear_flow(2), store, skill)
+
+    for value in (uuid.uuid4(), datetime(2026, 1, 1), b"raw"):
+        result = await executor.step({"value": value}, WORLD, skill_context=CONTEXT)
+        assert "cannot be checkpointed" in result["error"]
+        assert store.status(result["run_id"]) == "failed"
+    assert skill.calls == []
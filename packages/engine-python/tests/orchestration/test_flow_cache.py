@@ -0,0 +1,67 @@
+import pytest
+from pydantic import ValidationError
+from noetic_engine.cognition.flow_manager import FlowManager
+from noetic_engine.runtime.executors.flow_cache import FlowCompileCache
+from noetic_engine.skills import Skill, SkillResult, SkillContext, SkillRegistry
+from noetic_knowledge import WorldState
+
+WORLD = WorldState(tick=0, entities={}, facts=[])
+
+def greeting_flow() -> dict:
+    return {
+        "id": "flow.greet",
+        "start_at": "Greet",
+        "states": {
+            "Greet": {"skill": "skill.greet", "params": {"name": "Ada"}, "next": "Done"},
+            "Done": {"end": True}
+        }
+    }
+
+class GreetSkill(Skill):
+    id = "skill.greet"
+    description = "Greets in its tenant's language"
+    schema = {}
+
+    def __init__(self, greeting: str):
+        self.greeting = greeting
+
+    async def execute(self, context, **kwargs):
+        return SkillResult(success=True, data=f"{self.greeting} {kwargs['name']}")
+
+def manager_for(greeting: str, cache: FlowCompileCache) -> FlowManager:
+    registry = SkillRegistry()
+    registry.register(GreetSkill(greeting))
+    return FlowManager(skill_registry=registry, compile_cache=cache)
+
+@pytest.mark.asyncio
+async def test_engines_share_compiled_flows_but_not_their_skills():
+    cache = FlowCompileCache()
+    english, french = manager_for("Hello", cache), manager_for("Bonjour", cache)
+    english.register(greeting_flow())
+    # Same definition, keys in another order: the same canonical hash
+    french.register(dict(reversed(list(greeting_flow().items()))))
+
+    assert cache.stats()["misses"] == 1 and cache.stats()["hits"] == 1
+    assert english.get_executor("flow.greet").compiled is french.get_executor("flow.greet").compiled
+
+    context = SkillContext(agent_id="agent-1")
+    en = await english.get_executor("flow.greet").step({}, WORLD, skill_context=context)
+    fr = await french.get_executor("flow.greet").step({}, WORLD, skill_context=context)
+    assert en["results"]["Greet"].data == "Hello Ada"
+    assert fr["results"]["Greet"].data == "Bonjour Ada"
+
+def test_changed_or_invalid_definitions_are_compiled_apart():
+    cache = FlowCompileCache(max_size=2)
+    base = cache.compile(greeting_flow())
+
+    changed = greeting_flow()
+    changed["states"]["Greet"]["params"]["name"] = "Grace"
+    assert cache.compile(changed) is not base
+    assert cache.compile(greeting_flow(), max_steps=50) is not base
+    assert len(cache) == 2 and cache.evictions == 1
+
+    broken = greeting_flow()
+    broken["states"]["Greet"]["next"] = "Nowhere"
+    with pytest.raises(ValidationError):
+        cache.compile(broken)
+    assert len(cache) == 2 and cache.misses == 4
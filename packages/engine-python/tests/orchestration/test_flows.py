@@ -1,7 +1,11 @@
+import asyncio
+import time
 import pytest
 from unittest.mock import MagicMock, patch
+from pydantic import ValidationError
 from noetic_engine.runtime.executors.flow import FlowExecutor
 from noetic_knowledge import WorldState
+from noetic_engine.skills import Skill, SkillResult, SkillContext, SkillRegistry
 
 # Minimal flow definition
 SIMPLE_FLOW = {
@@ -53,3 +57,194 @@ async def test_flow_execution_step(mock_world_state):
     
     # Verify the last state's params were merged (simple behavior)
     assert result.get("message") == "Step 2 Executed"
+
+@pytest.mark.asyncio
+async def test_flow_state_channels_and_runtime_objects(mock_world_state):
+    class RecordingSkill(Skill):
+        id = "skill.debug.log"
+        description = "Records its calls"
+        schema = {}
+        contexts = []
+
+        async def execute(self, context, **kwargs):
+            self.contexts.append(context)
+            return SkillResult(success=True, data=kwargs["message"])
+
+    registry = SkillRegistry()
+    skill = RecordingSkill()
+    registry.register(skill)
+    executor = FlowExecutor(SIMPLE_FLOW, skill_registry=registry)
+    engine = object()
+    context = SkillContext(agent_id="agent-1", engine=engine)
+    inputs = {"trace": [], "flow_id": "flow.simple"}
+
+    result = await executor.step(inputs, mock_world_state, skill_context=context, run_id="run-1")
+
+    assert result["trace"] == ["Step1", "Step2"]
+    assert {name: r.data for name, r in result["results"].items()} == {"Step1": "Step 1 Executed", "Step2": "Step 2 Executed"}
+    assert result["flow_id"] == "flow.simple"
+    # Runtime objects are handed over by reference, never copied into the state
+    assert all(c.engine is engine for c in skill.contexts) and len(skill.contexts) == 2
+    assert [c.idempotency_key for c in skill.contexts] == ["run-1:0", "run-1:1"]
+    assert not any(key.startswith("_") for key in result)
+    assert inputs == {"trace": [], "flow_id": "flow.simple"}
+
+@pytest.mark.asyncio
+async def test_long_flows_run_past_the_default_recursion_limit(mock_world_state):
+    states = {f"S{i}": {"next": f"S{i + 1}"} for i in range(199)}
+    states["S199"] = {"end": True}
+    executor = FlowExecutor({"id": "flow.long", "start_at": "S0", "states": states})
+
+    result = await executor.step({}, mock_world_state)
+    assert result["trace"] == [f"S{i}" for i in range(200)]
+
+class SleepSkill(Skill):
+    description = "Sleeps, then echoes its arguments"
+    schema = {}
+
+    def __init__(self, id: str):
+        self.id = id
+        self.running = 0
+        self.peak = 0
+
+    async def execute(self, context, **kwargs):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(kwargs.get("delay", 0.1))
+        finally:
+            self.running -= 1
+        return SkillResult(success=True, data=kwargs)
+
+def _registry(*skills):
+    registry = SkillRegistry()
+    for skill in skills:
+        registry.register(skill)
+    return registry
+
+@pytest.mark.asyncio
+async def test_parallel_branches_run_concurrently_and_join(mock_world_state):
+    skill = SleepSkill("skill.research")
+    flow = {
+        "id": "flow.research",
+        "start_at": "Research",
+        "states": {
+            "Research": {
+                "type": "Parallel",
+                "branches": [
+                    {"start_at": "Web", "states": {"Web": {"skill": "skill.research", "params": {"source": "web"}}}},
+                    {"start_at": "Papers", "states": {
+                        "Papers": {"skill": "skill.research", "params": {"source": "papers"}, "next": "Summarize"},
+                        "Summarize": {"skill": "skill.research", "params": {"delay": 0}}
+                    }}
+                ],
+                "next": "Report"
+            },
+            "Report": {"params": {"done": True}, "end": True}
+        }
+    }
+    executor = FlowExecutor(flow, skill_registry=_registry(skill))
+
+    started = time.monotonic()
+    result = await executor.step({"topic": "graphs"}, mock_world_state, skill_context=SkillContext(agent_id="agent-1"))
+
+    assert time.monotonic() - started < 0.3 # Both branches slept 0.1s, side by side
+    assert skill.peak == 2
+    assert result["trace"] == ["Research", "Report"]
+    web, papers = result["results"]["Research"]
+    assert web["trace"] == ["Web"] and web["results"]["Web"].data["source"] == "web"
+    assert papers["trace"] == ["Papers", "Summarize"]
+    assert papers["topic"] == "graphs" # Branches start from the flow variables
+    assert result["done"] is True
+
+@pytest.mark.asyncio
+async def test_map_iterates_with_a_concurrency_limit(mock_world_state):
+    skill = SleepSkill("skill.fetch")
+    flow = {
+        "id": "flow.fetch_all",
+        "start_at": "FetchAll",
+        "states": {
+            "FetchAll": {
+                "type": "Map",
+                "items": "request.urls",
+                "item_var": "url",
+                "max_concurrency": 2,
+                "iterator": {"start_at": "Fetch", "states": {"Fetch": {"skill": "skill.fetch", "params": {"delay": 0.05}}}},
+                "end": True
+            }
+        }
+    }
+    executor = FlowExecutor(flow, skill_registry=_registry(skill))
+    urls = [f"https://example.com/{i}" for i in range(5)]
+
+    started = time.monotonic()
+    result = await executor.step({"request": {"urls": urls}}, mock_world_state, skill_context=SkillContext(agent_id="agent-1"))
+
+    assert skill.peak == 2
+    assert time.monotonic() - started >= 0.15 # Three rounds of at most two
+    assert [output["url"] for output in result["results"]["FetchAll"]] == urls
+
+    empty = await executor.step({"request": {"urls": []}}, mock_world_state)
+    assert empty["results"]["FetchAll"] == [] and empty["trace"] == ["FetchAll"]
+
+@pytest.mark.asyncio
+async def test_map_slots_do_not_outlive_a_failed_run(mock_world_state):
+    flow = {
+        "id": "flow.nested",
+        "start_at": "Outer",
+        "states": {
+            "Outer": {
+                "type": "Map",
+                "items": "groups",
+                "item_var": "group",
+                "max_concurrency": 1,
+                "iterator": {"start_at": "Inner", "states": {"Inner": {"type": "Map", "items": "group", "item_var": "item", "iterator": {"start_at": "Noop", "states": {"Noop": {"end": True}}}, "end": True}}},
+                "end": True
+            }
+        }
+    }
+    executor = FlowExecutor(flow)
+
+    # The second branch raises (its items are not a list)
+    failed = await executor.step({"groups": [[1], "oops"]}, mock_world_state)
+    assert "not a list" in failed["error"]
+    # The compiled flow is shared by every run: nothing of this one stays on it
+    semaphores = [value for value in vars(executor.compiled).values() if isinstance(value, dict) and any(isinstance(v, asyncio.Semaphore) for v in value.values())]
+    assert semaphores == []
+
+    result = await executor.step({"groups": [[1], [2, 3]]}, mock_world_state)
+    assert [len(output["results"]["Inner"]) for output in result["results"]["Outer"]] == [1, 2]
+
+@pytest.mark.asyncio
+async def test_guarded_transitions_follow_json_logic(mock_world_state):
+    flow = {
+        "id": "flow.retry",
+        "start_at": "Attempt",
+        "states": {
+            "Attempt": {
+                "choices": [
+                    {"condition": {">=": [{"var": "attempts"}, 3]}, "next": "GiveUp"},
+                    {"condition": {"==": [{"var": "status"}, "ok"]}, "next": "Done"}
+                ],
+                "next": "Bump"
+            },
+            "Bump": {"next": "Attempt"},
+            "GiveUp": {"end": True},
+            "Done": {"end": True}
+        }
+    }
+    executor = FlowExecutor(flow)
+    result = await executor.step({"attempts": 3}, mock_world_state)
+    assert result["trace"] == ["Attempt", "GiveUp"]
+    result = await executor.step({"attempts": 0, "status": "ok"}, mock_world_state)
+    assert result["trace"] == ["Attempt", "Done"]
+
+    looping = FlowExecutor(flow, max_steps=10)
+    failed = await looping.step({"attempts": 0}, mock_world_state) # Recursion limit reached
+    assert set(failed) == {"run_id", "error"}
+
+def test_flow_spec_rejects_incomplete_fan_outs():
+    with pytest.raises(ValidationError, match="Parallel state requires 'branches'"):
+        FlowExecutor({"id": "f", "start_at": "P", "states": {"P": {"type": "Parallel"}}})
+    with pytest.raises(ValidationError, match="unknown state 'Nowhere'"):
+        FlowExecutor({"id": "f", "start_at": "A", "states": {"A": {"choices": [{"condition": True, "next": "Nowhere"}]}}})
@@ -72,3 +72,107 @@ async def test_process_next_executes_plan():
     # Assert
     # Verify execution
     mock_skill.execute.assert_called()
+
+class SleepSkill(Skill):
+    description = "Sleeps"
+    schema = {}
+
+    def __init__(self, id, tags=None):
+        self.id = id
+        self._tags = tags or []
+
+    @property
+    def resource_tags(self):
+        return self._tags
+
+    async def execute(self, context, **kwargs):
+        import asyncio
+        await asyncio.sleep(0.05)
+        return MagicMock(success=True)
+
+def _dag_cognitive(skills_list, max_concurrency=4):
+    registry = SkillRegistry()
+    for s in skills_list:
+        registry.register(s)
+    knowledge = MagicMock()
+    cognitive = CognitiveSystem(knowledge, registry, MagicMock(), AgentManager(), max_concurrency=max_concurrency)
+    agent = AgentContext(id="agent-1", system_prompt="", allowed_skills=[s.id for s in skills_list], principles=[])
+    return cognitive, agent
+
+@pytest.mark.asyncio
+async def test_independent_steps_run_concurrently():
+    from noetic_lang.core import Plan, PlanStep
+    cognitive, agent = _dag_cognitive([SleepSkill("s.a"), SleepSkill("s.b"), SleepSkill("s.c")])
+    plan = Plan(steps=[
+        PlanStep(skill_id="s.a", depends_on=[]),
+        PlanStep(skill_id="s.b", depends_on=[]),
+        PlanStep(skill_id="s.c", depends_on=[0, 1]),
+    ])
+    
+    report = await cognitive._execute_plan(plan, agent)
+    
+    assert report.max_parallelism == 2
+    assert report.saved_ms > 30 # ~50ms saved by overlapping a and b
+    assert report.wall_clock_ms < report.sequential_ms
+
+@pytest.mark.asyncio
+async def test_resource_tags_and_legacy_plans_stay_sequential():
+    from noetic_lang.core import Plan, PlanStep
+    cognitive, agent = _dag_cognitive([SleepSkill("s.gpu1", ["gpu"]), SleepSkill("s.gpu2", ["gpu"]), SleepSkill("s.x")])
+    
+    tagged = Plan(steps=[PlanStep(skill_id="s.gpu1", depends_on=[]), PlanStep(skill_id="s.gpu2", depends_on=[])])
+    report = await cognitive._execute_plan(tagged, agent)
+    assert report.max_parallelism == 1
+    
+    # No dependency information -> sequential as before
+    legacy = Plan(steps=[PlanStep(skill_id="s.x"), PlanStep(skill_id="s.x")])
+    report = await cognitive._execute_plan(legacy, agent)
+    assert report.max_parallelism == 1
+
+class FailingSkill(Skill):
+    description = "Fails"
+    schema = {}
+
+    def __init__(self, id):
+        self.id = id
+
+    async def execute(self, context, **kwargs):
+        raise RuntimeError("unreachable host")
+
+@pytest.mark.asyncio
+async def test_failed_steps_skip_their_dependents():
+    from noetic_lang.core import Plan, PlanStep
+    downstream = SleepSkill("s.after")
+    downstream.execute = AsyncMock(return_value=MagicMock(success=True))
+    independent = SleepSkill("s.other")
+    cognitive, agent = _dag_cognitive([FailingSkill("s.fetch"), downstream, independent])
+    plan = Plan(steps=[
+        PlanStep(skill_id="s.fetch", depends_on=[]),
+        PlanStep(skill_id="s.after", depends_on=[0]),
+        PlanStep(skill_id="s.other", depends_on=[]),
+        PlanStep(skill_id="s.after", depends_on=[1]), # Transitively depends on the failure
+    ])
+
+    report = await cognitive._execute_plan(plan, agent)
+
+    assert (report.failed, report.skipped) == (1, 2)
+    downstream.execute.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_only_budget_cut_partial_plans_are_executed():
+    from noetic_lang.core import Plan, PlanStep
+    cognitive, agent = _dag_cognitive([SleepSkill("s.a")])
+    cognitive.agent_manager.register(agent)
+    cognitive._execute_step = AsyncMock(return_value=True)
+    event = Event(id=uuid.uuid4(), type="test-event", timestamp=datetime.utcnow())
+    state = WorldState(tick=0, entities={}, facts=[], event_queue=[event])
+
+    # Unreachable goal, no budget set: the search exhausted its options
+    cognitive.planner.generate_plan = AsyncMock(return_value=Plan(steps=[PlanStep(skill_id="s.a")], complete=False))
+    await cognitive.process_event(event, state)
+    cognitive._execute_step.assert_not_called()
+
+    # Cut short by its budget: act on the best partial plan
+    cognitive.planner.generate_plan = AsyncMock(return_value=Plan(steps=[PlanStep(skill_id="s.a")], complete=False, budget_exhausted=True))
+    await cognitive.process_event(event, state)
+    cognitive._execute_step.assert_called_once()
@@ -0,0 +1,81 @@
+import asyncio
+import uuid
+import pytest
+from datetime import datetime
+from noetic_engine.runtime.dispatcher import CognitionDispatcher
+from noetic_engine.cognition import AgentManager
+from noetic_lang.core import AgentDefinition as AgentContext
+from noetic_knowledge import WorldState
+from noetic_knowledge.store.schema import Event
+
+class RecordingCognitive:
+    """
+    Stands in for CognitiveSystem; records which agent handled which event.
+    """
+    def __init__(self, delay=0.02):
+        self.agent_manager = AgentManager()
+        self.active_tasks = set()
+        self.delay = delay
+        self.handled = []
+        self.concurrent = 0
+        self.peak = 0
+
+    async def process_event(self, event, state, agent_id=None):
+        self.concurrent += 1
+        self.peak = max(self.peak, self.concurrent)
+        await asyncio.sleep(self.delay)
+        self.handled.append((agent_id, event.payload.get("n")))
+        self.concurrent -= 1
+
+def _agent(id, subscriptions=None):
+    return AgentContext(id=id, system_prompt="", allowed_skills=[], principles=[], subscriptions=subscriptions or [])
+
+def _state(*events):
+    return WorldState(tick=0, entities={}, facts=[], event_queue=[
+        Event(id=uuid.uuid4(), type=t, payload={"n": n}, timestamp=datetime.utcnow()) for t, n in events
+    ])
+
+@pytest.mark.asyncio
+async def test_routes_by_subscription_with_default_fallback():
+    cognitive = RecordingCognitive(delay=0)
+    cognitive.agent_manager.register(_agent("agent.default"))
+    cognitive.agent_manager.register(_agent("agent.ui", ["ui.*"]))
+    dispatcher = CognitionDispatcher(cognitive)
+    dispatcher.subscribe("agent.files", ["fs.changed"])
+    
+    dispatcher.dispatch(_state(("ui.click", 1), ("fs.changed", 2), ("other", 3), ("cmd.run_flow", 4)))
+    await dispatcher.drain()
+    
+    assert sorted(cognitive.handled, key=lambda h: h[1]) == [
+        ("agent.ui", 1), ("agent.files", 2), ("agent.default", 3), (None, 4)
+    ]
+
+@pytest.mark.asyncio
+async def test_per_agent_order_and_bounded_concurrency():
+    cognitive = RecordingCognitive()
+    cognitive.agent_manager.register(_agent("a", ["a.*"]))
+    cognitive.agent_manager.register(_agent("b", ["b.*"]))
+    cognitive.agent_manager.register(_agent("c", ["c.*"]))
+    dispatcher = CognitionDispatcher(cognitive, max_in_flight=2)
+    
+    dispatcher.dispatch(_state(*[(f"{agent}.evt", i) for i in range(3) for agent in "abc"]))
+    assert len(cognitive.active_tasks) == 3 # One worker per agent lane
+    await dispatcher.drain()
+    
+    assert cognitive.peak == 2
+    for agent in "abc":
+        assert [n for a, n in cognitive.handled if a == agent] == [0, 1, 2]
+    assert cognitive.active_tasks == set()
+
+@pytest.mark.asyncio
+async def test_stop_cancels_active_tasks():
+    cognitive = RecordingCognitive(delay=10)
+    cognitive.agent_manager.register(_agent("a"))
+    dispatcher = CognitionDispatcher(cognitive)
+    
+    dispatcher.dispatch(_state(("slow", 1), ("slow", 2)))
+    await asyncio.sleep(0)
+    await dispatcher.stop()
+    
+    assert cognitive.handled == []
+    assert dispatcher.pending() == 0
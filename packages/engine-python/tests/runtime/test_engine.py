@@ -20,6 +20,32 @@ def test_core_skills_registered():
     assert engine.skills.get_skill("skill.system.wait") is not None
     assert engine.skills.get_skill("skill.debug.log") is not None
 
+@pytest.mark.asyncio
+async def test_hung_skills_time_out_under_the_engine_default():
+    import asyncio
+    from noetic_engine.skills import Skill, SkillContext, SkillResult
+
+    class HangSkill(Skill):
+        id = "skill.hang"
+        description = "Never returns."
+        schema = {}
+        async def execute(self, context: SkillContext, **kwargs) -> SkillResult:
+            await asyncio.sleep(3600)
+
+    assert NoeticEngine().skills.default_policy.timeout == 300.0
+    assert NoeticEngine(skill_timeout=None).skills.default_policy.timeout is None
+
+    engine = NoeticEngine(skill_timeout=0.1)
+    engine.skills.register(HangSkill())
+    result = await asyncio.wait_for(engine.skills.execute(HangSkill(), SkillContext(agent_id="a"), {}), 5)
+    assert result.success is False
+    assert "timed out" in result.error
+
+    # Waiting is the wait skill's job: the default deadline does not cut it short
+    wait = engine.skills.get_skill("skill.system.wait")
+    result = await engine.skills.execute(wait, SkillContext(agent_id="a"), {"seconds": 0.2})
+    assert result.success is True
+
 @pytest.mark.asyncio
 async def test_engine_lifecycle():
     engine = NoeticEngine()
@@ -0,0 +1,169 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import uuid
+from collections import OrderedDict
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import pytest
+import chromadb
+from chromadb import EmbeddingFunction, Documents, Embeddings
+from noetic_engine.runtime.host import EngineHost
+from noetic_engine.runtime.executors.checkpoints import FlowCheckpointStore
+
+class HashEmbedding(EmbeddingFunction):
+    """
+    Deterministic offline embedding so tests don't download a model.
+    """
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def name() -> str:
+        return "test-hash"
+
+    def __call__(self, input: Documents) -> Embeddings:
+        return [[b / 255.0 for b in hashlib.sha256(t.encode()).digest()[:16]] for t in input]
+
+@pytest.fixture
+def host(tmp_path):
+    return EngineHost(
+        data_dir=str(tmp_path),
+        chroma_client=chromadb.EphemeralClient(),
+        embedding_function=HashEmbedding(),
+        max_resident=2
+    )
+
+@pytest.mark.asyncio
+async def test_tenants_are_isolated_and_share_resources(host):
+    alice = await host.wake("alice")
+    bob = await host.wake("bob")
+
+    subject = uuid.uuid4()
+    alice.knowledge.ingest_fact(subject, "status", object_literal="active")
+
+    assert len(alice.knowledge.get_world_state().facts) == 1
+    assert len(bob.knowledge.get_world_state().facts) == 0
+
+    # One pooled SQL engine, one Chroma client and one HTTP pool for everyone
+    assert alice.knowledge.engine.pool is bob.knowledge.engine.pool
+    assert alice.knowledge.chroma_client is bob.knowledge.chroma_client
+    assert alice.http is bob.http is host.http
+
+    await host.stop()
+
+@pytest.mark.asyncio
+async def test_lru_eviction_and_lazy_rewake(host):
+    alice = await host.wake("alice")
+    alice.knowledge.ingest_fact(uuid.uuid4(), "mood", object_literal="curious")
+
+    await host.wake("bob")
+    await host.wake("carol") # Exceeds max_resident=2 -> alice (LRU) is evicted
+
+    assert host.resident() == ["bob", "carol"]
+    assert host.evictions == 1
+    # Her vector collection is dropped from the shared client
+    collections = [c.name for c in host.chroma_client.list_collections()]
+    assert host._collection_for("alice") not in collections and host._collection_for("bob") in collections
+
+    # Waking alice again rebuilds her engine (and her vectors) from her schema
+    alice_again = await host.wake("alice")
+    assert alice_again is not alice
+    facts = alice_again.knowledge.get_world_state().facts
+    assert [f.object_literal for f in facts] == ["curious"]
+    assert alice_again.knowledge.collection.count() == 1
+
+    await host.stop()
+
+@pytest.mark.asyncio
+async def test_single_loop_ticks_all_tenants_and_evicts_idle(host):
+    await host.push_event("alice", "ui.click", {"x": 1})
+    await host.push_event("bob", "ui.click", {"x": 2})
+
+    await host.tick()
+    assert host.tenants["alice"].engine.latest_ui == {}
+    assert host.tenants["bob"].engine.latest_ui == {}
+
+    host.idle_evict_after = 0.0
+    await host.tick()
+    assert host.resident() == []
+
+    await host.stop()
+
+@pytest.mark.asyncio
+async def test_memory_cap_stops_evicting_when_nothing_is_freed(host, monkeypatch):
+    host.max_resident = 10
+    host.memory_limit_mb = 1
+    rss = {"bytes": 0}
+    monkeypatch.setattr("noetic_engine.runtime.host._current_rss_bytes", lambda: rss["bytes"])
+    for tenant_id in ("alice", "bob", "carol"):
+        await host.wake(tenant_id)
+
+    # Over the cap, and evicting gives nothing back to the OS
+    rss["bytes"] = 10 * 1024 * 1024
+    await host.wake("dave")
+    assert host.resident() == ["bob", "carol", "dave"]
+
+    # Unmeasurable: the cap is not enforced
+    rss["bytes"] = None
+    await host.wake("erin")
+    assert host.resident() == ["bob", "carol", "dave", "erin"]
+
+    await host.stop()
+
+@pytest.mark.asyncio
+async def test_waking_a_tenant_resumes_its_interrupted_runs(host, tmp_path):
+    # A run of alice's left "running" by a crash of the previous process
+    journal = FlowCheckpointStore(os.path.join(str(tmp_path), f"{host.database.schema_for('alice')}.flows.db"))
+    journal.start("run-1", "flow.notify")
+    journal.close()
+
+    pushed = []
+    factory = host.engine_factory
+
+    def loading_factory(tenant_id, knowledge):
+        engine = factory(tenant_id, knowledge)
+        engine.flow_manager.register({"id": "flow.notify", "start_at": "Log", "states": {"Log": {"skill": "skill.log"}}}, lazy=True)
+        engine.push_event = lambda event_type, payload=None: pushed.append((event_type, payload))
+        return engine
+
+    host.engine_factory = loading_factory
+    await host.wake("alice")
+    assert pushed == [("cmd.run_flow", {"flow_id": "flow.notify", "run_id": "run-1"})]
+
+    await host.stop()
+
+@pytest.mark.asyncio
+async def test_concurrent_wakes_share_one_engine(host):
+    built = []
+    factory = host.engine_factory
+
+    def counting_factory(tenant_id, knowledge):
+        built.append(tenant_id)
+        engine = factory(tenant_id, knowledge)
+        start = engine.brain.start
+
+        async def slow_start():
+            await asyncio.sleep(0.01) # The other wake runs meanwhile
+            await start()
+        engine.brain.start = slow_start
+        return engine
+
+    host.engine_factory = counting_factory
+    first, second = await asyncio.gather(host.wake("alice"), host.wake("alice"))
+
+    assert first is second and built == ["alice"]
+    assert host.resident() == ["alice"]
+
+    await host.stop()
+
+def test_failed_detach_keeps_the_schema_attached(host):
+    attached = OrderedDict((f"t_{i}", True) for i in range(host.database.max_attached))
+    conn = SimpleNamespace(get_execution_options=lambda: {"noetic_tenant": "t_new"}, connection=SimpleNamespace(info={"noetic_attached": attached}))
+    cursor = MagicMock()
+    cursor.execute.side_effect = sqlite3.OperationalError("database t_0 is locked")
+
+    with pytest.raises(sqlite3.OperationalError):
+        host.database._attach_tenant(conn, cursor, "SELECT 1", (), None, False)
+    assert "t_0" in attached and "t_new" not in attached
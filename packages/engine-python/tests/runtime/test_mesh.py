@@ -0,0 +1,53 @@
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from noetic_conscience.contracts import AgenticIntentContract, AICHeader, AICCapabilityScopes, AICSafetyGuardrails, AICUserPreferences
+from noetic_stdlib.agents.base import Agent, AgentDefinition
+from noetic_engine.runtime.mesh import MeshOrchestrator
+
+class EchoAgent(Agent):
+    async def execute(self, tool, params, contract):
+        return {"tool": tool, **params}
+
+def make_contract(private_key=None) -> AgenticIntentContract:
+    contract = AgenticIntentContract(
+        header=AICHeader(user_id="u1", origin_device="cli"),
+        scopes=AICCapabilityScopes(allowed_tools=["echo"]),
+        safety=AICSafetyGuardrails(),
+        preferences=AICUserPreferences()
+    )
+    if private_key:
+        contract.sign(private_key)
+    return contract
+
+@pytest.mark.asyncio
+async def test_route_intents_verifies_contracts_once_and_fans_out():
+    key = ed25519.Ed25519PrivateKey.generate()
+    mesh = MeshOrchestrator()
+    mesh.set_public_key(key.public_key())
+    mesh.register_agent(EchoAgent(AgentDefinition(id="echo", name="Echo", description="", allowed_tools=["echo"])))
+    contract = make_contract(key)
+
+    results = await mesh.route_intents([
+        ("echo", "echo", {"n": 1}, contract),
+        ("echo", "echo", {"n": 2}, contract),
+        ("echo", "echo", {"n": 3}, make_contract()),
+    ])
+
+    assert results[:2] == [{"tool": "echo", "n": 1}, {"tool": "echo", "n": 2}]
+    assert isinstance(results[2], PermissionError)
+    
+    # Routing the same contract again is served by the verification cache
+    await mesh.route_intent("echo", "echo", {"n": 4}, contract)
+    assert mesh.verification_cache.hits == 1
+
+@pytest.mark.asyncio
+async def test_route_intent_always_verifies_the_signature():
+    key = ed25519.Ed25519PrivateKey.generate()
+    mesh = MeshOrchestrator()
+    mesh.set_public_key(key.public_key())
+    mesh.register_agent(EchoAgent(AgentDefinition(id="echo", name="Echo", description="", allowed_tools=["echo"])))
+
+    with pytest.raises(TypeError):
+        await mesh.route_intent("echo", "echo", {}, make_contract(), verified=True)
+    with pytest.raises(PermissionError):
+        await mesh.route_intent("echo", "echo", {}, make_contract())
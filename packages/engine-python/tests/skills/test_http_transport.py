@@ -0,0 +1,143 @@
+import json
+import socket
+import threading
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import pytest
+import httpx
+from noetic_stdlib.transport import HttpTransport
+from noetic_stdlib.agents import AgentDefinition, N8nAgent
+from noetic_knowledge import WorldState
+from noetic_knowledge.store.schema import Event
+from noetic_lang.core import AgentDefinition as AgentContext, PlanStep
+from noetic_engine.runtime.engine import NoeticEngine
+from noetic_engine.skills.adapter_mcp import McpSkillAdapter
+from noetic_engine.skills.interfaces import SkillContext
+
+class StubRpcHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive
+    disable_nagle_algorithm = True
+    wbufsize = -1 # One write per response (flushed by the handler)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.peers.add(self.client_address)
+        text = f"echo {request['params']['arguments'].get('msg')}"
+        body = json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": {"content": [{"type": "text", "text": text}]}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def rpc_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubRpcHandler)
+    server.peers = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+@pytest.mark.asyncio
+async def test_mcp_calls_reuse_pooled_connections(rpc_server):
+    transport = HttpTransport()
+    url = f"http://127.0.0.1:{rpc_server.server_address[1]}/"
+    adapter = McpSkillAdapter(url, "echo", "Echo", {})
+    # Without an explicit transport the adapter uses the engine's
+    context = SkillContext(agent_id="test", engine=SimpleNamespace(http=transport))
+
+    for i in range(5):
+        result = await adapter.execute(context, msg=i)
+        assert result.success and result.data == f"echo {i}"
+
+    # Sequential calls share one keep-alive connection
+    assert len(rpc_server.peers) == 1
+    await transport.aclose()
+    with pytest.raises(RuntimeError):
+        await transport.post(url, json={})
+
+@pytest.mark.asyncio
+async def test_connection_failures_are_retried():
+    transport = HttpTransport(retries=2, backoff=0.0)
+    with pytest.raises(httpx.ConnectError):
+        await transport.post(f"http://127.0.0.1:{free_port()}/", json={})
+    assert transport.stats == {"requests": 3, "retries": 2, "failures": 1}
+    await transport.aclose()
+
+@pytest.mark.asyncio
+async def test_engine_hands_its_transport_to_flows_plans_and_agents(rpc_server):
+    transport = HttpTransport()
+    url = f"http://127.0.0.1:{rpc_server.server_address[1]}/"
+    # Facts logged by the flow are not under test (the real store embeds them)
+    engine = NoeticEngine(knowledge=MagicMock(), http=transport)
+    engine.skills.register(McpSkillAdapter(url, "echo", "Echo", {}))
+    engine.flow_manager.register({"id": "flow.echo", "start_at": "Echo", "states": {"Echo": {"skill": "mcp.echo", "params": {"msg": "hi"}}}})
+
+    state = WorldState(tick=0, entities={}, facts=[])
+    event = Event(id=uuid.uuid4(), type="cmd.run_flow", payload={"flow_id": "flow.echo", "run_id": "run-1"}, timestamp=datetime.utcnow())
+    await engine.cognitive.process_event(event, state)
+    assert transport.stats["requests"] == 1 and len(rpc_server.peers) == 1
+
+    agent = AgentContext(id="agent-1", system_prompt="", allowed_skills=["mcp.echo"], principles=[])
+    await engine.cognitive._execute_step(PlanStep(skill_id="mcp.echo", params={"msg": "plan"}), agent)
+    assert transport.stats["requests"] == 2
+
+    n8n = N8nAgent(AgentDefinition(id="n8n", name="n8n", description="", allowed_tools=["echo"]), webhook_url=url)
+    engine.mesh.register_agent(n8n)
+    assert n8n.transport is transport
+    await transport.aclose()
+
+@pytest.fixture
+def dropping_server():
+    # Reads each request, then closes the connection without answering
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    received = []
+
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                data = b""
+                while b"\r\n\r\n" not in data:
+                    chunk = conn.recv(4096)
+                    if not chunk:
+                        break
+                    data += chunk
+                received.append(data.split(b" ", 1)[0].decode())
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield f"http://127.0.0.1:{server.getsockname()[1]}/", received
+    server.close()
+
+@pytest.mark.asyncio
+async def test_dropped_posts_are_not_sent_twice(dropping_server):
+    url, received = dropping_server
+    transport = HttpTransport(retries=2, backoff=0.0)
+
+    with pytest.raises(httpx.RemoteProtocolError):
+        await transport.post(url, json={"method": "tools/call"})
+    assert received == ["POST"]
+
+    # Idempotent requests may be sent again
+    with pytest.raises(httpx.RemoteProtocolError):
+        await transport.get(url)
+    assert received == ["POST", "GET", "GET", "GET"]
+    await transport.aclose()
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import pytest
+from noetic_engine.skills import InputSkill, InputSource, SkillContext, SkillRegistry
+from noetic_engine.skills.inputs import InputQueue
+
+class Ticker(InputSkill):
+    id = "io.ticker"
+    description = "Pushes a tick every few milliseconds"
+    schema = {}
+    coalesce_types = ("mouse_move",)
+
+    def __init__(self):
+        self.cancelled = False
+
+    async def produce(self, source: InputSource):
+        try:
+            n = 0
+            while True:
+                source.push("tick", {"n": n})
+                source.push("mouse_move", {"x": n})
+                n += 1
+                await asyncio.sleep(0.005)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+def test_thread_producers_are_drained_in_arrival_order():
+    queue = InputQueue()
+    keyboard = queue.source("keyboard")
+    sensor = queue.source("sensor")
+
+    def produce(source, name):
+        for i in range(500):
+            source.push(name, {"i": i})
+
+    threads = [threading.Thread(target=produce, args=(keyboard, "key_down")),
+               threading.Thread(target=produce, args=(sensor, "reading"))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    events = queue.drain()
+    assert len(events) == 1000
+    assert [e.seq for e in events] == sorted(e.seq for e in events)
+    assert [e.payload["i"] for e in events if e.source == "keyboard"] == list(range(500))
+    assert queue.drain() == []
+
+def test_high_frequency_events_coalesce_to_the_latest():
+    queue = InputQueue()
+    mouse = queue.source("mouse", coalesce_types=["mouse_move"])
+    mouse.push("mouse_down", {"button": 1})
+    for x in range(100):
+        mouse.push("mouse_move", {"x": x})
+    fs = queue.source("fs")
+    fs.push("file_modified", {"path": "a.txt"}, coalesce_key="a.txt")
+    fs.push("file_modified", {"path": "b.txt"}, coalesce_key="b.txt")
+    fs.push("file_modified", {"path": "a.txt", "size": 2}, coalesce_key="a.txt")
+
+    events = queue.drain()
+    assert [(e.type, e.payload) for e in events] == [
+        ("mouse_down", {"button": 1}),
+        ("mouse_move", {"x": 99}),
+        ("file_modified", {"path": "b.txt"}),
+        ("file_modified", {"path": "a.txt", "size": 2}),
+    ]
+    assert queue.stats()["mouse"] == {"pushed": 101, "dropped": 0, "coalesced": 99, "pending": 0}
+
+def test_backpressure_drops_the_oldest_events_per_source():
+    queue = InputQueue()
+    flood = queue.source("flood", max_pending=10)
+    quiet = queue.source("quiet")
+    for i in range(25):
+        flood.push("reading", {"i": i})
+    quiet.push("key_down")
+
+    events = queue.drain()
+    assert [e.payload.get("i") for e in events if e.source == "flood"] == list(range(15, 25))
+    assert [e.type for e in events if e.source == "quiet"] == ["key_down"]
+    assert flood.dropped == 15 and quiet.dropped == 0
+
+    for i in range(3):
+        assert flood.push("move", coalesce_key=f"k{i}") is (i < 10)
+
+@pytest.mark.asyncio
+async def test_registry_runs_and_stops_input_producers():
+    registry = SkillRegistry()
+    ticker = Ticker()
+    registry.register(ticker)
+
+    assert registry.poll_inputs() == [] # Starts the producer
+    await asyncio.sleep(0.05)
+    events = registry.poll_inputs()
+    ticks = [e for e in events if e.type == "tick"]
+    assert len(ticks) >= 3
+    assert [e.type for e in events].count("mouse_move") == 1
+    assert events[-1].type == "mouse_move" # Coalesced, so placed at its latest push
+
+    result = await ticker.execute(SkillContext(agent_id="agent-1"))
+    assert result.data["pushed"] >= 2 * len(ticks)
+
+    await registry.stop_inputs()
+    assert ticker.cancelled is True
+
+    registry.register(ticker)
+    registry.poll_inputs()
+    await asyncio.sleep(0.02)
+    registry.unregister("io.ticker")
+    await asyncio.sleep(0)
+    assert "io.ticker" not in registry.inputs.sources
+    assert registry.poll_inputs() == []
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from noetic_stdlib.transport import HttpTransport
+from noetic_engine.skills import SkillRegistry, SkillContext
+from noetic_engine.skills.mcp_client import McpClient
+
+TOOLS = [
+    {"name": "echo", "description": "Echo text", "inputSchema": {"type": "object"}},
+    {"name": "upper", "description": "Upper-case text", "inputSchema": {"type": "object"}},
+]
+
+class StubMcpHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    wbufsize = -1
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.posts.append(body)
+        etag = f'"v{len(self.server.tools)}"'
+        if isinstance(body, dict) and body["method"] == "tools/list" and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        
+        messages = body if isinstance(body, list) else [body]
+        responses = [self.handle_rpc(m) for m in messages]
+        payload = json.dumps(responses if isinstance(body, list) else responses[0]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def handle_rpc(self, message):
+        if message["method"] == "tools/list":
+            return {"jsonrpc": "2.0", "id": message["id"], "result": {"tools": self.server.tools}}
+        name, args = message["params"]["name"], message["params"]["arguments"]
+        if name not in {t["name"] for t in self.server.tools}:
+            return {"jsonrpc": "2.0", "id": message["id"], "error": {"code": -32602, "message": f"Unknown tool {name}"}}
+        text = args["text"].upper() if name == "upper" else args["text"]
+        return {"jsonrpc": "2.0", "id": message["id"], "result": {"content": [{"type": "text", "text": text}]}}
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def mcp_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubMcpHandler)
+    server.posts = []
+    server.tools = list(TOOLS)
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.mark.asyncio
+async def test_discovery_registers_tools_and_batches_concurrent_calls(mcp_server):
+    transport = HttpTransport()
+    registry = SkillRegistry()
+    client = McpClient(mcp_server.url, transport=transport)
+    
+    assert await client.discover(registry) == ["mcp.echo", "mcp.upper"]
+    
+    ctx = SkillContext(agent_id="test")
+    mcp_server.posts.clear()
+    calls = asyncio.gather(
+        registry.get_skill("mcp.echo").execute(ctx, text="a"),
+        registry.get_skill("mcp.upper").execute(ctx, text="b"),
+        registry.get_skill("mcp.upper").execute(ctx, text="c"),
+    )
+    # The client holds the flush task while the batch is in flight
+    while not client._flush_tasks:
+        await asyncio.sleep(0)
+    results = await calls
+    
+    assert [r.data for r in results] == ["a", "B", "C"]
+    assert not client._flush_tasks
+    # One HTTP request carrying a three-call batch, with distinct ids
+    assert len(mcp_server.posts) == 1
+    assert len({m["id"] for m in mcp_server.posts[0]}) == 3
+    await transport.aclose()
+
+@pytest.mark.asyncio
+async def test_cached_catalog_is_used_then_revalidated(mcp_server, tmp_path):
+    transport = HttpTransport()
+    await McpClient(mcp_server.url, transport=transport, cache_dir=str(tmp_path)).discover(SkillRegistry())
+    
+    # A fresh cache registers tools without touching the network
+    mcp_server.posts.clear()
+    registry = SkillRegistry()
+    assert await McpClient(mcp_server.url, transport=transport, cache_dir=str(tmp_path)).discover(registry) == ["mcp.echo", "mcp.upper"]
+    assert mcp_server.posts == []
+    
+    # Revalidation: unchanged catalog -> 304; a removed tool is unregistered
+    client = McpClient(mcp_server.url, transport=transport, cache_dir=str(tmp_path))
+    assert await client.discover(registry, wait=True) == ["mcp.echo", "mcp.upper"]
+    mcp_server.tools = TOOLS[:1]
+    assert await client.discover(registry, wait=True) == ["mcp.echo"]
+    assert registry.get_skill("mcp.upper") is None
+    await transport.aclose()
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import queue
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from noetic_engine.skills import SkillRegistry, SkillContext
+from noetic_engine.skills.mcp_client import McpClient
+from noetic_engine.skills.mcp_transport import StdioMcpTransport
+
+# Minimal stdio MCP server: answers tools/call after `delay` seconds (so responses
+# can come back out of order) and exits on the "crash" tool.
+STDIO_SERVER = r'''
+import json, sys, threading, time
+
+lock = threading.Lock()
+
+def send(message):
+    with lock:
+        sys.stdout.write(json.dumps(message) + "\n")
+        sys.stdout.flush()
+
+def handle(message):
+    method = message.get("method")
+    if method == "initialize":
+        send({"jsonrpc": "2.0", "id": message["id"], "result": {"protocolVersion": "2024-11-05", "serverInfo": {"name": "stub"}, "capabilities": {}}})
+    elif method == "tools/list":
+        send({"jsonrpc": "2.0", "id": message["id"], "result": {"tools": [{"name": "sleep", "description": "", "inputSchema": {}}, {"name": "crash", "description": "", "inputSchema": {}}]}})
+    elif method == "tools/call":
+        args = message["params"]["arguments"]
+        if message["params"]["name"] == "crash":
+            sys.stdout.flush()
+            import os; os._exit(1)
+        time.sleep(args.get("delay", 0))
+        send({"jsonrpc": "2.0", "id": message["id"], "result": {"content": [{"type": "text", "text": str(args.get("tag"))}]}})
+
+for line in sys.stdin:
+    message = json.loads(line)
+    if "id" in message:
+        threading.Thread(target=handle, args=(message,)).start()
+'''
+
+@pytest.mark.asyncio
+async def test_stdio_session_multiplexes_and_restarts(tmp_path):
+    script = tmp_path / "server.py"
+    script.write_text(STDIO_SERVER)
+    client = McpClient.stdio([sys.executable, str(script)])
+    registry = SkillRegistry()
+    await client.discover(registry)
+    sleep = registry.get_skill("mcp.sleep")
+    ctx = SkillContext(agent_id="test")
+
+    # The slow call answers last; each response still reaches its own caller
+    results = await asyncio.gather(
+        sleep.execute(ctx, tag="slow", delay=0.2),
+        sleep.execute(ctx, tag="fast", delay=0.0),
+    )
+    assert [r.data for r in results] == ["slow", "fast"]
+    
+    crashed = await registry.get_skill("mcp.crash").execute(ctx)
+    assert not crashed.success
+    # The next call starts a new server process
+    assert (await sleep.execute(ctx, tag="again")).data == "again"
+    assert client.connection.connects == 2
+    await client.close()
+
+class SseHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        self.wfile.write(b"event: endpoint\ndata: /messages\n\n")
+        self.wfile.flush()
+        while True:
+            message = self.server.outbox.get()
+            if message is None:
+                return
+            self.wfile.write(f"event: message\ndata: {json.dumps(message)}\n\n".encode())
+            self.wfile.flush()
+
+    def do_POST(self):
+        message = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.send_response(202)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        if "id" not in message:
+            return
+        if message["method"] == "initialize":
+            result = {"protocolVersion": "2024-11-05", "serverInfo": {"name": "sse-stub"}, "capabilities": {}}
+        elif message["method"] == "tools/list":
+            result = {"tools": [{"name": "echo", "description": "", "inputSchema": {}}]}
+        else:
+            result = {"content": [{"type": "text", "text": message["params"]["arguments"]["text"]}]}
+        self.server.outbox.put({"jsonrpc": "2.0", "id": message["id"], "result": result})
+
+    def log_message(self, *args):
+        pass
+
+@pytest.mark.asyncio
+async def test_sse_session_routes_streamed_responses():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SseHandler)
+    server.daemon_threads = True
+    server.outbox = queue.Queue()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = McpClient.sse(f"http://127.0.0.1:{server.server_address[1]}/sse")
+        registry = SkillRegistry()
+        assert await client.discover(registry) == ["mcp.echo"]
+        echo = registry.get_skill("mcp.echo")
+        results = await asyncio.gather(*(echo.execute(SkillContext(agent_id="t"), text=str(i)) for i in range(5)))
+        assert [r.data for r in results] == ["0", "1", "2", "3", "4"]
+        assert client.connection.server_info == {"name": "sse-stub"}
+        await client.close()
+    finally:
+        server.outbox.put(None)
+        server.shutdown()
+        server.server_close()
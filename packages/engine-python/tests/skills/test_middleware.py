@@ -0,0 +1,115 @@
+import asyncio
+import time
+import pytest
+from noetic_engine.skills import Skill, SkillResult, SkillContext, SkillRegistry, ExecutionPolicy
+from noetic_engine.skills.middleware import CircuitBreaker, LatencyHistogram
+
+CONTEXT = SkillContext(agent_id="agent-1")
+
+class ScriptedSkill(Skill):
+    description = "Sleeps, then succeeds or fails as told"
+    schema = {}
+
+    def __init__(self, id: str, delay: float = 0.0, succeed: bool = True, policy: ExecutionPolicy = None):
+        self.id = id
+        self.delay = delay
+        self.succeed = succeed
+        self._policy = policy
+        self.calls = 0
+        self.running = 0
+        self.peak = 0
+
+    @property
+    def execution_policy(self):
+        return self._policy
+
+    async def execute(self, context, **kwargs):
+        self.calls += 1
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        if not self.succeed:
+            return SkillResult(success=False, error="upstream error")
+        return SkillResult(success=True, data=self.id)
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_and_measured_latency():
+    registry = SkillRegistry()
+    skill = ScriptedSkill("skill.slow", delay=0.05, policy=ExecutionPolicy(max_concurrency=2))
+    registry.register(skill)
+
+    results = await asyncio.gather(*(registry.execute(skill, CONTEXT, {}) for _ in range(6)))
+
+    assert skill.peak == 2
+    assert all(r.success for r in results)
+    assert min(r.latency_ms for r in results) >= 45
+    stats = registry.stats("skill.slow")
+    assert stats["calls"] == 6
+    assert stats["latency"]["count"] == 6
+    assert stats["latency"]["p99_ms"] >= 100 # The last pair waited for two rounds
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_hung_skills():
+    registry = SkillRegistry()
+    hung = ScriptedSkill("skill.hung", delay=30)
+    registry.register(hung)
+    registry.set_policy("skill.hung", ExecutionPolicy(timeout=0.1))
+
+    started = time.monotonic()
+    result = await registry.execute(hung, CONTEXT, {})
+
+    assert time.monotonic() - started < 1
+    assert result.success is False
+    assert "timed out" in result.error
+    assert hung.running == 0 # Cancelled, not left running
+    assert registry.stats("skill.hung")["errors"] == {"timeout": 1}
+
+@pytest.mark.asyncio
+async def test_open_breaker_routes_to_fallback_then_recovers():
+    registry = SkillRegistry()
+    flaky = ScriptedSkill("skill.remote", succeed=False,
+                          policy=ExecutionPolicy(failure_rate=0.5, window=4, min_calls=4, cooldown=0.1, fallback="skill.local"))
+    local = ScriptedSkill("skill.local")
+    registry.register(flaky)
+    registry.register(local)
+
+    for _ in range(4):
+        result = await registry.execute(flaky, CONTEXT, {})
+        assert result.success is False
+    assert registry.stats("skill.remote")["breaker"] == "open"
+
+    # Open: the remote skill is not called, the fallback answers
+    result = await registry.execute(flaky, CONTEXT, {})
+    assert flaky.calls == 4
+    assert result.data == "skill.local"
+    assert result.metadata["fallback_for"] == "skill.remote"
+
+    # After the cooldown one trial call goes through and closes the breaker
+    await asyncio.sleep(0.15)
+    flaky.succeed = True
+    result = await registry.execute(flaky, CONTEXT, {})
+    assert result.data == "skill.remote"
+    stats = registry.stats("skill.remote")
+    assert stats["breaker"] == "closed"
+    assert stats["rejected"] == 1 and stats["fallbacks"] == 1
+    assert stats["errors"] == {"failure": 4, "rejected": 1}
+
+def test_half_open_breaker_allows_a_single_trial():
+    breaker = CircuitBreaker(failure_rate=1.0, window=2, min_calls=2, cooldown=0)
+    breaker.record(False)
+    breaker.record(False)
+    assert breaker.allow() is True # Cooldown elapsed: the trial
+    assert breaker.allow() is False
+    breaker.record(False)
+    assert breaker.state == "open"
+
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for latency in [3] * 90 + [400] * 10:
+        histogram.record(latency)
+    assert histogram.percentile(50) == 5
+    assert histogram.percentile(95) == 400
+    assert histogram.to_dict()["buckets"] == {5: 90, 500: 10}
@@ -0,0 +1,113 @@
+import asyncio
+import sys
+import time
+import pytest
+from noetic_conscience.contracts import AgenticIntentContract, AICHeader, AICCapabilityScopes, AICSafetyGuardrails, AICUserPreferences
+from noetic_stdlib.agents import LocalAgent, AgentDefinition
+from noetic_stdlib.process import ProcessPool, command_argv
+
+CONTRACT = AgenticIntentContract(
+    header=AICHeader(user_id="u1", origin_device="cli"),
+    scopes=AICCapabilityScopes(allowed_tools=["run_command"]),
+    safety=AICSafetyGuardrails(),
+    preferences=AICUserPreferences()
+)
+
+def local_agent(pool: ProcessPool) -> LocalAgent:
+    return LocalAgent(AgentDefinition(id="local", name="Local", description="", allowed_tools=["run_command"]), pool=pool)
+
+def test_plain_commands_are_exec_d_without_a_shell():
+    assert command_argv("git status --short") == ["git", "status", "--short"]
+    assert command_argv("echo 'hello world'") == ["echo", "hello world"]
+    assert command_argv(["ls", "-l"]) == ["ls", "-l"]
+    for command in ("ls | wc -l", "echo $HOME", "rm *.tmp", "cd /tmp", "FOO=1 env", "a && b", "cat < in"):
+        assert command_argv(command) is None, command
+
+@pytest.mark.asyncio
+async def test_pool_bounds_concurrent_processes():
+    pool = ProcessPool(max_processes=2)
+    peak = 0
+
+    async def run():
+        nonlocal peak
+        async with pool.spawn([sys.executable, "-c", "import time; time.sleep(0.2)"]) as process:
+            peak = max(peak, pool.running)
+            await process.wait()
+
+    started = time.monotonic()
+    await asyncio.gather(*(run() for _ in range(4)))
+    assert peak == 2
+    assert time.monotonic() - started >= 0.4
+    assert pool.stats["exec"] == 4
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_timeouts_cancellation_and_limits_kill_the_command():
+    pool = ProcessPool(timeout=0.3)
+    agent = local_agent(pool)
+
+    started = time.monotonic()
+    result = await agent.execute("run_command", {"argv": [sys.executable, "-c", "import time; time.sleep(30)"]}, CONTRACT)
+    assert time.monotonic() - started < 5
+    assert result["timed_out"] is True
+    assert result["status"] == "failed"
+    assert pool.stats["timeouts"] == 1
+
+    # Cancelling the caller kills the command and frees its slot
+    task = asyncio.create_task(agent.execute("run_command", {"command": f"{sys.executable} -c 'import time; time.sleep(30)'", "timeout": 60}, CONTRACT))
+    await asyncio.sleep(0.2)
+    assert pool.running == 1
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert pool.running == 0
+    assert pool.stats["killed"] == 1
+
+    limited = local_agent(ProcessPool(memory_bytes=512 * 1024 * 1024))
+    result = await limited.execute("run_command", {"argv": [sys.executable, "-c", "x = bytearray(1024 * 1024 * 1024)"]}, CONTRACT)
+    assert result["returncode"] != 0
+    assert "MemoryError" in result["stderr"]
+    await pool.close()
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(sys.platform == "win32", reason="resource limits are POSIX only")
+@pytest.mark.parametrize("prlimit", [True, False])
+async def test_limits_are_set_without_a_preexec_hook(monkeypatch, prlimit):
+    import resource
+    if not prlimit:
+        monkeypatch.delattr(resource, "prlimit", raising=False)
+    elif not hasattr(resource, "prlimit"):
+        pytest.skip("resource.prlimit is Linux only")
+    spawned = []
+    original = asyncio.create_subprocess_exec
+    async def record(*args, **kwargs):
+        spawned.append(kwargs)
+        return await original(*args, **kwargs)
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", record)
+
+    pool = ProcessPool(cpu_seconds=30, memory_bytes=1024 * 1024 * 1024)
+    agent = local_agent(pool)
+    probe = "import resource; print(resource.getrlimit(resource.RLIMIT_CPU)[0], resource.getrlimit(resource.RLIMIT_AS)[0])"
+    for params in ({"argv": [sys.executable, "-c", probe]}, {"command": f"{sys.executable} -c '{probe}' | cat"}):
+        result = await agent.execute("run_command", params, CONTRACT)
+        assert result["stdout"].split() == ["30", str(1024 * 1024 * 1024)], result
+    assert spawned and all("preexec_fn" not in kwargs for kwargs in spawned)
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_warm_workers_run_python_commands():
+    pool = ProcessPool(warm_workers=1)
+    await pool.start()
+    agent = local_agent(pool)
+
+    result = await agent.execute("run_command", {"argv": [sys.executable, "-c", "import sys; print(sys.argv[1:])", "a", "b"]}, CONTRACT)
+    assert result["stdout"].strip() == "['a', 'b']"
+    assert pool.stats["warm"] == 1
+
+    failing = await agent.execute("run_command", {"argv": [sys.executable, "-c", "raise SystemExit(3)"]}, CONTRACT)
+    assert failing["returncode"] == 3
+
+    # Other commands are not sent to the interpreters
+    await agent.execute("run_command", {"command": "true"}, CONTRACT)
+    assert pool.stats["exec"] == 1
+    await pool.close()
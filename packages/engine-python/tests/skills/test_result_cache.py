@@ -0,0 +1,193 @@
+import asyncio
+import hashlib
+import uuid
+import pytest
+import chromadb
+from chromadb import EmbeddingFunction, Documents, Embeddings
+from noetic_knowledge import KnowledgeStore
+from noetic_engine.skills import Skill, SkillResult, SkillContext, CachePolicy, SkillResultCache
+
+class CountingSkill(Skill):
+    description = "Counts its executions"
+    schema = {}
+
+    def __init__(self, id: str = "skill.count", policy: CachePolicy = None, delay: float = 0.0, succeed: bool = True):
+        self.id = id
+        self._policy = policy
+        self.delay = delay
+        self.succeed = succeed
+        self.calls = 0
+
+    @property
+    def cache_policy(self):
+        return self._policy
+
+    async def execute(self, context, **kwargs):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if not self.succeed:
+            return SkillResult(success=False, error="boom")
+        return SkillResult(success=True, data={"n": self.calls, "args": kwargs})
+
+class HashEmbedding(EmbeddingFunction):
+    """
+    Deterministic offline embedding so tests don't download a model.
+    """
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def name() -> str:
+        return "test-hash"
+
+    def __call__(self, input: Documents) -> Embeddings:
+        return [[b / 255.0 for b in hashlib.sha256(t.encode()).digest()[:16]] for t in input]
+
+CONTEXT = SkillContext(agent_id="agent-1")
+
+@pytest.mark.asyncio
+async def test_pure_results_are_reused_with_hit_metadata():
+    cache = SkillResultCache()
+    skill = CountingSkill(policy=CachePolicy(pure=True))
+
+    first = await cache.run(skill, CONTEXT, {"a": 1, "b": [1, 2]})
+    second = await cache.run(skill, CONTEXT, {"b": [1, 2], "a": 1}) # Same arguments, other order
+
+    assert skill.calls == 1
+    assert first.metadata["cache_hit"] is False
+    assert second.metadata["cache_hit"] is True
+    assert second.data == first.data
+
+    # Mutating a returned result does not corrupt the cache
+    second.data["n"] = 99
+    third = await cache.run(skill, CONTEXT, {"a": 1, "b": [1, 2]})
+    assert third.data["n"] == 1
+
+    await cache.run(skill, CONTEXT, {"a": 2, "b": [1, 2]})
+    assert skill.calls == 2
+
+@pytest.mark.asyncio
+async def test_uncached_skills_failures_and_expired_entries_execute():
+    cache = SkillResultCache()
+    plain = CountingSkill()
+    await cache.run(plain, CONTEXT, {})
+    result = await cache.run(plain, CONTEXT, {})
+    assert plain.calls == 2
+    assert result.metadata == {}
+
+    failing = CountingSkill(policy=CachePolicy(pure=True), succeed=False)
+    await cache.run(failing, CONTEXT, {})
+    await cache.run(failing, CONTEXT, {})
+    assert failing.calls == 2
+
+    expiring = CountingSkill(policy=CachePolicy(ttl=0.05))
+    await cache.run(expiring, CONTEXT, {})
+    await cache.run(expiring, CONTEXT, {})
+    assert expiring.calls == 1
+    await asyncio.sleep(0.06)
+    await cache.run(expiring, CONTEXT, {})
+    assert expiring.calls == 2
+
+@pytest.mark.asyncio
+async def test_lru_and_size_bounds():
+    cache = SkillResultCache(max_entries=2)
+    skill = CountingSkill(policy=CachePolicy(pure=True))
+    for x in (1, 2):
+        await cache.run(skill, CONTEXT, {"x": x})
+    await cache.run(skill, CONTEXT, {"x": 1}) # 1 becomes most recently used
+    await cache.run(skill, CONTEXT, {"x": 3}) # Evicts 2
+    assert len(cache) == 2
+    assert cache.stats["evictions"] == 1
+
+    calls = skill.calls
+    await cache.run(skill, CONTEXT, {"x": 1})
+    assert skill.calls == calls
+    await cache.run(skill, CONTEXT, {"x": 2})
+    assert skill.calls == calls + 1
+
+    small = SkillResultCache(max_bytes=10)
+    await small.run(skill, CONTEXT, {"x": "too large to keep"})
+    assert len(small) == 0
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_execution():
+    cache = SkillResultCache()
+    skill = CountingSkill(policy=CachePolicy(pure=True), delay=0.05)
+
+    results = await asyncio.gather(*(cache.run(skill, CONTEXT, {"q": "same"}) for _ in range(5)))
+
+    assert skill.calls == 1
+    assert [r.metadata["cache_hit"] for r in results].count(False) == 1
+    assert cache.stats["coalesced"] == 4
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_sharing_a_failure_are_not_cache_hits():
+    cache = SkillResultCache()
+    skill = CountingSkill(policy=CachePolicy(pure=True), delay=0.05, succeed=False)
+
+    results = await asyncio.gather(*(cache.run(skill, CONTEXT, {"q": "same"}) for _ in range(3)))
+
+    assert skill.calls == 1
+    assert all(not r.success and r.error == "boom" for r in results)
+    assert [r.metadata["cache_hit"] for r in results] == [False, False, False]
+    assert cache.stats["hits"] == 0 and len(cache) == 0
+
+@pytest.mark.asyncio
+async def test_ingested_facts_invalidate_declared_predicates():
+    store = KnowledgeStore(db_url="sqlite:///:memory:", chroma_client=chromadb.EphemeralClient(),
+                           collection_name=f"facts_{uuid.uuid4().hex}", embedding_function=HashEmbedding())
+    cache = SkillResultCache()
+    store.add_fact_listener(cache.on_fact)
+    weather = CountingSkill("skill.weather", policy=CachePolicy(pure=True, invalidate_on=["location"]))
+    anything = CountingSkill("skill.any", policy=CachePolicy(pure=True, invalidate_on=["*"]))
+    context = SkillContext(agent_id="agent-1", store=store)
+
+    for skill in (weather, anything):
+        await cache.run(skill, context, {})
+        await cache.run(skill, context, {})
+    assert (weather.calls, anything.calls) == (1, 1)
+
+    store.ingest_fact(subject_id=uuid.uuid4(), predicate="mood", object_literal="calm")
+    await cache.run(weather, context, {})
+    await cache.run(anything, context, {})
+    assert (weather.calls, anything.calls) == (1, 2)
+
+    store.ingest_fact(subject_id=uuid.uuid4(), predicate="location", object_literal="Paris")
+    await cache.run(weather, context, {})
+    assert weather.calls == 2
+
+@pytest.mark.asyncio
+async def test_folded_episodes_invalidate_recall_results():
+    store = KnowledgeStore(db_url="sqlite:///:memory:", chroma_client=chromadb.EphemeralClient(),
+                           collection_name=f"facts_{uuid.uuid4().hex}", embedding_function=HashEmbedding())
+    cache = SkillResultCache()
+    store.add_fact_listener(cache.on_fact)
+    recall = CountingSkill("skill.recall", policy=CachePolicy(pure=True, invalidate_on=["*"]))
+    context = SkillContext(agent_id="agent-1", store=store)
+
+    async def summarize(logs):
+        return " / ".join(logs)
+    store.summarizer = summarize
+    subject = uuid.uuid4()
+    for step in ("woke", "ate", "slept"):
+        store.ingest_fact(subject_id=subject, predicate="episodic_log", object_literal=step, allow_multiple=True)
+
+    await cache.run(recall, context, {})
+    await store._fold_episodes()
+    await cache.run(recall, context, {})
+    assert recall.calls == 2
+
+@pytest.mark.asyncio
+async def test_results_invalidated_while_running_are_not_stored():
+    cache = SkillResultCache()
+    skill = CountingSkill(policy=CachePolicy(pure=True, invalidate_on=["location"]), delay=0.05)
+
+    running = asyncio.create_task(cache.run(skill, CONTEXT, {}))
+    await asyncio.sleep(0.01)
+    cache.invalidate_predicate("location")
+    await running
+
+    assert len(cache) == 0
+    await cache.run(skill, CONTEXT, {})
+    assert skill.calls == 2
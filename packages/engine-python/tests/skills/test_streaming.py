@@ -0,0 +1,131 @@
+import asyncio
+import sys
+import time
+import pytest
+from noetic_conscience.contracts import AgenticIntentContract, AICHeader, AICCapabilityScopes, AICSafetyGuardrails, AICUserPreferences
+from noetic_knowledge.working.stack import MemoryStack
+from noetic_stage.reflex import ReflexManager
+from noetic_stdlib.agents import LocalAgent, AgentDefinition
+from noetic_engine.runtime.mesh import MeshOrchestrator
+from noetic_engine.skills import Skill, SkillChunk, SkillContext, SkillResult
+from noetic_engine.skills.streaming import MemoryStackSink, UiStreamSink, run_stream
+
+CONTRACT = AgenticIntentContract(
+    header=AICHeader(user_id="u1", origin_device="cli"),
+    scopes=AICCapabilityScopes(allowed_tools=["run_command"]),
+    safety=AICSafetyGuardrails(),
+    preferences=AICUserPreferences()
+)
+
+def local_agent(**kwargs) -> LocalAgent:
+    return LocalAgent(AgentDefinition(id="local", name="Local", description="", allowed_tools=["run_command"]), **kwargs)
+
+def python_command(code: str) -> str:
+    return f'"{sys.executable}" -c "{code}"'
+
+@pytest.mark.asyncio
+async def test_local_agent_streams_output_before_the_command_ends():
+    agent = local_agent()
+    command = python_command("import sys, time; print('first', flush=True); time.sleep(0.5); print('second'); print('oops', file=sys.stderr)")
+
+    started = time.monotonic()
+    first_chunk_at = None
+    items = []
+    async for item in agent.execute_stream("run_command", {"command": command}, CONTRACT):
+        if first_chunk_at is None:
+            first_chunk_at = time.monotonic() - started
+        items.append(item)
+
+    chunks, result = items[:-1], items[-1]
+    assert first_chunk_at < 0.4
+    assert "".join(c["data"] for c in chunks if c["stream"] == "stdout").split() == ["first", "second"]
+    assert result["status"] == "success"
+    assert result["stdout"].split() == ["first", "second"]
+    assert result["stderr"].strip() == "oops"
+    assert result["truncated"] is False
+
+@pytest.mark.asyncio
+async def test_local_agent_keeps_a_bounded_tail_and_kills_abandoned_commands():
+    agent = local_agent(chunk_size=1024, max_output=100)
+    result = await agent.execute("run_command", {"command": python_command("print('x' * 100000 + 'END')")}, CONTRACT)
+    assert result["returncode"] == 0
+    assert len(result["stdout"]) == 100
+    assert result["stdout"].rstrip().endswith("END")
+    assert result["truncated"] is True
+
+    stream = agent.execute_stream("run_command", {"command": python_command("import time; print('go', flush=True); time.sleep(30)")}, CONTRACT)
+    started = time.monotonic()
+    first = await stream.__anext__()
+    assert first["data"].strip() == "go"
+    await stream.aclose()
+    assert time.monotonic() - started < 5
+
+@pytest.mark.asyncio
+async def test_mesh_routes_streams_after_the_scope_check():
+    mesh = MeshOrchestrator()
+    mesh.register_agent(local_agent())
+    items = [item async for item in mesh.route_intent_stream("local", "run_command", {"command": python_command("print(42)")}, CONTRACT)]
+    assert items[-1]["stdout"].strip() == "42"
+
+    with pytest.raises(PermissionError):
+        async for _ in mesh.route_intent_stream("local", "rm_rf", {}, CONTRACT):
+            pass
+
+class CountdownSkill(Skill):
+    id = "skill.countdown"
+    description = "Streams a countdown"
+    schema = {}
+
+    async def execute(self, context, **kwargs):
+        return SkillResult(success=True)
+
+    async def execute_stream(self, context, n: int = 3, **kwargs):
+        for i in range(n, 0, -1):
+            yield SkillChunk(data=f"{i}\n")
+            await asyncio.sleep(0)
+        yield SkillResult(success=True, data={"counted": n})
+
+@pytest.mark.asyncio
+async def test_run_stream_feeds_memory_stack_and_ui():
+    skill = CountdownSkill()
+    assert skill.streams is True
+    stack = MemoryStack()
+    stack.push_frame(goal="count")
+    manager = ReflexManager()
+
+    result = await run_stream(skill, SkillContext(agent_id="a"), {"n": 3}, [MemoryStackSink(stack), UiStreamSink(manager, max_chars=4)])
+
+    assert result.data == {"counted": 3}
+    assert result.metadata["chunks"] == 3
+    assert [log.content for log in stack.current_frame.logs] == ["3\n", "2\n", "1\n"]
+    assert stack.current_frame.logs[0].metadata == {"skill_id": "skill.countdown", "stream": "output", "seq": 0}
+    assert manager.local_state["streams"]["skill.countdown"] == {"output": "2\n1\n", "done": True, "success": True}
+
+    # Non-streaming skills yield their single result
+    class Plain(Skill):
+        id = "skill.plain"
+        description = ""
+        schema = {}
+        async def execute(self, context, **kwargs):
+            return SkillResult(success=True, data=1)
+
+    assert Plain().streams is False
+    result = await run_stream(Plain(), SkillContext(agent_id="a"), {})
+    assert result.data == 1 and result.metadata["chunks"] == 0
+
+@pytest.mark.asyncio
+async def test_flows_stream_to_the_engines_memory_stack_and_ui():
+    from noetic_engine.runtime.engine import NoeticEngine
+    from noetic_knowledge import WorldState
+    engine = NoeticEngine()
+    engine.skills.register(CountdownSkill())
+    engine.flow_manager.register({"id": "flow.count", "start_at": "Count", "states": {"Count": {"skill": "skill.countdown", "params": {"n": 2}}}})
+
+    result = await engine.flow_manager.get_executor("flow.count").step({}, WorldState(tick=0, entities={}, facts=[]), skill_context=SkillContext(agent_id="a"))
+
+    assert result["results"]["Count"].metadata["chunks"] == 2
+    assert [log.content for log in engine.memory.current_frame.logs] == ["2\n", "1\n"]
+    assert engine.reflex.manager.local_state["streams"]["skill.countdown"]["output"] == "2\n1\n"
+    # Plans stream to the same sinks
+    assert engine.cognitive.stream_sinks is engine.flow_manager.stream_sinks
+    await engine.http.aclose()
@@ -1,5 +1,10 @@
+import asyncio
+import json
 import os
+import time
 import pytest
+from unittest.mock import MagicMock
+from noetic_engine.codex_reader import CodexReader
 from noetic_engine.loader import NoeticLoader
 from noetic_engine.runtime.engine import NoeticEngine
 
@@ -41,3 +46,76 @@ def test_load_codex():
     # Assert Skills
     assert engine.skills.get_skill("skill.http.request") is not None
     assert engine.skills.get_skill("skill.http.request").description == "Perform an external API call."
+
+def write_codex(path, facts: int):
+    codex = {
+        "knowledge": {
+            "ontology": {"entities": []},
+            "initial_state": [[f"project.p{i}", "status", "active"] for i in range(facts)] + [["broken"]]
+        },
+        "skills": [{"id": "skill.custom.notify", "description": "Notify"}],
+        "orchestration": {
+            "flows": [
+                {"id": "flow.notify", "start_at": "Notify", "states": {"Notify": {"skill": "skill.custom.notify"}}},
+                {"id": "flow.broken", "start_at": "Missing", "states": {}}
+            ]
+        }
+    }
+    path.write_text(json.dumps(codex, indent=1))
+    return codex
+
+def test_codex_reader_streams_the_initial_facts(tmp_path):
+    path = tmp_path / "pack.noetic"
+    codex = write_codex(path, 50)
+    for chunk_size in (1, 7, 1 << 16):
+        reader = CodexReader(str(path), chunk_size=chunk_size)
+        data, total = reader.sections()
+        assert total == 51 and "initial_state" not in data["knowledge"]
+        assert data["orchestration"] == codex["orchestration"]
+        assert list(reader.facts()) == codex["knowledge"]["initial_state"]
+
+@pytest.mark.asyncio
+async def test_load_async_serves_before_the_knowledge_is_ingested(tmp_path):
+    path = tmp_path / "pack.noetic"
+    write_codex(path, 40)
+    engine = NoeticEngine()
+    # Records the ingested facts (the real store embeds them through the network)
+    engine.knowledge = MagicMock()
+    reports = []
+
+    ingestion = await NoeticLoader().load_async(engine, str(path), batch_size=10, on_progress=lambda i: reports.append(i.ingested))
+
+    # Ready: definitions registered, flows not compiled yet, no fact ingested
+    assert engine.skills.get_skill("skill.custom.notify") is not None
+    assert set(engine.flow_manager._pending) == {"flow.notify", "flow.broken"}
+    assert ingestion.total == 41 and ingestion.ingested == 0
+
+    assert engine.flow_manager.get_executor("flow.notify") is not None
+    assert engine.flow_manager.get_executor("flow.broken") is None # Invalid: logged on first use
+
+    await ingestion.wait()
+    assert ingestion.stats() == {"total": 41, "ingested": 40, "failed": 1, "progress": 1.0, "done": True}
+    assert reports[:4] == [10, 20, 30, 40] and reports[-1] == 40
+    # Each fact, and the `name` of its subject
+    assert engine.knowledge.ingest_fact.call_count == 80
+    assert engine.knowledge.ingest_fact.call_args_list[-1].kwargs["object_literal"] == "project.p39"
+
+@pytest.mark.asyncio
+async def test_ingestion_keeps_the_event_loop_responsive(tmp_path):
+    path = tmp_path / "pack.noetic"
+    write_codex(path, 100)
+    engine = NoeticEngine()
+    engine.knowledge = MagicMock()
+    # A slow store: 200 ingests of 2 ms, well past the time budget
+    engine.knowledge.ingest_fact.side_effect = lambda *args, **kwargs: time.sleep(0.002)
+
+    ingestion = await NoeticLoader().load_async(engine, str(path))
+    gaps = []
+    while not ingestion.done:
+        before = time.monotonic()
+        await asyncio.sleep(0)
+        gaps.append(time.monotonic() - before)
+    await ingestion.wait()
+
+    assert ingestion.ingested == 100
+    assert len(gaps) > 10 and max(gaps) < 0.05
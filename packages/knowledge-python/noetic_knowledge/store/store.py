@@ -1,4 +1,4 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable
 from uuid import UUID, uuid4
 from datetime import datetime
 from sqlalchemy import create_engine, select, and_, or_
@@ -19,27 +19,41 @@ from .models import Base, EntityModel, FactModel, TagModel
 from .schema import WorldState, Entity, Fact
 
 class KnowledgeStore:
-    def __init__(self, db_url: str = "sqlite:///noetic.db", vector_db_path: Optional[str] = None, collection_name: str = "knowledge_facts"):
+    def __init__(self, db_url: str = "sqlite:///noetic.db", vector_db_path: Optional[str] = None, collection_name: str = "knowledge_facts",
+                 sql_engine: Optional[Any] = None, chroma_client: Optional[Any] = None, embedding_function: Optional[Any] = None):
+        """
+        :param sql_engine: Optional pre-built SQLAlchemy engine. When given, `db_url` is ignored and the
+            engine (and its connection pool) is shared with other stores, e.g. one tenant per schema.
+        :param chroma_client: Optional shared ChromaDB client. Each store still gets its own collection.
+        :param embedding_function: Optional Chroma embedding function, shared across stores that use it.
+        """
         self.db_url = db_url
+        if sql_engine is not None:
+            self.engine = sql_engine
         # Use StaticPool for in-memory if requested, but file-based is safer for concurrency
-        if db_url == "sqlite:///:memory:":
+        elif db_url == "sqlite:///:memory:":
             from sqlalchemy.pool import StaticPool
             self.engine = create_engine(db_url, echo=False, connect_args={"check_same_thread": False}, poolclass=StaticPool)
         else:
             self.engine = create_engine(db_url, echo=False, connect_args={"check_same_thread": False})
-        
+
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
-        
+
         # Initialize DB (Auto-migration for now)
         Base.metadata.create_all(bind=self.engine)
-        
+
         # Initialize ChromaDB
-        if vector_db_path:
+        if chroma_client is not None:
+            self.chroma_client = chroma_client
+        elif vector_db_path:
             self.chroma_client = chromadb.PersistentClient(path=vector_db_path)
         else:
             self.chroma_client = chromadb.EphemeralClient()
-            
-        self.collection = self.chroma_client.get_or_create_collection(name=collection_name)
+
+        if embedding_function is not None:
+            self.collection = self.chroma_client.get_or_create_collection(name=collection_name, embedding_function=embedding_function)
+        else:
+            self.collection = self.chroma_client.get_or_create_collection(name=collection_name)
 
         # Initialize Graph Cache
         self.graph = nx.MultiDiGraph()
@@ -47,10 +61,25 @@ class KnowledgeStore:
         
         self.summarizer = None # Callable[[List[str]], Awaitable[str]]
         self.sources: Dict[str, KnowledgeSource] = {}
+        self.fact_listeners: List[Callable[[Fact], None]] = []
 
     def add_source(self, name: str, source: KnowledgeSource):
         self.sources[name] = source
 
+    def add_fact_listener(self, listener: Callable[[Fact], None]):
+        """
+        Registers a callback run with every newly ingested fact (e.g. to invalidate caches).
+        """
+        self.fact_listeners.append(listener)
+
+    def _notify_fact(self, fact: Fact):
+        for listener in self.fact_listeners:
+            try:
+                listener(fact)
+            except Exception as e:
+                import logging
+                logging.getLogger("noetic.knowledge").error(f"Fact listener failed: {e}")
+
     async def source_knowledge(self, query: str):
         """
         Queries external sources and ingests results.
@@ -116,6 +145,7 @@ class KnowledgeStore:
             
             # 3. Process groups
             timestamp = datetime.utcnow()
+            folded = []
             for (subject_id, predicate), subject_logs in grouped.items():
                 target_predicate = fold_targets[predicate]
                 
@@ -128,6 +158,7 @@ class KnowledgeStore:
                     for log in subject_logs:
                         log.valid_until = timestamp
                         session.add(log)
+                        folded.append(log)
                     
                     # Create Summary Fact
                     new_fact = FactModel(
@@ -137,11 +168,16 @@ class KnowledgeStore:
                         valid_from=timestamp
                     )
                     session.add(new_fact)
+                    folded.append(new_fact)
             
             session.commit()
             
             # Refresh Graph Cache (lazy way)
             self._load_graph_cache()
+
+            # Archived logs and their summaries change what recall returns
+            for model in folded:
+                self._notify_fact(self._map_fact_model_to_schema(model))
             
         except Exception as e:
             session.rollback()
@@ -289,19 +325,7 @@ class KnowledgeStore:
             fact_schema = self._map_fact_model_to_schema(new_fact)
 
             # 5. Ingest into ChromaDB
-            # Text representation: "Subject predicate Object"
-            obj_str = str(object_entity_id) if object_entity_id else str(object_literal)
-            doc_text = f"Fact: {predicate} {obj_str}" # Focus on predicate and object for search
-            
-            metadata = {
-                "subject_id": str(subject_id),
-                "predicate": predicate,
-                "object": obj_str,
-                "type": "fact",
-                "valid_from": now.isoformat(),
-                "confidence": confidence,
-                "source_type": source_type
-            }
+            doc_text, metadata = self._vector_document(new_fact)
             
             self.collection.add(
                 documents=[doc_text],
@@ -311,6 +335,8 @@ class KnowledgeStore:
             
             # 6. Update Graph Cache
             self._add_fact_to_graph(fact_schema)
+
+            self._notify_fact(fact_schema)
             
             return fact_schema
             
@@ -320,6 +346,41 @@ class KnowledgeStore:
         finally:
             session.close()
 
+    def reindex(self, batch_size: int = 1000) -> int:
+        """
+        Rebuilds the vector collection from the active facts in SQL, e.g. after the
+        collection was dropped to free memory. Returns how many facts were indexed.
+        """
+        session = self._get_session()
+        try:
+            facts = session.execute(select(FactModel).where(FactModel.valid_until.is_(None))).scalars().all()
+            for start in range(0, len(facts), batch_size):
+                batch = facts[start:start + batch_size]
+                documents = [self._vector_document(fact) for fact in batch]
+                self.collection.upsert(
+                    documents=[doc for doc, _ in documents],
+                    metadatas=[metadata for _, metadata in documents],
+                    ids=[str(fact.id) for fact in batch]
+                )
+            return len(facts)
+        finally:
+            session.close()
+
+    def _vector_document(self, model: FactModel):
+        # Text representation: "Subject predicate Object"
+        obj_str = str(model.object_entity_id) if model.object_entity_id else str(model.object_literal)
+        doc_text = f"Fact: {model.predicate} {obj_str}" # Focus on predicate and object for search
+        metadata = {
+            "subject_id": str(model.subject_id),
+            "predicate": model.predicate,
+            "object": obj_str,
+            "type": "fact",
+            "valid_from": model.valid_from.isoformat(),
+            "confidence": model.confidence,
+            "source_type": model.source_type
+        }
+        return doc_text, metadata
+
     def hybrid_search(self, query: str, limit: int = 5) -> List[Fact]:
         """
         Performs a hybrid search:
@@ -1,12 +1,12 @@
 from .stanza import StanzaDefinition, Step
-from .flow import FlowDefinition, FlowState
+from .flow import FlowDefinition, FlowState, FlowBranch, FlowTransition
 from .agent import AgentDefinition, Principle
 from .schema import Action, PlanStep, Plan, Goal
 from .security import IdentityContext, ACL
 
 __all__ = [
     "StanzaDefinition", "Step", 
-    "FlowDefinition", "FlowState", 
+    "FlowDefinition", "FlowState", "FlowBranch", "FlowTransition",
     "AgentDefinition", "Principle",
     "Action", "PlanStep", "Plan", "Goal",
     "IdentityContext", "ACL"
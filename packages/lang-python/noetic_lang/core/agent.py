@@ -1,5 +1,5 @@
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class Principle(BaseModel):
     description: str
@@ -11,3 +11,5 @@ class AgentDefinition(BaseModel):
     allowed_skills: List[str]
     principles: List[Any]
     persona: Optional[Dict[str, Any]] = None
+    # Event types (glob patterns, e.g. "ui.*") this agent handles
+    subscriptions: List[str] = Field(default_factory=list)
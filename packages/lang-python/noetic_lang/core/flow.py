@@ -1,15 +1,65 @@
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, Field, model_validator
 
+class FlowTransition(BaseModel):
+    condition: Any # JsonLogic rule over the flow variables (and `result`, the state's skill output)
+    next: str
+
+class FlowBranch(BaseModel):
+    """
+    A sub-flow run by a Parallel (one per branch) or Map (one per item) state.
+    """
+    start_at: str
+    states: Dict[str, "FlowState"]
+
+    @model_validator(mode='after')
+    def check_graph_integrity(self) -> 'FlowBranch':
+        _check_states(self.start_at, self.states)
+        return self
+
 class FlowState(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
-    type: str = "Task" # Task, Stanza, Interaction
+    type: str = "Task" # Task, Stanza, Interaction, Choice, Parallel, Map
     skill: Optional[str] = None
     params: Dict[str, Any] = Field(default_factory=dict)
     next: Optional[str] = None # Simple transition
     end: bool = False
-    # We will need conditional transitions logic here eventually
+    # Guarded transitions, tried in order after the state ran: the first whose
+    # condition holds wins over `next`
+    choices: List[FlowTransition] = Field(default_factory=list)
+    # Parallel: branches run concurrently; the state completes when all of them have
+    branches: List[FlowBranch] = Field(default_factory=list)
+    # Map: runs `iterator` once per element of the list variable `items`, with the
+    # element bound to `item_var`, at most `max_concurrency` at a time
+    items: Optional[str] = None
+    item_var: str = "item"
+    iterator: Optional[FlowBranch] = None
+    max_concurrency: Optional[int] = Field(default=None, ge=1)
+
+    @model_validator(mode='before')
+    @classmethod
+    def normalize_choice_branches(cls, data: Any) -> Any:
+        # A `Choice` state may list its guarded transitions under `branches`, with
+        # `{"default": true}` marking the fallback: read them as `choices` and `next`
+        if isinstance(data, dict) and data.get("type") == "Choice" and data.get("branches"):
+            data = dict(data)
+            choices = list(data.get("choices") or [])
+            for branch in data.pop("branches"):
+                if isinstance(branch, dict) and branch.get("condition") == {"default": True}:
+                    data.setdefault("next", branch.get("next"))
+                else:
+                    choices.append(branch)
+            data["choices"] = choices
+        return data
+
+    @model_validator(mode='after')
+    def check_type_fields(self) -> 'FlowState':
+        if self.type == "Parallel" and not self.branches:
+            raise ValueError("Parallel state requires 'branches'")
+        if self.type == "Map" and (not self.items or self.iterator is None):
+            raise ValueError("Map state requires 'items' and 'iterator'")
+        return self
 
 class FlowDefinition(BaseModel):
     id: str
@@ -19,13 +69,20 @@ class FlowDefinition(BaseModel):
 
     @model_validator(mode='after')
     def check_graph_integrity(self) -> 'FlowDefinition':
-        # Check start_at
-        if self.start_at not in self.states:
-            raise ValueError(f"start_at '{self.start_at}' not found in states")
-        
-        # Check transitions
-        for state_id, state in self.states.items():
-            if state.next and state.next not in self.states:
-                raise ValueError(f"State '{state_id}' transitions to unknown state '{state.next}'")
-        
+        _check_states(self.start_at, self.states)
         return self
+
+def _check_states(start_at: str, states: Dict[str, FlowState]):
+    # Check start_at
+    if start_at not in states:
+        raise ValueError(f"start_at '{start_at}' not found in states")
+
+    # Check transitions
+    for state_id, state in states.items():
+        if state.next and state.next not in states:
+            raise ValueError(f"State '{state_id}' transitions to unknown state '{state.next}'")
+        for choice in state.choices:
+            if choice.next not in states:
+                raise ValueError(f"State '{state_id}' transitions to unknown state '{choice.next}'")
+
+FlowBranch.model_rebuild()
@@ -9,6 +9,9 @@ class PlanStep(Action):
     cost: float = 0.0
     rationale: Optional[str] = None
     instruction: Optional[str] = None
+    # Indices of earlier steps that must finish first.
+    # None means unknown: the step waits for every previous step (sequential execution).
+    depends_on: Optional[List[int]] = None
 
 class Plan(BaseModel):
     steps: List[PlanStep]
@@ -16,6 +19,13 @@ class Plan(BaseModel):
     risk_score: float = 0.0
     confidence_score: float = 1.0
     confidence_rationale: Optional[str] = None
+    # Planner telemetry; complete=False marks a best-effort partial plan (anytime mode),
+    # cut short by a time or expansion budget when budget_exhausted, else the goal is unreachable
+    complete: bool = True
+    budget_exhausted: bool = False
+    heuristic_distance: float = 0.0
+    expansions: int = 0
+    planning_ms: float = 0.0
 
 class Goal(BaseModel):
     description: str
@@ -74,6 +74,46 @@ def test_flow_definition_missing_required_fields():
     with pytest.raises(ValidationError):
         FlowDefinition(**invalid_data)
 
+def test_flow_definition_fan_out_states():
+    valid_data = {
+        "id": "test_flow",
+        "start_at": "Each",
+        "states": {
+            "Each": {
+                "type": "Map",
+                "items": "docs",
+                "max_concurrency": 4,
+                "iterator": {"start_at": "Read", "states": {"Read": {"skill": "read"}}},
+                "choices": [{"condition": {"var": "retry"}, "next": "Each"}]
+            }
+        }
+    }
+    flow = FlowDefinition(**valid_data)
+    assert flow.states["Each"].iterator.states["Read"].skill == "read"
+
+    # Choice states may list their transitions as branches, with a default
+    choice = FlowState(type="Choice", branches=[
+        {"condition": {"==": [{"var": "priority"}, "high"]}, "next": "Fast"},
+        {"condition": {"default": True}, "next": "Standard"}
+    ])
+    assert [c.next for c in choice.choices] == ["Fast"]
+    assert choice.next == "Standard" and choice.branches == []
+
+    # Map without an iterator
+    with pytest.raises(ValidationError, match="Map state requires 'items' and 'iterator'"):
+        FlowDefinition(id="test_flow", start_at="Each", states={"Each": {"type": "Map", "items": "docs"}})
+
+    # Branches are checked like flows
+    invalid_data = {
+        "id": "test_flow",
+        "start_at": "Both",
+        "states": {
+            "Both": {"type": "Parallel", "branches": [{"start_at": "A", "states": {"A": {"next": "B"}}}]}
+        }
+    }
+    with pytest.raises(ValidationError, match="State 'A' transitions to unknown state 'B'"):
+        FlowDefinition(**invalid_data)
+
 def test_stanza_definition_validation():
     # Valid case
     valid_data = {
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional
 from pydantic import BaseModel
 from noetic_conscience.contracts import AgenticIntentContract
 
@@ -30,3 +30,11 @@ class Agent(ABC):
         :param contract: The signed contract authorizing this execution.
         """
         pass
+
+    async def execute_stream(self, tool: str, params: Dict[str, Any], contract: AgenticIntentContract) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of `execute`: yields output chunks as they are produced
+        ({"type": "chunk", "stream": ..., "data": ...}), then the result dict last. Agents without incremental
+        output yield only the result.
+        """
+        yield await self.execute(tool, params, contract)
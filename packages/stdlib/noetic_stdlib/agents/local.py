@@ -1,42 +1,126 @@
-from typing import Dict, Any
+from typing import AsyncIterator, Deque, Dict, Any, Optional
 import asyncio
+import codecs
+from collections import deque
 from noetic_conscience.contracts import AgenticIntentContract
 from .base import Agent, AgentDefinition
+from ..process import ProcessPool
 
 class LocalAgent(Agent):
     """
     An Agent that executes intents on the local machine (CLI/Shell).
+
+    Commands run through a ProcessPool: bounded concurrency, exec without a shell
+    when the command has no shell syntax, timeouts and resource limits.
+
+    Output is read from the pipes incrementally, `chunk_size` bytes at a time, and
+    at most `max_pending_chunks` chunks wait for the consumer: when it falls behind,
+    the readers stop and the child blocks on its full pipe. The result keeps the last
+    `max_output` characters of each stream (`truncated` tells if more was produced).
     """
+    def __init__(self, definition: AgentDefinition, chunk_size: int = 64 * 1024, max_pending_chunks: int = 16, max_output: int = 16 * 1024 * 1024,
+                 pool: Optional[ProcessPool] = None):
+        """
+        :param pool: Shared ProcessPool. Without one, the agent gets its own default pool.
+        """
+        super().__init__(definition)
+        self.chunk_size = chunk_size
+        self.max_pending_chunks = max_pending_chunks
+        self.max_output = max_output
+        self.pool = pool or ProcessPool()
+
     async def execute(self, tool: str, params: Dict[str, Any], contract: AgenticIntentContract) -> Dict[str, Any]:
         """
         Executes a local tool.
         Currently supports:
-        - run_command: params { "command": str }
+        - run_command: params { "command": str | "argv": List[str], "timeout": float (optional) }
+        """
+        result: Dict[str, Any] = {}
+        async for item in self.execute_stream(tool, params, contract):
+            if item.get("type") != "chunk":
+                result = item
+        return result
+
+    async def execute_stream(self, tool: str, params: Dict[str, Any], contract: AgenticIntentContract) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Runs a local tool, yielding {"type": "chunk", "stream": "stdout"|"stderr", "data": str}
+        while it runs and the result dict last. Closing the stream early kills the process.
         """
-        if tool == "run_command":
-            command = params.get("command")
-            if not command:
-                return {"error": "Missing 'command' parameter", "status": "failed"}
-
-            try:
-                # Use asyncio.create_subprocess_shell for async execution
-                process = await asyncio.create_subprocess_shell(
-                    command,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                stdout, stderr = await process.communicate()
-                
-                return {
-                    "status": "success" if process.returncode == 0 else "failed",
-                    "stdout": stdout.decode(),
-                    "stderr": stderr.decode(),
-                    "returncode": process.returncode
-                }
-            except Exception as e:
-                return {
-                    "error": str(e),
-                    "status": "failed"
-                }
-        else:
-            return {"error": f"Tool '{tool}' not supported by LocalAgent", "status": "failed"}
+        if tool != "run_command":
+            yield {"error": f"Tool '{tool}' not supported by LocalAgent", "status": "failed"}
+            return
+        command = params.get("argv") or params.get("command")
+        if not command:
+            yield {"error": "Missing 'command' parameter", "status": "failed"}
+            return
+
+        tails = {"stdout": _Tail(self.max_output), "stderr": _Tail(self.max_output)}
+        try:
+            async with self.pool.spawn(command, timeout=params.get("timeout")) as process:
+                queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_pending_chunks)
+                readers = [
+                    asyncio.create_task(self._pump(process.stdout, "stdout", queue)),
+                    asyncio.create_task(self._pump(process.stderr, "stderr", queue))
+                ]
+                try:
+                    open_streams = len(readers)
+                    while open_streams:
+                        stream, data = await queue.get()
+                        if data is None:
+                            open_streams -= 1
+                            continue
+                        tails[stream].append(data)
+                        yield {"type": "chunk", "stream": stream, "data": data}
+                    await process.wait()
+                finally:
+                    # Leaving the block early kills the process (see ProcessPool.spawn)
+                    for reader in readers:
+                        reader.cancel()
+        except Exception as e:
+            yield {"error": str(e), "status": "failed"}
+            return
+
+        yield {
+            "status": "success" if process.returncode == 0 and not process.timed_out else "failed",
+            "stdout": tails["stdout"].text(),
+            "stderr": tails["stderr"].text(),
+            "returncode": process.returncode,
+            "truncated": tails["stdout"].truncated or tails["stderr"].truncated,
+            "timed_out": process.timed_out
+        }
+
+    async def _pump(self, pipe: asyncio.StreamReader, stream: str, queue: asyncio.Queue):
+        # Decode incrementally so multi-byte characters split across reads stay intact
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while True:
+            data = await pipe.read(self.chunk_size)
+            text = decoder.decode(data, final=not data)
+            if text:
+                await queue.put((stream, text))
+            if not data:
+                await queue.put((stream, None))
+                return
+
+class _Tail:
+    """
+    The last `limit` characters appended.
+    """
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.parts: Deque[str] = deque()
+        self.size = 0
+        self.truncated = False
+
+    def append(self, text: str):
+        self.parts.append(text)
+        self.size += len(text)
+        while self.size - len(self.parts[0]) >= self.limit:
+            self.size -= len(self.parts.popleft())
+            self.truncated = True
+
+    def text(self) -> str:
+        text = "".join(self.parts)
+        if len(text) > self.limit:
+            self.truncated = True
+            return text[-self.limit:]
+        return text
@@ -1,15 +1,21 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import httpx
 from noetic_conscience.contracts import AgenticIntentContract
 from .base import Agent, AgentDefinition
+from ..transport import HttpTransport
 
 class N8nAgent(Agent):
     """
     An Agent that executes intents by forwarding them to an n8n Webhook.
     """
-    def __init__(self, definition: AgentDefinition, webhook_url: str):
+    def __init__(self, definition: AgentDefinition, webhook_url: str, transport: Optional[HttpTransport] = None):
+        """
+        :param transport: Shared pooled transport (e.g. NoeticEngine.http). Without one,
+            each call opens its own connection.
+        """
         super().__init__(definition)
         self.webhook_url = webhook_url
+        self.transport = transport
 
     async def execute(self, tool: str, params: Dict[str, Any], contract: AgenticIntentContract) -> Dict[str, Any]:
         """
@@ -26,16 +32,19 @@ class N8nAgent(Agent):
             "contract": contract.serialize()
         }
         
-        async with httpx.AsyncClient() as client:
-            try:
-                # We expect n8n to return a JSON response with the result
-                response = await client.post(self.webhook_url, json=payload, timeout=60.0)
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPError as e:
-                # Wrap the error 
-                return {
-                    "error": str(e),
-                    "status": "failed",
-                    "details": "N8n webhook call failed"
-                }
+        try:
+            # We expect n8n to return a JSON response with the result
+            if self.transport is not None:
+                response = await self.transport.post(self.webhook_url, json=payload, timeout=60.0)
+            else:
+                async with httpx.AsyncClient() as client:
+                    response = await client.post(self.webhook_url, json=payload, timeout=60.0)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPError as e:
+            # Wrap the error 
+            return {
+                "error": str(e),
+                "status": "failed",
+                "details": "N8n webhook call failed"
+            }
@@ -0,0 +1,3 @@
+from .pool import ProcessPool, ManagedProcess, command_argv
+
+__all__ = ["ProcessPool", "ManagedProcess", "command_argv"]
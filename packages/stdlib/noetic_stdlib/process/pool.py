@@ -0,0 +1,359 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import shlex
+import shutil
+import signal
+import sys
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+# Resource limits are POSIX only
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Anything the shell would interpret: such commands keep running through `sh -c`
+_SHELL_SYNTAX = re.compile(r"[|&;<>()$`\\*?\[\]{}~#\n]")
+_SHELL_BUILTINS = {"cd", "export", "source", ".", "exit", "set", "unset", "ulimit", "alias", "eval", "exec", "trap", "umask"}
+
+# Bootstrap of a pre-warmed interpreter: waits for one job on stdin, then runs it
+# as `python <argv>` would, in this already started process. It exits with
+# os._exit after atexit handlers and a flush, skipping the interpreter teardown.
+_WORKER_BOOT = """
+import atexit, json, os, runpy, sys, traceback
+job = json.loads(sys.stdin.buffer.readline())
+if job.get("cwd"):
+    os.chdir(job["cwd"])
+if job.get("env") is not None:
+    os.environ.clear()
+    os.environ.update(job["env"])
+argv = job["argv"]
+code = 0
+try:
+    if argv[0] == "-c":
+        sys.argv = ["-c"] + argv[2:]
+        exec(compile(argv[1], "<string>", "exec"), {"__name__": "__main__"})
+    elif argv[0] == "-m":
+        sys.argv = argv[1:]
+        runpy.run_module(argv[1], run_name="__main__", alter_sys=True)
+    else:
+        sys.argv = argv
+        sys.path[0] = os.path.dirname(os.path.abspath(argv[0]))
+        runpy.run_path(argv[0], run_name="__main__")
+except SystemExit as e:
+    if e.code is None:
+        code = 0
+    elif isinstance(e.code, int):
+        code = e.code
+    else:
+        print(e.code, file=sys.stderr)
+        code = 1
+except BaseException:
+    traceback.print_exc()
+    code = 1
+getattr(atexit, "_run_exitfuncs", lambda: None)()
+sys.stdout.flush()
+sys.stderr.flush()
+os._exit(code)
+"""
+
+# Where resource.prlimit is missing (macOS, BSD), limited commands start through
+# this interpreter, which sets the limits on itself and execs the command.
+_LIMITS_BOOT = """
+import json, os, resource, sys
+cpu_seconds, memory_bytes = json.loads(sys.argv[1])
+if cpu_seconds is not None:
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+if memory_bytes is not None:
+    resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+try:
+    os.execvp(sys.argv[2], sys.argv[2:])
+except OSError as e:
+    print(f"{sys.argv[2]}: {e.strerror}", file=sys.stderr)
+    os._exit(127)
+"""
+
+class ManagedProcess:
+    """
+    A process started by a ProcessPool. `stdout` and `stderr` are pipes;
+    `timed_out` is set when the pool killed it for exceeding its timeout.
+    """
+    def __init__(self, process: asyncio.subprocess.Process, mode: str):
+        self.process = process
+        self.mode = mode # "exec", "shell" or "warm"
+        self.timed_out = False
+
+    @property
+    def stdout(self) -> asyncio.StreamReader:
+        return self.process.stdout
+
+    @property
+    def stderr(self) -> asyncio.StreamReader:
+        return self.process.stderr
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return self.process.returncode
+
+    async def wait(self) -> int:
+        return await self.process.wait()
+
+    def kill(self):
+        _kill_group(self.process)
+
+class ProcessPool:
+    """
+    Managed execution of local commands (used by LocalAgent).
+
+    - At most `max_processes` commands run at once; further spawns wait for a slot.
+    - Commands without shell syntax are split with shlex and exec'd directly;
+      pipes, redirections, globs or builtins still go through `sh -c`.
+    - Each command runs in its own process group with stdin closed. It is killed,
+      with its children, after `timeout` seconds or when its `spawn` block exits
+      early (cancellation, an abandoned stream).
+    - `cpu_seconds` and `memory_bytes` are applied as RLIMIT_CPU / RLIMIT_AS (POSIX):
+      with prlimit right after the spawn on Linux, elsewhere by a small Python
+      wrapper that sets them and execs the command; shell commands set them with
+      `ulimit`. Nothing runs in the forked child before exec, so spawning stays
+      safe with threads in this process.
+    - With `warm_workers`, that many Python interpreters are started ahead of time
+      and each runs one `python -c/-m/script` command of this interpreter, saving
+      its startup; a used worker exits and is replaced in the background.
+    """
+    def __init__(self,
+                 max_processes: int = 8,
+                 timeout: Optional[float] = None,
+                 cpu_seconds: Optional[int] = None,
+                 memory_bytes: Optional[int] = None,
+                 warm_workers: int = 0):
+        self.max_processes = max_processes
+        self.timeout = timeout
+        self.cpu_seconds = cpu_seconds
+        self.memory_bytes = memory_bytes
+        self.warm_workers = warm_workers
+        self._slots: Optional[asyncio.Semaphore] = None # Created on first use, inside the event loop
+        self._warm: Deque[asyncio.subprocess.Process] = deque()
+        self._refill: Optional[asyncio.Task] = None
+        self._running: Set[ManagedProcess] = set()
+        self.closed = False
+        self.stats = {"spawned": 0, "exec": 0, "shell": 0, "warm": 0, "timeouts": 0, "killed": 0}
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    async def start(self):
+        """
+        Starts the warm workers now rather than on the first spawn.
+        """
+        await self._fill()
+
+    @asynccontextmanager
+    async def spawn(self,
+                    command: Union[str, List[str]],
+                    timeout: Optional[float] = None,
+                    cpu_seconds: Optional[int] = None,
+                    memory_bytes: Optional[int] = None,
+                    cwd: Optional[str] = None,
+                    env: Optional[Dict[str, str]] = None) -> AsyncIterator[ManagedProcess]:
+        """
+        Runs `command` (a shell string or an argv list) once a slot is free and
+        yields it as a ManagedProcess. A process still running when the block
+        exits is killed. `timeout`, `cpu_seconds` and `memory_bytes` override the
+        pool's defaults for this command.
+        """
+        if self.closed:
+            raise RuntimeError("ProcessPool is closed")
+        timeout = self.timeout if timeout is None else timeout
+        limits = (self.cpu_seconds if cpu_seconds is None else cpu_seconds,
+                  self.memory_bytes if memory_bytes is None else memory_bytes)
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_processes)
+        async with self._slots:
+            managed = await self._start(command, limits, cwd, env)
+            self.stats["spawned"] += 1
+            self.stats[managed.mode] += 1
+            self._running.add(managed)
+            watchdog = None
+            if timeout is not None:
+                watchdog = asyncio.get_running_loop().call_later(timeout, self._expire, managed)
+            try:
+                yield managed
+            finally:
+                if watchdog is not None:
+                    watchdog.cancel()
+                self._running.discard(managed)
+                if managed.returncode is None:
+                    self.stats["killed"] += 1
+                    managed.kill()
+                    await managed.wait()
+
+    async def close(self):
+        """
+        Kills idle warm workers and running commands. Further spawns raise.
+        """
+        self.closed = True
+        if self._refill is not None:
+            self._refill.cancel()
+        processes = list(self._warm) + [managed.process for managed in self._running]
+        self._warm.clear()
+        for process in processes:
+            if process.returncode is None:
+                _kill_group(process)
+        await asyncio.gather(*(process.wait() for process in processes), return_exceptions=True)
+
+    async def _start(self, command: Union[str, List[str]], limits: tuple, cwd: Optional[str], env: Optional[Dict[str, str]]) -> ManagedProcess:
+        argv = command_argv(command)
+        if argv is None:
+            if os.name == "posix":
+                # The shell sets the limits itself: it may fork the command's
+                # children before a prlimit from here would land
+                process = await self._exec(["/bin/sh", "-c", _ulimit_prefix(limits) + command], (None, None), cwd, env)
+            else:
+                process = await asyncio.create_subprocess_shell(command, **self._popen_kwargs(cwd, env))
+            return ManagedProcess(process, "shell")
+
+        python_args = _python_args(argv)
+        if python_args is not None and self.warm_workers and limits == (self.cpu_seconds, self.memory_bytes):
+            worker = await self._take_worker()
+            if worker is not None:
+                job = {"argv": python_args, "cwd": cwd, "env": env}
+                worker.stdin.write(json.dumps(job).encode("utf-8") + b"\n")
+                await worker.stdin.drain()
+                worker.stdin.close()
+                return ManagedProcess(worker, "warm")
+
+        process = await self._exec(argv, limits, cwd, env)
+        return ManagedProcess(process, "exec")
+
+    async def _exec(self, argv: List[str], limits: tuple, cwd: Optional[str], env: Optional[Dict[str, str]], stdin: int = asyncio.subprocess.DEVNULL) -> asyncio.subprocess.Process:
+        cpu_seconds, memory_bytes = limits
+        limited = os.name == "posix" and resource is not None and (cpu_seconds is not None or memory_bytes is not None)
+        if limited and not hasattr(resource, "prlimit"):
+            argv = [sys.executable, "-c", _LIMITS_BOOT, json.dumps([cpu_seconds, memory_bytes])] + list(argv)
+        process = await asyncio.create_subprocess_exec(*argv, **self._popen_kwargs(cwd, env, stdin))
+        if limited and hasattr(resource, "prlimit"):
+            try:
+                _apply_limits(process.pid, cpu_seconds, memory_bytes)
+            except ProcessLookupError:
+                pass # Already gone
+            except (OSError, ValueError):
+                # Never leave a command running without the limits it was given
+                _kill_group(process)
+                await process.wait()
+                raise
+        return process
+
+    def _popen_kwargs(self, cwd: Optional[str], env: Optional[Dict[str, str]], stdin: int = asyncio.subprocess.DEVNULL) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {
+            "stdin": stdin,
+            "stdout": asyncio.subprocess.PIPE,
+            "stderr": asyncio.subprocess.PIPE,
+            "cwd": cwd,
+            "env": env
+        }
+        if os.name == "posix":
+            # Own process group, so a kill also reaches the command's children
+            kwargs["start_new_session"] = True
+        return kwargs
+
+    def _expire(self, managed: ManagedProcess):
+        if managed.returncode is None:
+            logger.warning(f"Killing process {managed.pid} after its timeout")
+            managed.timed_out = True
+            self.stats["timeouts"] += 1
+            managed.kill()
+
+    # --- Warm workers ---
+
+    async def _take_worker(self) -> Optional[asyncio.subprocess.Process]:
+        if not self._warm:
+            await self._fill()
+        worker = None
+        while self._warm:
+            candidate = self._warm.popleft()
+            if candidate.returncode is None:
+                worker = candidate
+                break
+        if not self.closed and (self._refill is None or self._refill.done()):
+            self._refill = asyncio.create_task(self._fill())
+        return worker
+
+    async def _fill(self):
+        while not self.closed and len(self._warm) < self.warm_workers:
+            try:
+                worker = await self._exec(
+                    [sys.executable, "-c", _WORKER_BOOT],
+                    (self.cpu_seconds, self.memory_bytes), None, None, stdin=asyncio.subprocess.PIPE
+                )
+            except Exception as e:
+                logger.error(f"Could not start a warm worker: {e}")
+                return
+            self._warm.append(worker)
+
+def command_argv(command: Union[str, List[str]]) -> Optional[List[str]]:
+    """
+    The argv to exec for a command, or None when it needs a shell.
+    """
+    if isinstance(command, (list, tuple)):
+        return list(command)
+    if _SHELL_SYNTAX.search(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    if not argv or argv[0] in _SHELL_BUILTINS or "=" in argv[0]:
+        return None
+    return argv
+
+def _python_args(argv: List[str]) -> Optional[List[str]]:
+    # Arguments of a `python -c/-m/script` command run by this very interpreter
+    if len(argv) < 2:
+        return None
+    executable = shutil.which(argv[0])
+    if executable is None or os.path.realpath(executable) != os.path.realpath(sys.executable):
+        return None
+    args = argv[1:]
+    if args[0] in ("-c", "-m"):
+        return args if len(args) >= 2 else None
+    if args[0].startswith("-"):
+        return None
+    return args
+
+def _apply_limits(pid: int, cpu_seconds: Optional[int], memory_bytes: Optional[int]):
+    # Set from the parent right after the spawn (Linux)
+    if cpu_seconds is not None:
+        resource.prlimit(pid, resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+    if memory_bytes is not None:
+        resource.prlimit(pid, resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+def _ulimit_prefix(limits: tuple) -> str:
+    cpu_seconds, memory_bytes = limits
+    prefix = ""
+    if cpu_seconds is not None:
+        prefix += f"ulimit -t {int(cpu_seconds)} || exit 126\n"
+    if memory_bytes is not None:
+        prefix += f"ulimit -v {int(memory_bytes) // 1024} || exit 126\n"
+    return prefix
+
+def _kill_group(process: asyncio.subprocess.Process):
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
@@ -0,0 +1,3 @@
+from .http import HttpTransport
+
+__all__ = ["HttpTransport"]
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional `h2` package (httpx[http2])
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+# Failures where the request was never sent: safe to retry even for non-idempotent POSTs.
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# The server dropped the connection, possibly after receiving the request: retrying may
+# run it twice (an MCP `tools/call`, an n8n webhook), so only idempotent methods are retried.
+IDEMPOTENT_RETRYABLE_ERRORS = RETRYABLE_ERRORS + (httpx.RemoteProtocolError,)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+class HttpTransport:
+    """
+    Shared, keep-alive HTTP client for remote tools and agents (MCP servers, n8n webhooks).
+
+    Every host (scheme + authority) gets its own connection pool, bounded by
+    `max_connections_per_host`, whose idle connections are kept alive for
+    `keepalive_expiry` seconds and reused by later calls. HTTP/2 is used when asked
+    for and `h2` is installed. Requests that were never sent are retried `retries`
+    times with exponential backoff; a connection dropped by the server is retried
+    for idempotent methods only. One transport is owned by each
+    NoeticEngine and closed in `NoeticEngine.stop`.
+    """
+    def __init__(self,
+                 max_connections_per_host: int = 20,
+                 max_keepalive_per_host: int = 10,
+                 keepalive_expiry: float = 30.0,
+                 timeout: float = 30.0,
+                 connect_timeout: float = 5.0,
+                 retries: int = 2,
+                 backoff: float = 0.1,
+                 http2: bool = False):
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_keepalive_per_host,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        if http2 and h2 is None:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+        self.http2 = http2 and h2 is not None
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self.closed = False
+        self.stats = {"requests": 0, "retries": 0, "failures": 0}
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        """
+        The pooled client of the url's host, created on first use.
+        """
+        if self.closed:
+            raise RuntimeError("HttpTransport is closed")
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        client = self._clients.get(host)
+        if client is None:
+            client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout, http2=self.http2)
+            self._clients[host] = client
+        return client
+
+    async def request(self, method: str, url: str, timeout: Optional[float] = None, retries: Optional[int] = None, **kwargs: Any) -> httpx.Response:
+        """
+        Sends a request through the host's pool. `timeout` overrides the read/write
+        timeout for this call; other keyword arguments are passed to httpx.
+        """
+        client = self.client_for(url)
+        if timeout is not None:
+            kwargs["timeout"] = httpx.Timeout(timeout, connect=self.timeout.connect)
+        attempts = 1 + (self.retries if retries is None else retries)
+        retryable = IDEMPOTENT_RETRYABLE_ERRORS if method.upper() in IDEMPOTENT_METHODS else RETRYABLE_ERRORS
+
+        for attempt in range(attempts):
+            self.stats["requests"] += 1
+            try:
+                return await client.request(method, url, **kwargs)
+            except retryable as e:
+                if attempt + 1 >= attempts:
+                    self.stats["failures"] += 1
+                    raise
+                self.stats["retries"] += 1
+                delay = self.backoff * (2 ** attempt)
+                logger.debug(f"Retrying {method} {url} in {delay:.2f}s after {type(e).__name__}: {e}")
+                await asyncio.sleep(delay)
+            except httpx.HTTPError:
+                self.stats["failures"] += 1
+                raise
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def aclose(self):
+        """
+        Closes every pool. Further requests raise.
+        """
+        self.closed = True
+        clients, self._clients = list(self._clients.values()), {}
+        await asyncio.gather(*(client.aclose() for client in clients), return_exceptions=True)